@@ -228,13 +228,18 @@ module.exports = {
       }
 
       if (textoPesquisa && textoPesquisa.trim() !== "") {
-        const textoLike = `%${textoPesquisa.trim()}%`;
+        const texto = textoPesquisa.trim();
+        const textoLike = `%${texto}%`;
+        // Trechos continuam encontrados pelo iLike; a busca textual acrescenta as variações das palavras
         whereConditions[Op.or] = [
           { numeroProcesso: { [Op.iLike]: textoLike } },
           { autor: { [Op.iLike]: textoLike } },
           { reu: { [Op.iLike]: textoLike } },
           { advogado: { [Op.iLike]: textoLike } },
-          { conteudoCompleto: { [Op.iLike]: textoLike } },
+          Publicacao.sequelize.where(Publicacao.conteudoCompletoSql(), {
+            [Op.iLike]: textoLike,
+          }),
+          Publicacao.buscaTextoWhere(texto),
         ];
       }
 
@@ -1,4 +1,11 @@
-const { DataTypes } = require("sequelize");
+const { DataTypes, QueryTypes } = require("sequelize");
+const crypto = require("crypto");
+
+// MD5 do conteúdo, igual ao hash_conteudo gravado pelo scraper
+const calcularHashConteudo = (conteudo) =>
+  conteudo == null
+    ? null
+    : crypto.createHash("md5").update(conteudo, "utf8").digest("hex");
 
 module.exports = (sequelize, DataTypes, schema = "public") => {
   const Publicacao = sequelize.define(
@@ -52,6 +59,32 @@ module.exports = (sequelize, DataTypes, schema = "public") => {
         allowNull: true,
         field: "conteudo_completo",
       },
+      hashConteudo: {
+        type: DataTypes.STRING(32),
+        allowNull: true,
+        field: "hash_conteudo",
+      },
+      // Conteúdo guardado como trecho do texto da página (tabela paginas_texto) quando conteudoCompleto é nulo
+      paginaTextoId: {
+        type: DataTypes.INTEGER,
+        allowNull: true,
+        field: "pagina_texto_id",
+      },
+      conteudoInicio: {
+        type: DataTypes.INTEGER,
+        allowNull: true,
+        field: "conteudo_inicio",
+      },
+      conteudoFim: {
+        type: DataTypes.INTEGER,
+        allowNull: true,
+        field: "conteudo_fim",
+      },
+      buscaTexto: {
+        type: DataTypes.TSVECTOR,
+        allowNull: true,
+        field: "busca_texto",
+      },
       status: {
         type: DataTypes.ENUM("nova", "lida", "enviada", "processada"),
         allowNull: false,
@@ -75,6 +108,64 @@ module.exports = (sequelize, DataTypes, schema = "public") => {
       timestamps: true,
       createdAt: "dataCriacao",
       updatedAt: "dataAtualizacao",
+      // busca_texto é mantida pelo banco (trigger das migrações do scraper) e só entra nos filtros
+      // (Publicacao.buscaTextoWhere), nunca nas leituras
+      defaultScope: {
+        attributes: { exclude: ["buscaTexto"] },
+      },
+      hooks: {
+        beforeCreate: (publicacao) => {
+          publicacao.hashConteudo = calcularHashConteudo(
+            publicacao.conteudoCompleto
+          );
+        },
+        beforeUpdate: (publicacao) => {
+          if (publicacao.changed("conteudoCompleto")) {
+            publicacao.hashConteudo = calcularHashConteudo(
+              publicacao.conteudoCompleto
+            );
+          }
+        },
+        // Remonta o conteúdo das publicações guardadas como trecho da página
+        afterFind: async (resultado) => {
+          const publicacoes = (
+            Array.isArray(resultado) ? resultado : [resultado]
+          ).filter(
+            (publicacao) =>
+              publicacao &&
+              publicacao.dataValues &&
+              publicacao.dataValues.conteudoCompleto == null &&
+              publicacao.dataValues.paginaTextoId != null
+          );
+          if (publicacoes.length === 0) {
+            return;
+          }
+
+          // O trecho vem direto da página (JOIN), sem chamar publicacao_conteudo() linha a linha
+          const linhas = await sequelize.query(
+            `SELECT p.id, substring(t.texto FROM p.conteudo_inicio + 1 FOR p.conteudo_fim - p.conteudo_inicio) AS conteudo
+             FROM "${schema}".publicacoes p
+             JOIN "${schema}".paginas_texto t ON t.id = p.pagina_texto_id
+             WHERE p.id IN (:ids)`,
+            {
+              replacements: {
+                ids: publicacoes.map((publicacao) => publicacao.id),
+              },
+              type: QueryTypes.SELECT,
+            }
+          );
+          const conteudos = new Map(
+            linhas.map((linha) => [linha.id, linha.conteudo])
+          );
+
+          // Não marca o campo como alterado: um update não copia o texto para a publicação
+          publicacoes.forEach((publicacao) => {
+            const conteudo = conteudos.get(publicacao.id) ?? null;
+            publicacao.dataValues.conteudoCompleto = conteudo;
+            publicacao._previousDataValues.conteudoCompleto = conteudo;
+          });
+        },
+      },
     }
   );
 
@@ -91,6 +182,24 @@ module.exports = (sequelize, DataTypes, schema = "public") => {
     return this.update({ status: novoStatus });
   };
 
+  // Expressão SQL do conteúdo completo (copiado na publicação ou remontado da página), para filtros
+  Publicacao.conteudoCompletoSql = () =>
+    sequelize.fn(
+      "publicacao_conteudo",
+      sequelize.col("conteudo_completo"),
+      sequelize.col("pagina_texto_id"),
+      sequelize.col("conteudo_inicio"),
+      sequelize.col("conteudo_fim")
+    );
+
+  // Filtro da busca textual em português sobre partes e conteúdo, pelo índice GIN de busca_texto
+  Publicacao.buscaTextoWhere = (texto) =>
+    sequelize.where(
+      sequelize.col("busca_texto"),
+      "@@",
+      sequelize.fn("plainto_tsquery", "portuguese", texto)
+    );
+
   // Associações com outros modelos (se necessário)
   Publicacao.associate = function (models) {
     // Definir associações aqui
@@ -0,0 +1,274 @@
+import logging
+import re
+from urllib.parse import urljoin
+
+import lxml.html
+
+from config import DJE_URL_BASE, CODIGO_CADERNO, PALAVRAS_CHAVE
+
+logger = logging.getLogger("DJE_Scraper")
+
+# Texto da pesquisa livre: as palavras-chave entre aspas, ligadas por "e"
+PESQUISA_LIVRE = " e ".join(f'"{palavra}"' for palavra in PALAVRAS_CHAVE)
+
+# Total informado na primeira página de resultados (ex.: "Resultados 1 a 10 de 153")
+PADRAO_TOTAL_RESULTADOS = re.compile(r'Resultados?\s+\d+\s+a\s+\d+\s+de\s+(\d+)', re.IGNORECASE)
+MENSAGEM_SEM_RESULTADOS = 'Não foi encontrado'
+
+# Caminho da página da publicação no onclick dos resultados: popup('/cdje/consultaSimples.do?...')
+PADRAO_POPUP = re.compile(r"popup\('([^']+)'\)")
+
+# Data do diário no cabeçalho de cada resultado (ex.: "03/03/2025 - Caderno 3 - ... - Página 3012")
+PADRAO_DATA_RESULTADO = re.compile(r'(\d{2})/(\d{2})/(\d{4})\s+-\s+Caderno', re.IGNORECASE)
+
+# Variações de "pagamento pelo INSS" procuradas no snippet dos resultados
+PADROES_PAGAMENTO_INSS = [re.compile(padrao, re.IGNORECASE) for padrao in (
+    r'pagamento\s+pelo\s+inss',
+    r'inss\s+.{0,30}?\s+pagamento',
+    r'pagamento\s+.{0,30}?\s+inss',
+    r'inss\s+.{0,30}?\s+efetuar\s+.{0,10}?\s+pagamento',
+    r'inss\s+.{0,30}?\s+realizar\s+.{0,10}?\s+pagamento'
+)]
+
+# Headers das páginas HTML (a sessão usa por padrão os headers dos downloads de PDF)
+HEADERS_HTML = {'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8'}
+
+def ler_total_resultados(texto_pagina):
+    """Total de resultados informado no texto da página de resultados (0 sem resultados, None se não identificado)"""
+    if MENSAGEM_SEM_RESULTADOS in texto_pagina:
+        return 0
+
+    total_match = PADRAO_TOTAL_RESULTADOS.search(texto_pagina)
+    if total_match:
+        return int(total_match.group(1))
+    return None
+
+def classificar_snippet(snippet):
+    """Retorna (contem_rpv, contem_pagamento_inss) para o snippet de um resultado"""
+    contem_rpv = re.search(r'\brpv\b', snippet, re.IGNORECASE) is not None
+    contem_pagamento_inss = any(padrao.search(snippet) for padrao in PADROES_PAGAMENTO_INSS)
+    return contem_rpv, contem_pagamento_inss
+
+def ler_data_resultado(texto_resultado):
+    """Data de disponibilização (AAAA-MM-DD) do cabeçalho de um resultado, ou None se não identificada"""
+    match = PADRAO_DATA_RESULTADO.search(texto_resultado)
+    if not match:
+        return None
+    dia, mes, ano = match.groups()
+    return f"{ano}-{mes}-{dia}"
+
+def _texto(elemento):
+    """Texto do elemento com os espaços normalizados"""
+    return " ".join(elemento.text_content().split())
+
+def _campos_formulario(formulario):
+    """Campos de um formulário HTML como enviados pelo navegador (sem os botões)"""
+    campos = {}
+    for campo in formulario.inputs:
+        nome = campo.get('name')
+        if not nome:
+            continue
+
+        tipo = (campo.get('type') or 'text').lower() if campo.tag == 'input' else campo.tag
+        if tipo in ('submit', 'button', 'image', 'reset', 'file'):
+            continue
+        if tipo in ('checkbox', 'radio') and not campo.checked:
+            continue
+        if tipo == 'select':
+            valor = campo.value
+            if valor is None and campo.value_options:
+                valor = campo.value_options[0]
+            campos[nome] = valor or ''
+        else:
+            campos[nome] = campo.value or ''
+    return campos
+
+class BuscaHTTP:
+    """
+    Pesquisa da consulta avançada do DJE direto por HTTP, sem navegador: envia o formulário
+    (datas, caderno e pesquisa livre) e lê as páginas de resultados com lxml.
+    Usa a sessão HTTP do scraper, então os cookies e as conexões são os mesmos dos downloads.
+    `url_base` pode apontar para um servidor local que sirva páginas gravadas do DJE.
+    """
+
+    def __init__(self, sessao, url_base=DJE_URL_BASE):
+        """sessao: SessaoDJE (usa a requests.Session e o timeout dela)"""
+        self.sessao = sessao
+        self.url_base = url_base.rstrip('/')
+        self.url_consulta = f"{self.url_base}/consultaAvancada.do"
+
+        # Página de resultados atual e dados enviados na pesquisa (usados na paginação)
+        self._documento = None
+        self._url_atual = None
+        self._dados_pesquisa = None
+
+        # Verdadeiro se a paginação dos resultados não pôde ser seguida por HTTP
+        self.paginacao_incompleta = False
+
+    def _requisitar(self, metodo, url, dados=None):
+        """Faz a requisição e retorna (url final, documento lxml) da resposta"""
+        resposta = self.sessao.session.request(
+            metodo, url, data=dados, headers=HEADERS_HTML, timeout=self.sessao.timeout
+        )
+        resposta.raise_for_status()
+        # Decodifica pelo charset informado na resposta (o lxml, com bytes, só olha a meta tag)
+        return resposta.url, lxml.html.document_fromstring(resposta.text, base_url=resposta.url)
+
+    def _formulario_pesquisa(self, documento):
+        """Formulário da consulta avançada na página (o que contém o campo dadosConsulta.dtInicio)"""
+        formularios = documento.xpath("//form[.//*[@name='dadosConsulta.dtInicio']]")
+        return formularios[0] if formularios else None
+
+    def _eh_pagina_resultados(self, documento):
+        """Indica se o documento é uma página de resultados (com ou sem publicações encontradas)"""
+        if documento.xpath("//*[@id='divResultadosInferior']"):
+            return True
+        return MENSAGEM_SEM_RESULTADOS in documento.text_content()
+
+    def pesquisar(self, data_inicial, data_final):
+        """
+        Envia a pesquisa do período. Retorna True se a página de resultados foi recebida
+        (com ou sem resultados) e False se a pesquisa por HTTP falhou.
+        """
+        self._documento = None
+        self.paginacao_incompleta = False
+
+        try:
+            self.sessao.semear_cookies()
+
+            # A página da consulta traz os campos ocultos e o destino do formulário
+            url_formulario, documento = self._requisitar('GET', self.url_consulta)
+            formulario = self._formulario_pesquisa(documento)
+            if formulario is not None:
+                dados = _campos_formulario(formulario)
+                destino = urljoin(url_formulario, formulario.get('action') or self.url_consulta)
+            else:
+                logger.warning("Formulário da consulta avançada não encontrado, enviando apenas os campos conhecidos")
+                dados = {}
+                destino = self.url_consulta
+
+            dados.update({
+                'dadosConsulta.dtInicio': data_inicial.strftime("%d/%m/%Y"),
+                'dadosConsulta.dtFim': data_final.strftime("%d/%m/%Y"),
+                'dadosConsulta.cdCaderno': CODIGO_CADERNO,
+                'dadosConsulta.pesquisaLivre': PESQUISA_LIVRE
+            })
+
+            logger.info(f"Pesquisando por HTTP de {dados['dadosConsulta.dtInicio']} a {dados['dadosConsulta.dtFim']}")
+            url_resultados, documento = self._requisitar('POST', destino, dados)
+
+            if not self._eh_pagina_resultados(documento):
+                logger.warning("A resposta da pesquisa por HTTP não é uma página de resultados")
+                return False
+
+            self._documento = documento
+            self._url_atual = url_resultados
+            self._dados_pesquisa = dados
+            return True
+        except Exception as e:
+            logger.warning(f"Erro na pesquisa por HTTP: {e}")
+            return False
+
+    def contar_resultados(self):
+        """Total de resultados da pesquisa atual (0 sem resultados, None se não identificado)"""
+        if self._documento is None:
+            return None
+
+        total = ler_total_resultados(self._documento.text_content())
+        if total is None:
+            logger.warning("Total de resultados da pesquisa não identificado")
+        return total
+
+    def _links_da_pagina(self, documento, url_pagina):
+        """Gera os resultados (url, snippet e data do diário) de uma página de resultados"""
+        linhas = documento.xpath(
+            "//*[@id='divResultadosInferior']//*[contains(concat(' ', normalize-space(@class), ' '), ' fundocinza1 ')]"
+        )
+        for linha in linhas:
+            links_popup = linha.xpath(".//a[contains(@onclick, 'popup')]")
+            if not links_popup:
+                continue
+
+            match = PADRAO_POPUP.search(links_popup[0].get('onclick') or '')
+            if not match:
+                continue
+
+            snippets = linha.xpath(".//*[contains(concat(' ', normalize-space(@class), ' '), ' ementaClass2 ')]")
+            snippet = _texto(snippets[0]) if snippets else ""
+            contem_rpv, contem_pagamento_inss = classificar_snippet(snippet)
+
+            yield {
+                'url': urljoin(url_pagina, match.group(1)),
+                'snippet': snippet,
+                'data_disponibilizacao': ler_data_resultado(_texto(linha)),
+                'contem_rpv': contem_rpv,
+                'contem_pagamento_inss': contem_pagamento_inss
+            }
+
+    def _proxima_pagina(self, documento, url_pagina):
+        """
+        Busca a página de resultados seguinte pelo link "Próximo". Retorna (url, documento),
+        ou None no fim dos resultados ou se o link não puder ser seguido por HTTP
+        (nesse caso marca `paginacao_incompleta`).
+        """
+        links = documento.xpath("//a[contains(normalize-space(.), 'Próximo')]")
+        if not links:
+            return None
+
+        link = links[0]
+        href = (link.get('href') or '').strip()
+        if href and href != '#' and not href.lower().startswith('javascript:'):
+            return self._requisitar('GET', urljoin(url_pagina, href))
+
+        # Link em JavaScript (ex.: trocaDePg(3)): reenvia a pesquisa com o campo de página do formulário
+        numero = re.search(r'\((\d+)\)', f"{href} {link.get('onclick') or ''}")
+        formularios = documento.xpath("//form[.//input[contains(translate(@name, 'PAGIN', 'pagin'), 'pagina')]]")
+        if numero and formularios:
+            formulario = formularios[0]
+            dados = dict(self._dados_pesquisa or {})
+            dados.update(_campos_formulario(formulario))
+            campo_pagina = formulario.xpath(".//input[contains(translate(@name, 'PAGIN', 'pagin'), 'pagina')]")[0].get('name')
+            dados[campo_pagina] = numero.group(1)
+            destino = urljoin(url_pagina, formulario.get('action') or self.url_consulta)
+            return self._requisitar('POST', destino, dados)
+
+        logger.warning("Link para a próxima página de resultados não pode ser seguido por HTTP")
+        self.paginacao_incompleta = True
+        return None
+
+    def iterar_links_publicacoes(self):
+        """
+        Gera os links das publicações encontradas na pesquisa atual, com seus snippets de texto,
+        à medida que as páginas de resultados são baixadas (sem repetir URLs)
+        """
+        urls_vistas = set()
+        documento, url_pagina = self._documento, self._url_atual
+        pagina_atual = 1
+
+        while documento is not None:
+            novos = 0
+            for resultado in self._links_da_pagina(documento, url_pagina):
+                if resultado['url'] in urls_vistas:
+                    continue
+                urls_vistas.add(resultado['url'])
+                novos += 1
+                yield resultado
+            logger.info(f"Página de resultados {pagina_atual} (HTTP): {novos} links")
+
+            # Uma página sem links novos encerra a paginação (evita repetir a última página sem fim)
+            if not novos:
+                break
+
+            try:
+                proxima = self._proxima_pagina(documento, url_pagina)
+            except Exception as e:
+                logger.warning(f"Erro ao buscar a página de resultados {pagina_atual + 1} por HTTP: {e}")
+                self.paginacao_incompleta = True
+                proxima = None
+
+            if proxima is None:
+                break
+            url_pagina, documento = proxima
+            pagina_atual += 1
+
+        logger.info(f"Total de {len(urls_vistas)} links com snippets extraídos por HTTP")
@@ -0,0 +1,163 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from config import DIRETORIO_CACHE_PAGINAS, CACHE_PAGINAS_TAMANHO_MAXIMO_MB
+
+logger = logging.getLogger("DJE_Scraper")
+
+class CachePaginasPDF:
+    """
+    Cache persistente, endereçado por conteúdo, dos PDFs das páginas do diário.
+    O índice (SQLite) liga a chave da página ao SHA-256 do PDF; os bytes ficam
+    em arquivos nomeados pelo próprio hash, então páginas idênticas são gravadas uma vez.
+    Quando o tamanho total passa do limite, os PDFs menos usados recentemente são removidos.
+    """
+
+    def __init__(self, diretorio=DIRETORIO_CACHE_PAGINAS, tamanho_maximo_mb=CACHE_PAGINAS_TAMANHO_MAXIMO_MB):
+        """Abre (ou cria) o cache no diretório informado"""
+        self.diretorio = diretorio
+        self.diretorio_objetos = os.path.join(diretorio, "objetos")
+        self.tamanho_maximo = int(tamanho_maximo_mb) * 1024 * 1024
+        self.acertos = 0
+        self.falhas = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(self.diretorio_objetos, exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(diretorio, "indice.sqlite3"), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+        CREATE TABLE IF NOT EXISTS paginas (
+            cd_volume INTEGER NOT NULL,
+            nu_diario INTEGER NOT NULL,
+            cd_caderno INTEGER NOT NULL,
+            nu_seqpagina INTEGER NOT NULL,
+            sha256 TEXT NOT NULL,
+            PRIMARY KEY (cd_volume, nu_diario, cd_caderno, nu_seqpagina)
+        );
+        CREATE TABLE IF NOT EXISTS objetos (
+            sha256 TEXT PRIMARY KEY,
+            tamanho INTEGER NOT NULL,
+            ultimo_acesso REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_objetos_ultimo_acesso ON objetos (ultimo_acesso);
+        CREATE INDEX IF NOT EXISTS idx_paginas_sha256 ON paginas (sha256);
+        """)
+        self.conn.commit()
+
+    def _caminho_objeto(self, sha256):
+        """Caminho do arquivo que guarda os bytes de um PDF"""
+        return os.path.join(self.diretorio_objetos, sha256[:2], f"{sha256}.pdf")
+
+    def _remover_objeto(self, sha256):
+        """Remove um PDF do disco e do índice (deve ser chamado com o lock adquirido)"""
+        try:
+            os.unlink(self._caminho_objeto(sha256))
+        except FileNotFoundError:
+            pass
+        self.conn.execute("DELETE FROM paginas WHERE sha256 = ?", (sha256,))
+        self.conn.execute("DELETE FROM objetos WHERE sha256 = ?", (sha256,))
+
+    def obter(self, chave):
+        """Retorna os bytes do PDF da página, ou None se não estiver no cache"""
+        with self._lock:
+            linha = self.conn.execute(
+                "SELECT sha256 FROM paginas WHERE cd_volume = ? AND nu_diario = ? AND cd_caderno = ? AND nu_seqpagina = ?",
+                tuple(chave)
+            ).fetchone()
+
+            if not linha:
+                self.falhas += 1
+                return None
+
+            sha256 = linha[0]
+            try:
+                with open(self._caminho_objeto(sha256), 'rb') as arquivo:
+                    conteudo = arquivo.read()
+            except OSError:
+                conteudo = None
+
+            # Descarta entradas cujo arquivo sumiu ou foi corrompido
+            if conteudo is None or hashlib.sha256(conteudo).hexdigest() != sha256:
+                logger.warning(f"Entrada inválida no cache de páginas para {tuple(chave)}, removendo")
+                self._remover_objeto(sha256)
+                self.conn.commit()
+                self.falhas += 1
+                return None
+
+            self.conn.execute("UPDATE objetos SET ultimo_acesso = ? WHERE sha256 = ?", (time.time(), sha256))
+            self.conn.commit()
+            self.acertos += 1
+            return conteudo
+
+    def armazenar(self, chave, conteudo):
+        """Guarda o PDF de uma página no cache e retorna o seu SHA-256"""
+        sha256 = hashlib.sha256(conteudo).hexdigest()
+        caminho = self._caminho_objeto(sha256)
+
+        with self._lock:
+            if not os.path.exists(caminho):
+                os.makedirs(os.path.dirname(caminho), exist_ok=True)
+                caminho_temporario = f"{caminho}.{threading.get_ident()}.tmp"
+                with open(caminho_temporario, 'wb') as arquivo:
+                    arquivo.write(conteudo)
+                os.replace(caminho_temporario, caminho)
+
+            self.conn.execute(
+                "INSERT OR REPLACE INTO objetos (sha256, tamanho, ultimo_acesso) VALUES (?, ?, ?)",
+                (sha256, len(conteudo), time.time())
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO paginas (cd_volume, nu_diario, cd_caderno, nu_seqpagina, sha256) VALUES (?, ?, ?, ?, ?)",
+                tuple(chave) + (sha256,)
+            )
+            self._aplicar_limite_tamanho()
+            self.conn.commit()
+
+        return sha256
+
+    def _aplicar_limite_tamanho(self):
+        """Remove os PDFs menos usados até o cache voltar a 90% do limite (com o lock adquirido)"""
+        tamanho_total = self.conn.execute("SELECT COALESCE(SUM(tamanho), 0) FROM objetos").fetchone()[0]
+        if tamanho_total <= self.tamanho_maximo:
+            return
+
+        alvo = int(self.tamanho_maximo * 0.9)
+        removidos = 0
+        for sha256, tamanho in self.conn.execute(
+            "SELECT sha256, tamanho FROM objetos ORDER BY ultimo_acesso ASC"
+        ).fetchall():
+            if tamanho_total <= alvo:
+                break
+            self._remover_objeto(sha256)
+            tamanho_total -= tamanho
+            removidos += 1
+
+        logger.info(f"Cache de páginas: {removidos} PDFs removidos por limite de tamanho")
+
+    def estatisticas(self):
+        """Retorna contadores de acertos/falhas e a ocupação atual do cache"""
+        with self._lock:
+            quantidade, tamanho_total = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(tamanho), 0) FROM objetos"
+            ).fetchone()
+
+        total_consultas = self.acertos + self.falhas
+        return {
+            'acertos': self.acertos,
+            'falhas': self.falhas,
+            'taxa_acerto': (self.acertos / total_consultas) if total_consultas else 0.0,
+            'pdfs': quantidade,
+            'tamanho_bytes': tamanho_total
+        }
+
+    def fechar(self):
+        """Fecha o índice do cache"""
+        with self._lock:
+            try:
+                self.conn.close()
+            except Exception as e:
+                logger.warning(f"Erro ao fechar o cache de páginas: {e}")
@@ -0,0 +1,77 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+from config import ARQUIVO_CACHE_TEXTO
+
+logger = logging.getLogger("DJE_Scraper")
+
+class CacheTextoExtraido:
+    """
+    Armazena o texto já extraído de cada PDF, indexado pelo SHA-256 dos bytes do PDF
+    e pela assinatura da cadeia de extratores (nomes e versões) que o produziu.
+    O índice é uma tabela SQLite sem rowid, então a consulta é uma busca direta na chave
+    mesmo com dezenas de milhares de páginas; o texto fica comprimido com zlib.
+    """
+
+    def __init__(self, caminho=ARQUIVO_CACHE_TEXTO):
+        """Abre (ou cria) o banco SQLite do cache no caminho informado"""
+        diretorio = os.path.dirname(caminho)
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+
+        self.acertos = 0
+        self.falhas = 0
+        self._lock = threading.Lock()
+
+        # timeout alto porque os processos do pool de extração compartilham o arquivo
+        self.conn = sqlite3.connect(caminho, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+        CREATE TABLE IF NOT EXISTS textos (
+            sha256_pdf TEXT NOT NULL,
+            assinatura TEXT NOT NULL,
+            extrator TEXT NOT NULL,
+            texto BLOB NOT NULL,
+            criado_em REAL NOT NULL,
+            PRIMARY KEY (sha256_pdf, assinatura)
+        ) WITHOUT ROWID
+        """)
+        self.conn.commit()
+
+    def obter(self, sha256_pdf, assinatura):
+        """Retorna (texto, extrator) já extraídos para esse PDF e cadeia, ou None"""
+        with self._lock:
+            linha = self.conn.execute(
+                "SELECT texto, extrator FROM textos WHERE sha256_pdf = ? AND assinatura = ?",
+                (sha256_pdf, assinatura)
+            ).fetchone()
+
+        if not linha:
+            self.falhas += 1
+            return None
+
+        self.acertos += 1
+        return zlib.decompress(linha[0]).decode('utf-8'), linha[1]
+
+    def armazenar(self, sha256_pdf, assinatura, extrator, texto):
+        """Guarda o texto extraído de um PDF"""
+        texto_comprimido = zlib.compress(texto.encode('utf-8'), 6)
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO textos (sha256_pdf, assinatura, extrator, texto, criado_em) VALUES (?, ?, ?, ?, ?)",
+                (sha256_pdf, assinatura, extrator, texto_comprimido, time.time())
+            )
+            self.conn.commit()
+
+    def fechar(self):
+        """Fecha o banco do cache"""
+        with self._lock:
+            try:
+                self.conn.close()
+            except Exception as e:
+                logger.warning(f"Erro ao fechar o cache de texto extraído: {e}")
@@ -0,0 +1,228 @@
+import logging
+import threading
+import traceback
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import timedelta
+
+from config import (CARGA_HISTORICA_TRABALHADORES, CARGA_HISTORICA_DIAS_POR_FATIA, CARGA_HISTORICA_MAXIMO_RESULTADOS,
+                    DIRETORIO_CACHE_PAGINAS, eh_fim_de_semana)
+from cache_paginas import CachePaginasPDF
+from extracao_pdf import criar_pool_extracao, fechar_cache_texto
+from scraper import DJEScraper
+
+logger = logging.getLogger("DJE_Scraper")
+
+# Intervalo de datas (inclusivo) pesquisado de uma só vez no formulário do DJE
+FatiaPeriodo = namedtuple('FatiaPeriodo', ['data_inicial', 'data_final'])
+
+def descrever_fatia(fatia):
+    """Texto curto da fatia para os logs"""
+    if fatia.data_inicial == fatia.data_final:
+        return fatia.data_inicial.strftime('%d/%m/%Y')
+    return f"{fatia.data_inicial.strftime('%d/%m/%Y')} a {fatia.data_final.strftime('%d/%m/%Y')}"
+
+def dividir_periodo(data_inicial, data_final, dias_por_fatia=CARGA_HISTORICA_DIAS_POR_FATIA):
+    """
+    Divide o período em fatias de até `dias_por_fatia` dias úteis consecutivos.
+    Sábados e domingos ficam de fora, já que o diário não é publicado no fim de semana.
+    """
+    dias_por_fatia = max(1, int(dias_por_fatia))
+    fatias = []
+    dias = []
+
+    dia = data_inicial
+    while dia <= data_final:
+        if eh_fim_de_semana(dia):
+            # O fim de semana encerra a fatia atual
+            if dias:
+                fatias.append(FatiaPeriodo(dias[0], dias[-1]))
+                dias = []
+        else:
+            dias.append(dia)
+            if len(dias) == dias_por_fatia:
+                fatias.append(FatiaPeriodo(dias[0], dias[-1]))
+                dias = []
+        dia += timedelta(days=1)
+
+    if dias:
+        fatias.append(FatiaPeriodo(dias[0], dias[-1]))
+    return fatias
+
+def bisseccionar_fatia(fatia):
+    """Divide a fatia ao meio; retorna None se ela já tiver um único dia"""
+    dias = (fatia.data_final - fatia.data_inicial).days
+    if dias < 1:
+        return None
+
+    meio = fatia.data_inicial + timedelta(days=dias // 2)
+    return FatiaPeriodo(fatia.data_inicial, meio), FatiaPeriodo(meio + timedelta(days=1), fatia.data_final)
+
+class CargaHistorica:
+    """
+    Carga histórica da primeira execução: em vez de uma única pesquisa cobrindo o período inteiro,
+    o período é dividido em fatias (por padrão, um dia) pesquisadas em paralelo, cada uma com o seu
+    navegador. Uma fatia com resultados demais é dividida ao meio e as metades voltam para a fila.
+    Cada fatia baixa, extrai e salva as suas publicações sozinha, então a falha de um dia
+    não descarta o restante do período.
+    """
+
+    def __init__(self, trabalhadores=CARGA_HISTORICA_TRABALHADORES, dias_por_fatia=CARGA_HISTORICA_DIAS_POR_FATIA,
+                 maximo_resultados=CARGA_HISTORICA_MAXIMO_RESULTADOS, criar_scraper=None):
+        """
+        trabalhadores: quantidade de fatias pesquisadas ao mesmo tempo (um navegador por trabalhador).
+        maximo_resultados: total de resultados acima do qual uma fatia de vários dias é dividida
+        (um dia acima do limite é processado inteiro, com um erro no log).
+        criar_scraper: função que recebe (pool_extracao, cache_paginas) e cria um scraper (padrão: DJEScraper).
+        """
+        self.trabalhadores = max(1, int(trabalhadores))
+        self.dias_por_fatia = max(1, int(dias_por_fatia))
+        self.maximo_resultados = max(1, int(maximo_resultados))
+        self._criar_scraper = criar_scraper or DJEScraper
+
+        # Pool de extração e cache de páginas compartilhados pelos scrapers de todos os trabalhadores
+        self.pool_extracao = criar_pool_extracao()
+        self.cache_paginas = None
+        if DIRETORIO_CACHE_PAGINAS:
+            try:
+                self.cache_paginas = CachePaginasPDF()
+            except Exception as e:
+                logger.warning(f"Cache de páginas indisponível, seguindo sem cache: {e}")
+
+        self._local = threading.local()
+        self._scrapers = []
+        self._lock = threading.Lock()
+
+    def _obter_scraper(self):
+        """Retorna o scraper da thread atual, criando-o na primeira fatia do trabalhador"""
+        scraper = getattr(self._local, 'scraper', None)
+        if scraper is None:
+            scraper = self._criar_scraper(pool_extracao=self.pool_extracao, cache_paginas=self.cache_paginas)
+            self._local.scraper = scraper
+            with self._lock:
+                self._scrapers.append(scraper)
+        return scraper
+
+    def _descartar_scraper(self):
+        """Fecha o scraper da thread atual (após uma falha) para que a próxima fatia use um navegador novo"""
+        scraper = getattr(self._local, 'scraper', None)
+        self._local.scraper = None
+        if scraper is None:
+            return
+
+        with self._lock:
+            if scraper in self._scrapers:
+                self._scrapers.remove(scraper)
+        try:
+            scraper.fechar()
+        except Exception as e:
+            logger.error(f"Erro ao fechar o scraper descartado: {e}")
+
+    def processar_fatia(self, fatia):
+        """
+        Pesquisa, extrai e salva as publicações de uma fatia.
+        Retorna um dicionário com 'fatia', 'subfatias' (quando a fatia precisou ser dividida),
+        'publicacoes' e 'salvas'. Exceções sobem para quem chamou.
+        """
+        resultado = {'fatia': fatia, 'subfatias': None, 'publicacoes': 0, 'salvas': 0}
+        scraper = self._obter_scraper()
+
+        logger.info(f"Carga histórica: pesquisando {descrever_fatia(fatia)}")
+        um_dia = fatia.data_inicial == fatia.data_final
+
+        # Numa fatia de vários dias, cada publicação fica com a data do diário lida no seu resultado da pesquisa;
+        # numa fatia de um dia, a data pesquisada cobre os resultados em que a data não foi identificada
+        data_disponibilizacao = fatia.data_inicial.strftime("%Y-%m-%d") if um_dia else None
+        resultado_periodo = scraper.executar_periodo(
+            fatia.data_inicial, fatia.data_final,
+            limite_resultados=self.maximo_resultados, data_disponibilizacao=data_disponibilizacao
+        )
+        if resultado_periodo is None:
+            raise Exception(f"falha na pesquisa de {descrever_fatia(fatia)}")
+
+        if resultado_periodo['excedeu_limite'] and not um_dia:
+            logger.info(f"Carga histórica: {descrever_fatia(fatia)} tem {resultado_periodo['total_resultados']} resultados, dividindo a fatia")
+            resultado['subfatias'] = bisseccionar_fatia(fatia)
+            return resultado
+
+        if resultado_periodo['excedeu_limite']:
+            # Um dia não pode ser dividido: é processado inteiro, mas o excesso fica registrado
+            logger.error(f"Carga histórica: {descrever_fatia(fatia)} tem {resultado_periodo['total_resultados']} resultados, "
+                         f"acima do limite de {self.maximo_resultados} por fatia; processando o dia inteiro")
+            resultado_periodo = scraper.executar_periodo(
+                fatia.data_inicial, fatia.data_final, data_disponibilizacao=data_disponibilizacao
+            )
+            if resultado_periodo is None:
+                raise Exception(f"falha na pesquisa de {descrever_fatia(fatia)}")
+
+        resultado['publicacoes'] = len(resultado_periodo['publicacoes'])
+        resultado['salvas'] = resultado_periodo['salvas']
+        return resultado
+
+    def _executar_fatia(self, fatia):
+        """Executa uma fatia no trabalhador, registrando a falha em vez de propagá-la"""
+        try:
+            return self.processar_fatia(fatia)
+        except Exception as e:
+            logger.error(f"Carga histórica: erro na fatia {descrever_fatia(fatia)}: {e}")
+            logger.error(f"Detalhes do erro: {traceback.format_exc()}")
+            self._descartar_scraper()
+            return None
+
+    def executar(self, data_inicial, data_final):
+        """
+        Executa a carga histórica do período e retorna um resumo com as fatias concluídas,
+        as fatias que falharam e o total de publicações encontradas e salvas.
+        """
+        fatias = dividir_periodo(data_inicial, data_final, self.dias_por_fatia)
+        logger.info(f"Carga histórica de {descrever_fatia(FatiaPeriodo(data_inicial, data_final))}: "
+                    f"{len(fatias)} fatias, {self.trabalhadores} trabalhadores")
+
+        resumo = {'concluidas': [], 'falhas': [], 'publicacoes': 0, 'salvas': 0}
+
+        with ThreadPoolExecutor(max_workers=self.trabalhadores, thread_name_prefix="carga_historica") as executor:
+            pendentes = {executor.submit(self._executar_fatia, fatia): fatia for fatia in fatias}
+
+            while pendentes:
+                concluidos, _ = wait(pendentes, return_when=FIRST_COMPLETED)
+
+                for futuro in concluidos:
+                    fatia = pendentes.pop(futuro)
+                    resultado = futuro.result()
+
+                    if resultado is None:
+                        resumo['falhas'].append(fatia)
+                    elif resultado['subfatias']:
+                        # As metades de uma fatia grande voltam para a fila
+                        for subfatia in resultado['subfatias']:
+                            pendentes[executor.submit(self._executar_fatia, subfatia)] = subfatia
+                    else:
+                        resumo['concluidas'].append(fatia)
+                        resumo['publicacoes'] += resultado['publicacoes']
+                        resumo['salvas'] += resultado['salvas']
+                        logger.info(f"Carga histórica: {descrever_fatia(fatia)} concluída, "
+                                    f"{resultado['salvas']} de {resultado['publicacoes']} publicações salvas")
+
+        if resumo['falhas']:
+            logger.warning(f"Carga histórica: fatias com falha: {', '.join(descrever_fatia(f) for f in resumo['falhas'])}")
+        logger.info(f"Carga histórica finalizada: {len(resumo['concluidas'])} fatias concluídas, "
+                    f"{len(resumo['falhas'])} com falha, {resumo['salvas']} de {resumo['publicacoes']} publicações salvas")
+        return resumo
+
+    def fechar(self):
+        """Fecha os scrapers restantes, o pool de extração e o cache de páginas"""
+        with self._lock:
+            scrapers = list(self._scrapers)
+            self._scrapers = []
+
+        for scraper in scrapers:
+            try:
+                scraper.fechar()
+            except Exception as e:
+                logger.error(f"Erro ao fechar scraper da carga histórica: {e}")
+
+        self.pool_extracao.shutdown(wait=True, cancel_futures=True)
+        fechar_cache_texto()
+
+        if self.cache_paginas:
+            self.cache_paginas.fechar()
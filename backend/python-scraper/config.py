@@ -1,6 +1,7 @@
 import os
 from dotenv import load_dotenv
 import datetime
+import json
 import logging
 
 # Configuração de logging
@@ -25,12 +26,14 @@ DB_CONFIG = {
     'password': get_env_var('DB_PASSWORD', 'admin', 'Utilizando senha do banco de dados')
 }
 
-# URLs para o scraping
-DJE_URL = "https://dje.tjsp.jus.br/cdje/index.do"
-CONSULTA_AVANCADA_URL = "https://dje.tjsp.jus.br/cdje/consultaAvancada.do#buscaavancada"
+# URLs para o scraping (a base pode apontar para um servidor local que sirva páginas gravadas do DJE)
+DJE_URL_BASE = get_env_var('DJE_URL_BASE', 'https://dje.tjsp.jus.br/cdje').rstrip('/')
+DJE_URL = f"{DJE_URL_BASE}/index.do"
+CONSULTA_AVANCADA_URL = f"{DJE_URL_BASE}/consultaAvancada.do#buscaavancada"
 
-# Caderno a ser pesquisado
+# Caderno a ser pesquisado (nome e valor do campo dadosConsulta.cdCaderno)
 CADERNO = "Caderno 3 - Judicial - 1ª Instância - Capital - Parte I"
+CODIGO_CADERNO = "12"
 
 # Palavras-chave para busca
 PALAVRAS_CHAVE = ["RPV", "pagamento pelo INSS"]
@@ -41,9 +44,77 @@ DIAS_PRIMEIRA_BUSCA = 31
 # Horários de execução diária
 HORARIOS_EXECUCAO = ["07:00", "12:00", "20:00"]
 
+# Pesquisa pela consulta avançada direto por HTTP, sem navegador (o formulário pelo Selenium fica como alternativa)
+BUSCA_HTTP_ATIVA = get_env_var('BUSCA_HTTP_ATIVA', 'true').strip().lower() in ('1', 'true', 'sim')
+
+# Esperas do navegador: prazo das esperas por carregamento de página e resultados, prazo das reações
+# dentro da página (campos preenchidos, seleção de texto, navegação entre páginas da publicação) e intervalo de verificação
+ESPERA_TIMEOUT = int(get_env_var('ESPERA_TIMEOUT', '20'))  # segundos
+ESPERA_TIMEOUT_CURTO = int(get_env_var('ESPERA_TIMEOUT_CURTO', '5'))  # segundos
+ESPERA_INTERVALO = float(get_env_var('ESPERA_INTERVALO', '0.2'))  # segundos
+
+# Configurações do download paralelo dos PDFs das páginas do diário
+DOWNLOAD_CONCORRENCIA = int(get_env_var('DOWNLOAD_CONCORRENCIA', '8'))  # downloads simultâneos
+DOWNLOAD_TIMEOUT = int(get_env_var('DOWNLOAD_TIMEOUT', '30'))  # segundos por requisição
+
+# Tamanho máximo aceito para o PDF de uma página (o download é interrompido acima disso)
+PDF_TAMANHO_MAXIMO_MB = int(get_env_var('PDF_TAMANHO_MAXIMO_MB', '20'))
+
+# Processos usados na extração de texto dos PDFs (tarefa que consome CPU)
+EXTRACAO_PROCESSOS = int(get_env_var('EXTRACAO_PROCESSOS', str(os.cpu_count() or 1)))
+
+# Ordem em que os motores de extração de texto são tentados (pypdf2, pdfminer, ocr)
+ORDEM_EXTRATORES = [nome.strip() for nome in get_env_var('ORDEM_EXTRATORES', 'pypdf2,pdfminer').split(',') if nome.strip()]
+# Parâmetros de layout do pdfminer (JSON com campos de LAParams, ex.: {"line_margin": 0.5})
+PDFMINER_LAPARAMS = json.loads(get_env_var('PDFMINER_LAPARAMS', '{}'))
+
+# Sessão HTTP compartilhada (keep-alive) usada nos downloads do DJE
+HTTP_POOL_CONEXOES = int(get_env_var('HTTP_POOL_CONEXOES', str(DOWNLOAD_CONCORRENCIA)))
+# Arquivo onde os cookies da sessão são persistidos entre execuções (vazio desativa)
+ARQUIVO_COOKIES_SESSAO = get_env_var('ARQUIVO_COOKIES_SESSAO', 'data/cookies_sessao.json')
+
+# Cache em disco dos PDFs das páginas do diário (páginas publicadas não mudam)
+DIRETORIO_CACHE_PAGINAS = get_env_var('DIRETORIO_CACHE_PAGINAS', 'data/cache_paginas')
+CACHE_PAGINAS_TAMANHO_MAXIMO_MB = int(get_env_var('CACHE_PAGINAS_TAMANHO_MAXIMO_MB', '2048'))
+# Cache do texto já extraído de cada PDF, por hash do PDF e versão dos extratores (vazio desativa)
+ARQUIVO_CACHE_TEXTO = get_env_var('ARQUIVO_CACHE_TEXTO', 'data/cache_texto.sqlite3')
+
+# Pipeline das publicações (descoberta -> download -> extração de texto -> processamento -> gravação)
+PIPELINE_CAPACIDADE_FILA = int(get_env_var('PIPELINE_CAPACIDADE_FILA', '32'))  # itens entre dois estágios
+PIPELINE_CONCORRENCIA_DOWNLOAD = int(get_env_var('PIPELINE_CONCORRENCIA_DOWNLOAD', str(DOWNLOAD_CONCORRENCIA)))
+PIPELINE_CONCORRENCIA_EXTRACAO = int(get_env_var('PIPELINE_CONCORRENCIA_EXTRACAO', str(EXTRACAO_PROCESSOS)))
+PIPELINE_CONCORRENCIA_PROCESSAMENTO = int(get_env_var('PIPELINE_CONCORRENCIA_PROCESSAMENTO', '1'))
+
+# Diário das execuções (URLs encontradas e etapa de cada uma), para retomar execuções interrompidas (vazio desativa)
+ARQUIVO_DIARIO_EXECUCAO = get_env_var('ARQUIVO_DIARIO_EXECUCAO', 'data/diario_execucao.sqlite3')
+DIARIO_EXECUCAO_RETENCAO_DIAS = int(get_env_var('DIARIO_EXECUCAO_RETENCAO_DIAS', '7'))  # execuções concluídas mantidas
+
+# Páginas mantidas em memória pelo fluxo de páginas (junção de processos entre páginas vizinhas)
+FLUXO_PAGINAS_CAPACIDADE = int(get_env_var('FLUXO_PAGINAS_CAPACIDADE', '256'))
+
+# Varredura completa de um caderno (modo de backfill sem o formulário de pesquisa)
+VARREDURA_LOTE_PAGINAS = int(get_env_var('VARREDURA_LOTE_PAGINAS', '64'))  # páginas baixadas por janela
+VARREDURA_PAGINAS_VAZIAS_FIM = int(get_env_var('VARREDURA_PAGINAS_VAZIAS_FIM', '3'))  # páginas seguidas inexistentes = fim do caderno
+VARREDURA_TENTATIVAS = int(get_env_var('VARREDURA_TENTATIVAS', '3'))  # tentativas por página com falha transitória ou de extração
+
+# Carga histórica da primeira execução, dividida em fatias de datas processadas em paralelo
+CARGA_HISTORICA_TRABALHADORES = int(get_env_var('CARGA_HISTORICA_TRABALHADORES', '3'))  # navegadores simultâneos
+CARGA_HISTORICA_DIAS_POR_FATIA = int(get_env_var('CARGA_HISTORICA_DIAS_POR_FATIA', '1'))
+CARGA_HISTORICA_MAXIMO_RESULTADOS = int(get_env_var('CARGA_HISTORICA_MAXIMO_RESULTADOS', '200'))  # acima disso a fatia é dividida
+
 # Configuração para tentativas de conexão com o banco
 DB_CONNECT_MAX_RETRIES = 5
 DB_CONNECT_RETRY_DELAY = 5  # segundos
+# Pool de conexões do processo com o banco
+DB_POOL_MINIMO = int(get_env_var('DB_POOL_MINIMO', '1'))
+DB_POOL_MAXIMO = int(get_env_var('DB_POOL_MAXIMO', '10'))
+DB_POOL_VERIFICAR_APOS = int(get_env_var('DB_POOL_VERIFICAR_APOS', '30'))  # segundos parada antes de testar a conexão
+# Publicações gravadas por comando na inserção em lote
+DB_LOTE_INSERCAO = int(get_env_var('DB_LOTE_INSERCAO', '500'))
+# Publicações antigas atualizadas por comando no preenchimento do hash do conteúdo
+DB_LOTE_HASH = int(get_env_var('DB_LOTE_HASH', '1000'))
+# Publicações antigas atualizadas por comando no preenchimento da busca textual (tsvector)
+DB_LOTE_BUSCA_TEXTO = int(get_env_var('DB_LOTE_BUSCA_TEXTO', '500'))
 
 # Função para verificar se é fim de semana
 def eh_fim_de_semana(data):
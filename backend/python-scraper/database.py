@@ -1,50 +1,336 @@
+import hashlib
 import psycopg2
-from psycopg2 import extras
+from psycopg2 import extras, pool
 import logging
-from config import DB_CONFIG, DB_CONNECT_MAX_RETRIES, DB_CONNECT_RETRY_DELAY
+import threading
+from config import (DB_CONFIG, DB_CONNECT_MAX_RETRIES, DB_CONNECT_RETRY_DELAY, DB_LOTE_INSERCAO, DB_LOTE_HASH, DB_LOTE_BUSCA_TEXTO,
+                    DB_POOL_MINIMO, DB_POOL_MAXIMO, DB_POOL_VERIFICAR_APOS)
 import datetime
 import time
+from collections import namedtuple
+from contextlib import contextmanager
+from migracoes import aplicar_migracoes
 
 logger = logging.getLogger("DJE_Scraper")
 
+# Colunas gravadas na inserção de publicações, na ordem de preparar_valores_publicacao (+ data_criacao)
+COLUNAS_INSERCAO = """
+                        numero_processo, 
+                        data_disponibilizacao, 
+                        autor, 
+                        reu, 
+                        advogado, 
+                        valor_principal,
+                        valor_juros_moratorios, 
+                        honorarios_advocaticios, 
+                        conteudo_completo, 
+                        hash_conteudo, 
+                        pagina_texto_id, 
+                        conteudo_inicio, 
+                        conteudo_fim, 
+                        status, 
+                        data_criacao
+                    """
+
+# Marcadores dos valores de uma publicação (preparar_valores_publicacao) + NOW() de data_criacao
+MARCADORES_INSERCAO = "(" + ", ".join(["%s"] * 14) + ", NOW())"
+
+# Colunas com os dados extraídos, atualizadas quando uma publicação existente é reprocessada
+COLUNAS_ATUALIZACAO = [
+    'autor', 'reu', 'advogado', 'valor_principal', 'valor_juros_moratorios',
+    'honorarios_advocaticios', 'conteudo_completo', 'hash_conteudo', 'pagina_texto_id',
+    'conteudo_inicio', 'conteudo_fim'
+]
+
+# Alvos do ON CONFLICT: a chave natural ou, nas publicações sem número de processo (que o índice da chave
+# não alcança, pois NULLs são distintos), o hash do conteúdo no índice único parcial
+CONFLITO_CHAVE = "(numero_processo, data_disponibilizacao)"
+CONFLITO_SEM_PROCESSO = "(hash_conteudo) WHERE numero_processo IS NULL"
+
+def alvo_conflito(valores):
+    """Alvo do ON CONFLICT da publicação, a partir da tupla de preparar_valores_publicacao"""
+    return CONFLITO_CHAVE if valores[0] is not None else CONFLITO_SEM_PROCESSO
+
+# Trecho do texto de uma página do diário onde está o conteúdo de uma publicação
+TrechoPagina = namedtuple('TrechoPagina', ['chave_pagina', 'hash_texto', 'texto', 'inicio', 'fim'])
+
+def calcular_hash_conteudo(conteudo_completo):
+    """MD5 (hexadecimal) do conteúdo gravado, igual ao MD5(conteudo_completo) do PostgreSQL"""
+    if conteudo_completo is None:
+        return None
+    return hashlib.md5(conteudo_completo.encode('utf-8')).hexdigest()
+
+def normalizar_data(data):
+    """Certifica-se de que a data é um objeto date (aceita AAAA-MM-DD e DD/MM/AAAA)"""
+    if isinstance(data, str):
+        try:
+            data = datetime.datetime.strptime(data, "%Y-%m-%d").date()
+        except:
+            try:
+                data = datetime.datetime.strptime(data, "%d/%m/%Y").date()
+            except:
+                logger.warning(f"Formato de data inválido: {data}. Usando data atual.")
+                data = datetime.date.today()
+    return data
+
+def localizar_conteudo_na_pagina(publicacao):
+    """
+    Localiza o conteúdo da publicação no texto da página de onde ele foi extraído ('chave_pagina' e 'texto_pagina').
+    Retorna um TrechoPagina, ou None se o conteúdo não for um trecho do texto da página (processo emendado
+    com a página seguinte, texto obtido por outro meio) e precisar ser gravado inteiro na publicação.
+    """
+    chave_pagina = publicacao.get('chave_pagina')
+    texto_pagina = publicacao.get('texto_pagina')
+    conteudo_completo = publicacao.get('conteudo_completo')
+    if not chave_pagina or not texto_pagina or not conteudo_completo:
+        return None
+    
+    inicio = texto_pagina.find(conteudo_completo)
+    if inicio == -1:
+        return None
+    return TrechoPagina(tuple(chave_pagina), calcular_hash_conteudo(texto_pagina), texto_pagina,
+                        inicio, inicio + len(conteudo_completo))
+
+def preparar_valores_publicacao(publicacao, referencia=None):
+    """
+    Monta a tupla de valores de uma publicação para a inserção. Com `referencia` (pagina_texto_id, inicio, fim),
+    o conteúdo não é copiado na publicação: ele é o trecho [inicio, fim) do texto da página em paginas_texto.
+    """
+    conteudo_completo = publicacao.get('conteudo_completo', '')
+    pagina_texto_id = conteudo_inicio = conteudo_fim = None
+    
+    # O hash é sempre do conteúdo inteiro, como em ChavesExistentes.contem_publicacao
+    hash_conteudo = calcular_hash_conteudo(conteudo_completo)
+    
+    if referencia:
+        pagina_texto_id, conteudo_inicio, conteudo_fim = referencia
+        conteudo_completo = None
+    elif conteudo_completo and len(conteudo_completo) > 1000000:  # Limita a 1MB
+        # Limita o tamanho do conteúdo completo para evitar erros de tamanho máximo
+        conteudo_completo = conteudo_completo[:1000000] + "... (truncado)"
+        logger.warning(f"Conteúdo da publicação truncado por exceder tamanho máximo")
+    
+    return (
+        publicacao.get('numero_processo'),
+        normalizar_data(publicacao.get('data_disponibilizacao')),
+        publicacao.get('autor'),
+        publicacao.get('reu', "Instituto Nacional do Seguro Social - INSS"),
+        publicacao.get('advogado'),
+        publicacao.get('valor_principal'),
+        publicacao.get('valor_juros_moratorios'),
+        publicacao.get('honorarios_advocaticios'),
+        conteudo_completo,
+        hash_conteudo,
+        pagina_texto_id,
+        conteudo_inicio,
+        conteudo_fim,
+        'nova'
+    )
+
+class ChavesExistentes:
+    """
+    Chaves (numero_processo, data_disponibilizacao) e hashes de conteúdo das publicações já gravadas numa janela
+    de datas, carregados de uma vez para que as verificações de duplicidade da execução dispensem o banco.
+    Um acerto é definitivo (a publicação existe); só os demais casos precisam ser confirmados no banco.
+    """
+
+    def __init__(self, data_inicial, data_final, linhas=()):
+        """linhas: tuplas (numero_processo, data_disponibilizacao, hash_conteudo) gravadas na janela"""
+        self.data_inicial = normalizar_data(data_inicial)
+        self.data_final = normalizar_data(data_final)
+        self.chaves = set()
+        self.hashes = set()
+        self.hashes_sem_processo = set()
+        for numero_processo, data_disponibilizacao, hash_conteudo in linhas:
+            self.chaves.add((numero_processo, data_disponibilizacao))
+            if hash_conteudo:
+                self.hashes.add(hash_conteudo)
+                if numero_processo is None:
+                    self.hashes_sem_processo.add(hash_conteudo)
+
+    def contem(self, numero_processo, data_disponibilizacao):
+        """Indica se a chave da publicação já está gravada"""
+        return (numero_processo, normalizar_data(data_disponibilizacao)) in self.chaves
+
+    def contem_hash(self, hash_conteudo):
+        """Indica se já há publicação gravada na janela com o mesmo conteúdo"""
+        return hash_conteudo in self.hashes
+
+    def contem_publicacao(self, publicacao):
+        """
+        Indica se a publicação já está gravada pela chave do seu ON CONFLICT: processo e data
+        ou, sem número de processo, o hash do conteúdo
+        """
+        if publicacao.get('numero_processo') is None:
+            hash_conteudo = calcular_hash_conteudo(publicacao.get('conteudo_completo', ''))
+            return hash_conteudo in self.hashes_sem_processo
+        return self.contem(publicacao.get('numero_processo'), publicacao.get('data_disponibilizacao'))
+
+    def adicionar(self, valores):
+        """Registra uma publicação gravada, a partir da tupla de preparar_valores_publicacao"""
+        if valores[0] and valores[1]:
+            self.chaves.add((valores[0], valores[1]))
+        if valores[9]:
+            self.hashes.add(valores[9])
+            if valores[0] is None:
+                self.hashes_sem_processo.add(valores[9])
+
+class PoolConexoes:
+    """
+    Pool de conexões do processo (ThreadedConnectionPool) com no máximo DB_POOL_MAXIMO conexões.
+    Quem pede uma conexão com o pool cheio espera a devolução de outra em vez de falhar, e uma conexão
+    parada há mais de DB_POOL_VERIFICAR_APOS segundos é testada (SELECT 1) antes de ser entregue.
+    """
+    
+    def __init__(self, minimo=DB_POOL_MINIMO, maximo=DB_POOL_MAXIMO, verificar_apos=DB_POOL_VERIFICAR_APOS):
+        self.maximo = max(1, int(maximo))
+        self.verificar_apos = verificar_apos
+        self._vagas = threading.BoundedSemaphore(self.maximo)
+        self._ultimo_uso = {}
+        self._pool = pool.ThreadedConnectionPool(
+            min(max(0, int(minimo)), self.maximo), self.maximo,
+            host=DB_CONFIG['host'],
+            port=DB_CONFIG['port'],
+            database=DB_CONFIG['database'],
+            user=DB_CONFIG['user'],
+            password=DB_CONFIG['password'],
+            connect_timeout=15  # Timeout de 15 segundos para a conexão
+        )
+        logger.info(f"Pool de conexões com o banco de dados {DB_CONFIG['database']} criado (máximo de {self.maximo} conexões)")
+    
+    def _saudavel(self, conn):
+        """Verifica se a conexão ainda responde (só testa conexões paradas há algum tempo)"""
+        if conn.closed:
+            return False
+        if time.monotonic() - self._ultimo_uso.get(id(conn), 0) < self.verificar_apos:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            return True
+        except Exception:
+            return False
+    
+    def emprestar(self):
+        """Retorna uma conexão saudável do pool (em autocommit), esperando vaga se necessário"""
+        self._vagas.acquire()
+        try:
+            for _ in range(self.maximo + 1):
+                conn = self._pool.getconn()
+                if self._saudavel(conn):
+                    # Ativa autocommit para evitar transações pendentes
+                    if not conn.autocommit:
+                        conn.set_session(autocommit=True)
+                    return conn
+                logger.warning("Conexão do pool não responde, descartando")
+                self._ultimo_uso.pop(id(conn), None)
+                self._pool.putconn(conn, close=True)
+            raise psycopg2.OperationalError("Nenhuma conexão saudável disponível no pool")
+        except Exception:
+            self._vagas.release()
+            raise
+    
+    def devolver(self, conn, descartar=False):
+        """Devolve a conexão ao pool (fechando-a se estiver quebrada ou se `descartar`)"""
+        try:
+            descartar = descartar or conn.closed
+            if descartar:
+                self._ultimo_uso.pop(id(conn), None)
+            else:
+                self._ultimo_uso[id(conn)] = time.monotonic()
+            self._pool.putconn(conn, close=descartar)
+        except Exception as e:
+            logger.warning(f"Erro ao devolver conexão ao pool: {e}")
+        finally:
+            self._vagas.release()
+    
+    def fechar(self):
+        """Fecha todas as conexões do pool"""
+        self._pool.closeall()
+
+_pool_conexoes = None
+_esquema_inicializado = False
+_lock_pool = threading.Lock()
+_lock_esquema = threading.Lock()
+
+def obter_pool_conexoes():
+    """Retorna o pool de conexões do processo, criando-o na primeira utilização (None se o banco estiver indisponível)"""
+    global _pool_conexoes
+    with _lock_pool:
+        if _pool_conexoes is None:
+            try:
+                logger.info(f"Conectando ao banco de dados {DB_CONFIG['database']} no host {DB_CONFIG['host']}:{DB_CONFIG['port']}...")
+                _pool_conexoes = PoolConexoes()
+            except psycopg2.OperationalError as e:
+                logger.error(f"Erro operacional ao conectar ao banco de dados: {e}")
+            except Exception as e:
+                logger.error(f"Erro ao conectar ao banco de dados: {e}")
+        return _pool_conexoes
+
+def fechar_pool_conexoes():
+    """Fecha o pool de conexões do processo, se existir"""
+    global _pool_conexoes
+    with _lock_pool:
+        if _pool_conexoes:
+            _pool_conexoes.fechar()
+            logger.info("Pool de conexões com o banco de dados fechado.")
+        _pool_conexoes = None
+
+def devolver_conexao(conn):
+    """Devolve ao pool uma conexão obtida por conectar_banco()"""
+    if conn and _pool_conexoes:
+        _pool_conexoes.devolver(conn)
+
 class Database:
     """Classe para gerenciar conexões e operações com o banco de dados"""
     
-    def __init__(self):
-        """Inicializa a conexão com o banco de dados"""
-        # Tenta conectar várias vezes antes de desistir
-        self.conn = None
-        for tentativa in range(1, DB_CONNECT_MAX_RETRIES + 1):
-            self.conn = self.conectar()
-            if self.conn:
-                logger.info(f"Conexão estabelecida na tentativa {tentativa}")
-                if self.criar_tabela_publicacoes():
-                    logger.info("Inicialização do banco de dados concluída com sucesso")
-                break
-            else:
-                logger.warning(f"Tentativa {tentativa} de conexão falhou. Aguardando {DB_CONNECT_RETRY_DELAY} segundos...")
-                if tentativa < DB_CONNECT_MAX_RETRIES:
-                    time.sleep(DB_CONNECT_RETRY_DELAY)
+    def __init__(self, conn=None):
+        """
+        Usa a conexão informada (que continua sendo de quem a passou) ou empresta uma do pool
+        de conexões do processo, devolvida em fechar_conexao(). A criação do schema roda uma vez por processo.
+        """
+        self.conn = conn
+        self.chaves_existentes = None
+        self._emprestada = False
+        
+        if self.conn is None:
+            # Tenta conectar várias vezes antes de desistir
+            for tentativa in range(1, DB_CONNECT_MAX_RETRIES + 1):
+                self.conn = self.conectar()
+                if self.conn:
+                    self._emprestada = True
+                    break
                 else:
-                    logger.error(f"Todas as {DB_CONNECT_MAX_RETRIES} tentativas de conexão falharam.")
+                    logger.warning(f"Tentativa {tentativa} de conexão falhou. Aguardando {DB_CONNECT_RETRY_DELAY} segundos...")
+                    if tentativa < DB_CONNECT_MAX_RETRIES:
+                        time.sleep(DB_CONNECT_RETRY_DELAY)
+                    else:
+                        logger.error(f"Todas as {DB_CONNECT_MAX_RETRIES} tentativas de conexão falharam.")
+        
+        if self.conn:
+            self.inicializar_esquema()
+    
+    def inicializar_esquema(self):
+        """Aplica as migrações do schema uma única vez por processo"""
+        global _esquema_inicializado
+        if _esquema_inicializado:
+            return True
+        
+        with _lock_esquema:
+            if not _esquema_inicializado and self.criar_tabela_publicacoes():
+                self.preencher_hash_conteudo()
+                self.preencher_busca_texto()
+                logger.info("Inicialização do banco de dados concluída com sucesso")
+                _esquema_inicializado = True
+        return _esquema_inicializado
     
     def conectar(self):
-        """Estabelece conexão com o banco de dados PostgreSQL"""
+        """Obtém uma conexão do pool de conexões do processo (None se o banco estiver indisponível)"""
+        pool_conexoes = obter_pool_conexoes()
+        if not pool_conexoes:
+            return None
         try:
-            logger.info(f"Conectando ao banco de dados {DB_CONFIG['database']} no host {DB_CONFIG['host']}:{DB_CONFIG['port']}...")
-            # Adiciona timeout explícito para a conexão
-            conn = psycopg2.connect(
-                host=DB_CONFIG['host'],
-                port=DB_CONFIG['port'],
-                database=DB_CONFIG['database'],
-                user=DB_CONFIG['user'],
-                password=DB_CONFIG['password'],
-                connect_timeout=15  # Timeout de 15 segundos para a conexão
-            )
-            # Ativa autocommit para evitar transações pendentes
-            conn.set_session(autocommit=True)
-            logger.info(f"Conexão com o banco de dados {DB_CONFIG['database']} estabelecida com sucesso.")
-            return conn
+            return pool_conexoes.emprestar()
         except psycopg2.OperationalError as e:
             logger.error(f"Erro operacional ao conectar ao banco de dados: {e}")
             return None
@@ -52,6 +338,15 @@ class Database:
             logger.error(f"Erro ao conectar ao banco de dados: {e}")
             return None
     
+    def _reconectar(self):
+        """Descarta a conexão atual (se emprestada do pool) e obtém outra"""
+        if self._emprestada and self.conn is not None and _pool_conexoes:
+            _pool_conexoes.devolver(self.conn, descartar=True)
+        self._emprestada = False
+        self.conn = self.conectar()
+        self._emprestada = self.conn is not None
+        return self.conn
+    
     def executar_com_retry(self, funcao, *args, max_retries=3, retry_delay=2):
         """
         Executa uma função com mecanismo de retry
@@ -61,8 +356,7 @@ class Database:
                 # Verifica se a conexão está ativa
                 if not self.conn or self.conn.closed:
                     logger.warning(f"Conexão fechada antes de executar {funcao.__name__}. Reconectando...")
-                    self.conn = self.conectar()
-                    if not self.conn:
+                    if not self._reconectar():
                         logger.error("Falha ao reconectar ao banco de dados")
                         if tentativa == max_retries:
                             return None
@@ -76,7 +370,7 @@ class Database:
                 if tentativa < max_retries:
                     logger.info(f"Tentando reconectar ao banco de dados...")
                     time.sleep(retry_delay)
-                    self.conn = self.conectar()
+                    self._reconectar()
                 else:
                     logger.error(f"Todas as {max_retries} tentativas falharam para {funcao.__name__}")
                     return None
@@ -85,53 +379,100 @@ class Database:
                 return None
     
     def criar_tabela_publicacoes(self):
-        """Cria a tabela de publicações se ela não existir"""
-        def _criar_tabela():
+        """Cria ou atualiza o schema da tabela de publicações aplicando as migrações pendentes (migracoes.py)"""
+        def _aplicar_migracoes():
+            return aplicar_migracoes(self.conn)
+        
+        return self.executar_com_retry(_aplicar_migracoes)
+    
+    def _preencher_em_lotes(self, descricao, atribuicao, condicao, tamanho_lote):
+        """
+        Executa `UPDATE publicacoes SET <atribuicao>` nas linhas que atendem `condicao`, em lotes de
+        `tamanho_lote` linhas (cada lote numa transação curta), até não restar nenhuma.
+        Um EXISTS (pelo índice parcial da condição) evita os lotes quando não há o que preencher,
+        o caso comum em toda inicialização depois do primeiro preenchimento.
+        Retorna o total de linhas atualizadas.
+        """
+        def _existem_pendentes():
             try:
                 with self.conn.cursor() as cursor:
-                    # Primeiro, verifica se o schema public existe
-                    cursor.execute("CREATE SCHEMA IF NOT EXISTS public")
-                    
-                    # Cria o enum de status se não existir
-                    cursor.execute("""
-                    DO $$
-                    BEGIN
-                        IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'status_enum') THEN
-                            CREATE TYPE status_enum AS ENUM ('nova', 'lida', 'enviada', 'processada');
-                        END IF;
-                    END
-                    $$;
-                    """)
-                    
-                    # Cria a tabela de publicações se não existir
-                    cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS publicacoes (
-                        id SERIAL PRIMARY KEY,
-                        numero_processo VARCHAR(50),
-                        data_disponibilizacao DATE,
-                        autor TEXT,
-                        reu TEXT DEFAULT 'Instituto Nacional do Seguro Social - INSS',
-                        advogado TEXT,
-                        valor_principal DECIMAL(10, 2),
-                        valor_juros_moratorios DECIMAL(10, 2),
-                        honorarios_advocaticios DECIMAL(10, 2),
-                        conteudo_completo TEXT,
-                        status status_enum DEFAULT 'nova',
-                        data_criacao TIMESTAMP NOT NULL DEFAULT NOW(),
-                        data_atualizacao TIMESTAMP
-                    )
-                    """)
-                    
-                    logger.info("Tabela 'publicacoes' verificada/criada com sucesso.")
-                    return True
+                    cursor.execute(f"SELECT EXISTS (SELECT 1 FROM publicacoes WHERE {condicao})")
+                    return cursor.fetchone()[0]
             except Exception as e:
-                logger.error(f"Erro ao criar tabela de publicações: {e}")
-                return False
+                logger.error(f"Erro ao verificar {descricao} das publicações: {e}")
+                return None
+        
+        if self.executar_com_retry(_existem_pendentes) is False:
+            return 0
+        
+        def _preencher_lote():
+            try:
+                with self.conn.cursor() as cursor:
+                    cursor.execute(f"""
+                    UPDATE publicacoes SET {atribuicao}
+                    WHERE id IN (SELECT id FROM publicacoes WHERE {condicao} LIMIT %s)
+                    """, (tamanho_lote,))
+                    return cursor.rowcount
+            except Exception as e:
+                logger.error(f"Erro ao preencher {descricao} das publicações: {e}")
+                return None
         
-        return self.executar_com_retry(_criar_tabela)
+        total = 0
+        while True:
+            preenchidas = self.executar_com_retry(_preencher_lote)
+            if not preenchidas:
+                break
+            total += preenchidas
+            logger.info(f"{descricao.capitalize()} preenchido em {total} publicações existentes")
+        return total
+    
+    def preencher_hash_conteudo(self, tamanho_lote=DB_LOTE_HASH):
+        """Preenche o hash_conteudo das publicações gravadas antes da coluna existir"""
+        return self._preencher_em_lotes(
+            'o hash do conteúdo',
+            "hash_conteudo = MD5(conteudo_completo)",
+            "hash_conteudo IS NULL AND conteudo_completo IS NOT NULL",
+            tamanho_lote
+        )
+    
+    def preencher_busca_texto(self, tamanho_lote=DB_LOTE_BUSCA_TEXTO):
+        """Preenche a busca_texto (tsvector) das publicações gravadas antes da coluna existir"""
+        return self._preencher_em_lotes(
+            'o tsvector da busca textual',
+            "busca_texto = publicacoes_busca_texto(numero_processo, autor, reu, advogado, "
+            "publicacao_conteudo(conteudo_completo, pagina_texto_id, conteudo_inicio, conteudo_fim))",
+            "busca_texto IS NULL",
+            tamanho_lote
+        )
+    
+    def carregar_chaves_existentes(self, data_inicial, data_final):
+        """
+        Carrega em memória as chaves e os hashes de conteúdo das publicações gravadas entre as datas
+        (inclusive), usados pelas verificações de duplicidade e pelas inserções desta instância.
+        Retorna o ChavesExistentes carregado, ou None se a consulta falhar (as verificações seguem no banco).
+        """
+        linhas = self.consultar_query("""
+        SELECT numero_processo, data_disponibilizacao, hash_conteudo FROM publicacoes
+        WHERE data_disponibilizacao BETWEEN %s AND %s
+        """, (normalizar_data(data_inicial), normalizar_data(data_final)))
+        if linhas is None:
+            self.chaves_existentes = None
+            return None
+        
+        self.chaves_existentes = ChavesExistentes(data_inicial, data_final, linhas)
+        logger.info(f"Carregadas {len(self.chaves_existentes.chaves)} chaves de publicações já gravadas "
+                    f"entre {self.chaves_existentes.data_inicial} e {self.chaves_existentes.data_final}")
+        return self.chaves_existentes
     
     def verificar_publicacao_existente(self, numero_processo, data_disponibilizacao, conteudo_md5=None):
         """Verifica se uma publicação já existe no banco de dados"""
+        # Acerto nas chaves pré-carregadas da janela dispensa a consulta ao banco
+        if self.chaves_existentes:
+            if numero_processo and data_disponibilizacao and self.chaves_existentes.contem(numero_processo, data_disponibilizacao):
+                return True
+            if conteudo_md5 and not (numero_processo and data_disponibilizacao) and self.chaves_existentes.contem_hash(conteudo_md5):
+                return True
+        
         def _verificar():
             try:
                 with self.conn.cursor() as cursor:
@@ -150,7 +491,7 @@ class Database:
                     elif conteudo_md5:
                         query = """
                         SELECT id FROM publicacoes 
-                        WHERE MD5(conteudo_completo) = %s
+                        WHERE hash_conteudo = %s
                         """
                         cursor.execute(query, (conteudo_md5,))
                         resultado = cursor.fetchone()
@@ -163,90 +504,218 @@ class Database:
         
         return self.executar_com_retry(_verificar)
     
+    @contextmanager
+    def _transacao(self):
+        """
+        Cursor numa transação explícita (as conexões do pool ficam em autocommit): tudo o que for executado
+        no bloco é confirmado junto no fim ou desfeito junto se o bloco levantar uma exceção
+        """
+        autocommit_original = self.conn.autocommit
+        self.conn.autocommit = False
+        try:
+            with self.conn.cursor() as cursor:
+                yield cursor
+            self.conn.commit()
+        except Exception:
+            try:
+                self.conn.rollback()
+            except Exception:
+                pass
+            raise
+        finally:
+            try:
+                self.conn.autocommit = autocommit_original
+            except Exception:
+                pass
+    
+    def _gravar_paginas_texto(self, cursor, trechos):
+        """
+        Garante em paginas_texto o texto das páginas dos trechos (uma linha por página e hash do texto;
+        páginas já gravadas não são enviadas de novo) e retorna {(chave_pagina, hash_texto): id}
+        """
+        paginas = {(trecho.chave_pagina, trecho.hash_texto): trecho.texto for trecho in trechos}
+        if not paginas:
+            return {}
+        
+        def _consultar(chaves):
+            cursor.execute("""
+            SELECT id, cd_volume, nu_diario, cd_caderno, nu_seqpagina, hash_texto FROM paginas_texto
+            WHERE (cd_volume, nu_diario, cd_caderno, nu_seqpagina, hash_texto) IN %s
+            """, (tuple(chave + (hash_texto,) for chave, hash_texto in chaves),))
+            return {(tuple(linha[1:5]), linha[5]): linha[0] for linha in cursor.fetchall()}
+        
+        ids = _consultar(paginas)
+        faltantes = [chave for chave in paginas if chave not in ids]
+        if faltantes:
+            linhas = extras.execute_values(
+                cursor,
+                """
+                INSERT INTO paginas_texto (cd_volume, nu_diario, cd_caderno, nu_seqpagina, hash_texto, texto) VALUES %s
+                ON CONFLICT (cd_volume, nu_diario, cd_caderno, nu_seqpagina, hash_texto) DO NOTHING
+                RETURNING id, cd_volume, nu_diario, cd_caderno, nu_seqpagina, hash_texto
+                """,
+                [chave + (hash_texto, paginas[(chave, hash_texto)]) for chave, hash_texto in faltantes],
+                fetch=True
+            )
+            ids.update({(tuple(linha[1:5]), linha[5]): linha[0] for linha in linhas})
+            
+            # Páginas gravadas ao mesmo tempo por outro processo
+            faltantes = [chave for chave in faltantes if chave not in ids]
+            if faltantes:
+                ids.update(_consultar(faltantes))
+        return ids
+    
+    def _preparar_valores_lote(self, cursor, publicacoes):
+        """
+        Monta os valores das publicações para a inserção: o conteúdo que é trecho do texto da sua página
+        vira uma referência para paginas_texto (gravada aqui); o restante é copiado na publicação
+        """
+        trechos = [localizar_conteudo_na_pagina(publicacao) for publicacao in publicacoes]
+        ids_paginas = self._gravar_paginas_texto(cursor, [trecho for trecho in trechos if trecho])
+        
+        valores = []
+        for publicacao, trecho in zip(publicacoes, trechos):
+            referencia = None
+            if trecho:
+                referencia = (ids_paginas[(trecho.chave_pagina, trecho.hash_texto)], trecho.inicio, trecho.fim)
+            valores.append(preparar_valores_publicacao(publicacao, referencia))
+        return valores
+    
     def inserir_publicacao(self, publicacao):
-        """Insere uma nova publicação no banco de dados"""
+        """Insere uma nova publicação no banco de dados (None se ela já existir)"""
         def _inserir():
             try:
-                # Verifica se a publicação já existe
-                if publicacao.get('numero_processo') and publicacao.get('data_disponibilizacao'):
-                    if self.verificar_publicacao_existente(
-                        publicacao.get('numero_processo'), 
-                        publicacao.get('data_disponibilizacao')
-                    ):
-                        logger.info(f"Publicação já existe no banco: Processo {publicacao.get('numero_processo')}")
-                        return None
-                
                 # Log dos dados principais antes da inserção
                 logger.debug(f"Inserindo publicação - Processo: {publicacao.get('numero_processo')}, "
                           f"Data: {publicacao.get('data_disponibilizacao')}")
                 
-                with self.conn.cursor() as cursor:
-                    query = """
-                    INSERT INTO publicacoes (
-                        numero_processo, 
-                        data_disponibilizacao, 
-                        autor, 
-                        reu, 
-                        advogado, 
-                        valor_principal,
-                        valor_juros_moratorios, 
-                        honorarios_advocaticios, 
-                        conteudo_completo, 
-                        status, 
-                        data_criacao
-                    ) VALUES (
-                        %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, NOW()
-                    ) RETURNING id
-                    """
-                    
-                    # Certifica-se de que a data é um objeto date
-                    data = publicacao.get('data_disponibilizacao')
-                    if isinstance(data, str):
-                        try:
-                            data = datetime.datetime.strptime(data, "%Y-%m-%d").date()
-                        except:
-                            try:
-                                data = datetime.datetime.strptime(data, "%d/%m/%Y").date()
-                            except:
-                                logger.warning(f"Formato de data inválido: {data}. Usando data atual.")
-                                data = datetime.date.today()
-                    
-                    # Limita o tamanho do conteúdo completo para evitar erros de tamanho máximo
-                    conteudo_completo = publicacao.get('conteudo_completo', '')
-                    if conteudo_completo and len(conteudo_completo) > 1000000:  # Limita a 1MB
-                        conteudo_completo = conteudo_completo[:1000000] + "... (truncado)"
-                        logger.warning(f"Conteúdo da publicação truncado por exceder tamanho máximo")
+                if self.chaves_existentes and self.chaves_existentes.contem_publicacao(publicacao):
+                    logger.info(f"Publicação já existe no banco: Processo {publicacao.get('numero_processo')}")
+                    return None
+                
+                # O texto da página e a publicação que o referencia são gravados na mesma transação
+                with self._transacao() as cursor:
+                    # Prepara os valores para inserção (gravando antes o texto da página, se for o caso)
+                    valores = self._preparar_valores_lote(cursor, [publicacao])[0]
                     
-                    # Prepara os valores para inserção
-                    valores = (
-                        publicacao.get('numero_processo'),
-                        data,
-                        publicacao.get('autor'),
-                        publicacao.get('reu', "Instituto Nacional do Seguro Social - INSS"),
-                        publicacao.get('advogado'),
-                        publicacao.get('valor_principal'),
-                        publicacao.get('valor_juros_moratorios'),
-                        publicacao.get('honorarios_advocaticios'),
-                        conteudo_completo,
-                        'nova'
-                    )
+                    # Publicação já existente (mesmo processo e data, ou mesmo conteúdo sem processo) não é inserida de novo
+                    query = f"""
+                    INSERT INTO publicacoes ({COLUNAS_INSERCAO}) VALUES {MARCADORES_INSERCAO}
+                    ON CONFLICT {alvo_conflito(valores)} DO NOTHING RETURNING id
+                    """
                     
                     # Log para debug
                     logger.debug(f"Executando query INSERT para processo {publicacao.get('numero_processo')}")
                     
                     # Executa a inserção
                     cursor.execute(query, valores)
-                    id_publicacao = cursor.fetchone()[0]
-                    
-                    logger.info(f"Publicação inserida com sucesso: ID {id_publicacao}")
-                    return id_publicacao
-                    
+                    linha = cursor.fetchone()
+                
+                if self.chaves_existentes:
+                    self.chaves_existentes.adicionar(valores)
+                if not linha:
+                    logger.info(f"Publicação já existe no banco: Processo {publicacao.get('numero_processo')}")
+                    return None
+                id_publicacao = linha[0]
+                
+                logger.info(f"Publicação inserida com sucesso: ID {id_publicacao}")
+                return id_publicacao
+                
             except Exception as e:
                 logger.error(f"Erro ao inserir publicação: {e}")
                 return None
         
         return self.executar_com_retry(_inserir)
     
+    def inserir_publicacoes(self, publicacoes, tamanho_lote=DB_LOTE_INSERCAO, atualizar=False):
+        """
+        Insere várias publicações de uma vez, com um INSERT de várias linhas (execute_values) por lote
+        e alvo de ON CONFLICT: a chave (numero_processo, data_disponibilizacao) ou, sem número de processo,
+        o hash do conteúdo. Publicações já existentes são ignoradas ou, com `atualizar`, têm os dados
+        extraídos atualizados (o status não muda).
+        Retorna {'ids': [...], 'inseridas': n, 'atualizadas': n, 'ignoradas': n}, ou None em caso de erro.
+        """
+        if atualizar:
+            conflito = f"""DO UPDATE SET {', '.join(f'{coluna} = EXCLUDED.{coluna}' for coluna in COLUNAS_ATUALIZACAO)},
+                data_atualizacao = NOW()"""
+        else:
+            conflito = "DO NOTHING"
+        
+        # xmax = 0 identifica as linhas inseridas (e não atualizadas) pelo comando; um comando por alvo de conflito
+        queries = {
+            alvo: f"""
+            INSERT INTO publicacoes ({COLUNAS_INSERCAO}) VALUES %s
+            ON CONFLICT {alvo} {conflito}
+            RETURNING id, (xmax = 0) AS inserida
+            """
+            for alvo in (CONFLITO_CHAVE, CONFLITO_SEM_PROCESSO)
+        }
+        
+        def _inserir_lote():
+            try:
+                resultado = {'ids': [], 'inseridas': 0, 'atualizadas': 0, 'ignoradas': 0}
+                
+                for inicio in range(0, len(publicacoes), tamanho_lote):
+                    lote = publicacoes[inicio:inicio + tamanho_lote]
+                    
+                    # Publicações que as chaves pré-carregadas já mostram gravadas nem vão para o banco
+                    if self.chaves_existentes and not atualizar:
+                        novas = [p for p in lote if not self.chaves_existentes.contem_publicacao(p)]
+                        resultado['ignoradas'] += len(lote) - len(novas)
+                        lote = novas
+                        if not lote:
+                            continue
+                    
+                    # O texto das páginas e as publicações do lote que o referenciam são gravados na mesma transação
+                    with self._transacao() as cursor:
+                        valores = self._preparar_valores_lote(cursor, lote)
+                        
+                        # Um mesmo comando não pode atualizar a mesma linha duas vezes: fica a última ocorrência
+                        if atualizar:
+                            unicos = {}
+                            for v in valores:
+                                if v[0] is None:
+                                    unicos[('hash', v[9])] = v
+                                else:
+                                    unicos[(v[0], v[1]) if v[1] else len(unicos)] = v
+                            resultado['ignoradas'] += len(valores) - len(unicos)
+                            valores = list(unicos.values())
+                        
+                        for alvo, query in queries.items():
+                            valores_alvo = [v for v in valores if alvo_conflito(v) == alvo]
+                            if not valores_alvo:
+                                continue
+                            
+                            linhas = extras.execute_values(
+                                cursor, query, valores_alvo,
+                                template=MARCADORES_INSERCAO,
+                                page_size=tamanho_lote,
+                                fetch=True
+                            )
+                            
+                            for id_publicacao, inserida in linhas:
+                                resultado['ids'].append(id_publicacao)
+                                if inserida:
+                                    resultado['inseridas'] += 1
+                                else:
+                                    resultado['atualizadas'] += 1
+                            resultado['ignoradas'] += len(valores_alvo) - len(linhas)
+                    
+                    if self.chaves_existentes:
+                        for v in valores:
+                            self.chaves_existentes.adicionar(v)
+                
+                logger.info(f"Inserção em lote: {resultado['inseridas']} publicações inseridas, "
+                            f"{resultado['atualizadas']} atualizadas, {resultado['ignoradas']} já existentes")
+                return resultado
+            except Exception as e:
+                logger.error(f"Erro ao inserir publicações em lote: {e}")
+                return None
+        
+        if not publicacoes:
+            return {'ids': [], 'inseridas': 0, 'atualizadas': 0, 'ignoradas': 0}
+        return self.executar_com_retry(_inserir_lote)
+    
     def executar_query(self, query, params=None):
         """Executa uma query genérica"""
         def _executar():
@@ -308,49 +777,64 @@ class Database:
             return 0
     
     def fechar_conexao(self):
-        """Fecha a conexão com o banco de dados"""
-        if self.conn and not self.conn.closed:
-            try:
-                self.conn.close()
-                logger.info("Conexão com o banco de dados fechada.")
-            except Exception as e:
-                logger.error(f"Erro ao fechar conexão: {e}")
+        """Devolve ao pool a conexão emprestada (uma conexão recebida no construtor não é fechada)"""
+        if self.conn and self._emprestada:
+            _pool_conexoes.devolver(self.conn)
+        self.conn = None
+        self._emprestada = False
 
-# Funções de compatibilidade com o código existente
+# Funções de compatibilidade com o código existente (usam a conexão recebida, sem reconectar)
 def conectar_banco():
-    """Função de compatibilidade - estabelece conexão com o banco de dados"""
+    """Função de compatibilidade - empresta uma conexão do pool (devolva com devolver_conexao)"""
     db = Database()
     return db.conn
 
 def criar_tabela_publicacoes(conn):
     """Função de compatibilidade - cria a tabela de publicações"""
-    db = Database()
-    return db.criar_tabela_publicacoes()
+    db = Database(conn)
+    try:
+        return db.criar_tabela_publicacoes()
+    finally:
+        # Só devolve ao pool a conexão que o retry tenha precisado emprestar
+        db.fechar_conexao()
 
 def verificar_publicacao_existente(conn, numero_processo, data_disponibilizacao, conteudo_completo=None):
     """Função de compatibilidade - verifica se uma publicação já existe"""
-    db = Database()
-    db.conn = conn
-    return db.verificar_publicacao_existente(numero_processo, data_disponibilizacao)
+    db = Database(conn)
+    try:
+        return db.verificar_publicacao_existente(numero_processo, data_disponibilizacao,
+                                                 calcular_hash_conteudo(conteudo_completo))
+    finally:
+        # Só devolve ao pool a conexão que o retry tenha precisado emprestar
+        db.fechar_conexao()
 
 def salvar_publicacao(conn, publicacao):
     """Função de compatibilidade - salva uma nova publicação"""
-    db = Database()
-    db.conn = conn
-    return db.inserir_publicacao(publicacao)
+    db = Database(conn)
+    try:
+        return db.inserir_publicacao(publicacao)
+    finally:
+        # Só devolve ao pool a conexão que o retry tenha precisado emprestar
+        db.fechar_conexao()
+
+def salvar_publicacoes(conn, publicacoes):
+    """Função de compatibilidade - salva várias publicações em lote"""
+    db = Database(conn)
+    try:
+        return db.inserir_publicacoes(publicacoes)
+    finally:
+        # Só devolve ao pool a conexão que o retry tenha precisado emprestar
+        db.fechar_conexao()
 
 def verificar_banco_vazio(conn):
     """Verifica se o banco de dados está vazio (sem publicações)"""
     try:
-        # Primeiro, tenta criar a tabela se ela não existir
-        criar_tabela_publicacoes(conn)
-        
-        db = Database()
-        db.conn = conn
-        resultados = db.consultar_query("SELECT COUNT(*) FROM publicacoes")
+        db = Database(conn)
+        resultados = db.consultar_query("SELECT EXISTS (SELECT 1 FROM publicacoes)")
+        db.fechar_conexao()
         if resultados and len(resultados) > 0:
-            return resultados[0][0] == 0
+            return not resultados[0][0]
         return True
     except Exception as e:
         logger.error(f"Erro ao verificar se o banco está vazio: {e}")
-        return True 
\ No newline at end of file
+        return True
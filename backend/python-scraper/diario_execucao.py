@@ -0,0 +1,215 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+from config import ARQUIVO_DIARIO_EXECUCAO, DIARIO_EXECUCAO_RETENCAO_DIAS
+
+logger = logging.getLogger("DJE_Scraper")
+
+# Etapas de cada publicação encontrada na pesquisa, na ordem em que são cumpridas
+ETAPA_DESCOBERTA = 'descoberta'    # link encontrado nos resultados da pesquisa
+ETAPA_BAIXADA = 'baixada'          # PDF baixado e texto extraído (o texto fica no diário)
+ETAPA_EXTRAIDA = 'extraida'        # processos e campos extraídos (os dados e o texto ficam no diário)
+ETAPA_PERSISTIDA = 'persistida'    # processos salvos no banco
+
+class DiarioExecucao:
+    """
+    Diário persistente das execuções do scraper (SQLite), para retomar uma execução interrompida.
+    Cada execução é identificada pelo período pesquisado e guarda as URLs encontradas na pesquisa
+    com a etapa em que cada uma está. Se o processo morrer no meio, a próxima execução do mesmo
+    período pula a pesquisa e continua cada URL da etapa em que ela parou.
+    """
+
+    def __init__(self, caminho=ARQUIVO_DIARIO_EXECUCAO, retencao_dias=DIARIO_EXECUCAO_RETENCAO_DIAS):
+        """Abre (ou cria) o diário e remove as execuções concluídas há mais de `retencao_dias` dias"""
+        diretorio = os.path.dirname(caminho)
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+
+        self._lock = threading.Lock()
+
+        # Os trabalhadores da carga histórica abrem o mesmo arquivo, cada um com a sua conexão
+        self.conn = sqlite3.connect(caminho, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+        CREATE TABLE IF NOT EXISTS execucoes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            data_inicial TEXT NOT NULL,
+            data_final TEXT NOT NULL,
+            descoberta_concluida INTEGER NOT NULL DEFAULT 0,
+            iniciada_em REAL NOT NULL,
+            concluida_em REAL
+        );
+        CREATE INDEX IF NOT EXISTS idx_execucoes_periodo ON execucoes (data_inicial, data_final, concluida_em);
+        CREATE TABLE IF NOT EXISTS publicacoes (
+            execucao_id INTEGER NOT NULL,
+            url TEXT NOT NULL,
+            ordem INTEGER NOT NULL,
+            snippet TEXT,
+            data_disponibilizacao TEXT,
+            etapa TEXT NOT NULL,
+            texto BLOB,
+            dados TEXT,
+            atualizada_em REAL NOT NULL,
+            PRIMARY KEY (execucao_id, url)
+        ) WITHOUT ROWID;
+        """)
+        # Diários criados antes da data de cada publicação ganham a coluna (vazia nas URLs já registradas)
+        colunas = {linha[1] for linha in self.conn.execute("PRAGMA table_info(publicacoes)")}
+        if 'data_disponibilizacao' not in colunas:
+            self.conn.execute("ALTER TABLE publicacoes ADD COLUMN data_disponibilizacao TEXT")
+        self.conn.commit()
+
+        self._remover_antigas(retencao_dias)
+
+    def _remover_antigas(self, retencao_dias):
+        """Remove as execuções concluídas há mais de `retencao_dias` dias"""
+        limite = time.time() - retencao_dias * 86400
+        with self._lock:
+            antigas = [linha[0] for linha in self.conn.execute(
+                "SELECT id FROM execucoes WHERE concluida_em IS NOT NULL AND concluida_em < ?", (limite,)
+            )]
+            if antigas:
+                self.conn.executemany("DELETE FROM publicacoes WHERE execucao_id = ?", [(i,) for i in antigas])
+                self.conn.executemany("DELETE FROM execucoes WHERE id = ?", [(i,) for i in antigas])
+                self.conn.commit()
+
+    def retomar_execucao(self, data_inicial, data_final):
+        """
+        Retorna (id, descoberta_concluida) da última execução não concluída do período,
+        ou None se não houver execução interrompida
+        """
+        with self._lock:
+            linha = self.conn.execute(
+                "SELECT id, descoberta_concluida FROM execucoes "
+                "WHERE data_inicial = ? AND data_final = ? AND concluida_em IS NULL ORDER BY id DESC LIMIT 1",
+                (data_inicial.isoformat(), data_final.isoformat())
+            ).fetchone()
+
+        if not linha:
+            return None
+        return linha[0], bool(linha[1])
+
+    def iniciar_execucao(self, data_inicial, data_final):
+        """Registra uma nova execução do período e retorna o seu id"""
+        with self._lock:
+            cursor = self.conn.execute(
+                "INSERT INTO execucoes (data_inicial, data_final, iniciada_em) VALUES (?, ?, ?)",
+                (data_inicial.isoformat(), data_final.isoformat(), time.time())
+            )
+            self.conn.commit()
+            return cursor.lastrowid
+
+    def registrar_descoberta(self, execucao_id, resultados_publicacoes):
+        """Guarda as URLs encontradas na pesquisa (as já registradas são ignoradas), depois das anteriores"""
+        agora = time.time()
+        with self._lock:
+            proxima_ordem = self.conn.execute(
+                "SELECT COALESCE(MAX(ordem) + 1, 0) FROM publicacoes WHERE execucao_id = ?", (execucao_id,)
+            ).fetchone()[0]
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO publicacoes "
+                "(execucao_id, url, ordem, snippet, data_disponibilizacao, etapa, atualizada_em) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (execucao_id, resultado['url'], proxima_ordem + indice, resultado.get('snippet', ''),
+                     resultado.get('data_disponibilizacao'), ETAPA_DESCOBERTA, agora)
+                    for indice, resultado in enumerate(resultados_publicacoes)
+                ]
+            )
+            self.conn.commit()
+
+    def concluir_descoberta(self, execucao_id):
+        """Marca que todas as URLs da pesquisa da execução já foram registradas"""
+        with self._lock:
+            self.conn.execute("UPDATE execucoes SET descoberta_concluida = 1 WHERE id = ?", (execucao_id,))
+            self.conn.commit()
+
+    def persistidas(self, execucao_id):
+        """Retorna o conjunto das URLs da execução já salvas no banco"""
+        with self._lock:
+            return {linha[0] for linha in self.conn.execute(
+                "SELECT url FROM publicacoes WHERE execucao_id = ? AND etapa = ?", (execucao_id, ETAPA_PERSISTIDA)
+            )}
+
+    def pendentes(self, execucao_id):
+        """
+        Retorna as publicações da execução que ainda não foram salvas no banco, na ordem da pesquisa,
+        como dicionários com 'url', 'snippet', 'data_disponibilizacao', 'etapa', 'texto_pdf' e 'processos'
+        """
+        with self._lock:
+            linhas = self.conn.execute(
+                "SELECT url, snippet, data_disponibilizacao, etapa, texto, dados FROM publicacoes "
+                "WHERE execucao_id = ? AND etapa != ? ORDER BY ordem",
+                (execucao_id, ETAPA_PERSISTIDA)
+            ).fetchall()
+
+        return [
+            {
+                'url': url,
+                'snippet': snippet or '',
+                'data_disponibilizacao': data_disponibilizacao,
+                'etapa': etapa,
+                'texto_pdf': zlib.decompress(texto).decode('utf-8') if texto else None,
+                'processos': json.loads(dados) if dados else None
+            }
+            for url, snippet, data_disponibilizacao, etapa, texto, dados in linhas
+        ]
+
+    def marcar_baixadas(self, execucao_id, textos):
+        """Marca como baixadas as publicações com texto obtido ({url: texto}), guardando o texto"""
+        agora = time.time()
+        parametros = [
+            (ETAPA_BAIXADA, zlib.compress(texto.encode('utf-8'), 6), agora, execucao_id, url, ETAPA_DESCOBERTA)
+            for url, texto in textos.items() if texto
+        ]
+        if not parametros:
+            return
+
+        with self._lock:
+            self.conn.executemany(
+                "UPDATE publicacoes SET etapa = ?, texto = ?, atualizada_em = ? "
+                "WHERE execucao_id = ? AND url = ? AND etapa = ?",
+                parametros
+            )
+            self.conn.commit()
+
+    def marcar_extraida(self, execucao_id, url, processos):
+        """
+        Marca a publicação como extraída, guardando os dados dos processos encontrados nela.
+        O texto da página fica até a gravação, que guarda no banco a referência do trecho de cada processo.
+        """
+        with self._lock:
+            self.conn.execute(
+                "UPDATE publicacoes SET etapa = ?, dados = ?, atualizada_em = ? WHERE execucao_id = ? AND url = ?",
+                (ETAPA_EXTRAIDA, json.dumps(processos, default=str), time.time(), execucao_id, url)
+            )
+            self.conn.commit()
+
+    def marcar_persistida(self, execucao_id, url):
+        """Marca a publicação como salva no banco e descarta os dados guardados para ela"""
+        with self._lock:
+            self.conn.execute(
+                "UPDATE publicacoes SET etapa = ?, texto = NULL, dados = NULL, atualizada_em = ? WHERE execucao_id = ? AND url = ?",
+                (ETAPA_PERSISTIDA, time.time(), execucao_id, url)
+            )
+            self.conn.commit()
+
+    def concluir_execucao(self, execucao_id):
+        """Marca a execução como concluída (não será mais retomada)"""
+        with self._lock:
+            self.conn.execute("UPDATE execucoes SET concluida_em = ? WHERE id = ?", (time.time(), execucao_id))
+            self.conn.commit()
+
+    def fechar(self):
+        """Fecha o banco do diário"""
+        with self._lock:
+            try:
+                self.conn.close()
+            except Exception as e:
+                logger.warning(f"Erro ao fechar o diário de execução: {e}")
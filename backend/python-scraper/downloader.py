@@ -0,0 +1,143 @@
+import asyncio
+import logging
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from config import DOWNLOAD_CONCORRENCIA
+from pagina_dje import ChavePagina
+from sessao_http import SessaoDJE, FALHA_TRANSITORIA
+
+logger = logging.getLogger("DJE_Scraper")
+
+# Falha da função de processamento (os motivos de falha do download são os FALHA_* de sessao_http)
+FALHA_PROCESSAMENTO = 'processamento'
+
+# Resultado de uma URL: o retorno do processamento (ou os bytes) e, se ele for None, o motivo da falha
+ResultadoDownload = namedtuple('ResultadoDownload', ['url', 'resultado', 'falha'])
+
+class BaixadorPDF:
+    """
+    Estágio de download assíncrono dos PDFs das páginas do diário.
+    Baixa várias URLs em paralelo, limitando o número de requisições simultâneas,
+    e entrega os bytes de cada PDF para a função de processamento assim que chegam.
+    """
+
+    def __init__(self, sessao=None, concorrencia=DOWNLOAD_CONCORRENCIA, cache=None):
+        """
+        Inicializa o baixador com a sessão HTTP compartilhada e o limite de concorrência.
+        Se um cache de páginas for informado, ele é consultado antes de cada download.
+        """
+        self.sessao = sessao or SessaoDJE()
+        self.concorrencia = max(1, int(concorrencia))
+        self.cache = cache
+
+    def baixar(self, url_pdf):
+        """Obtém um único PDF de forma síncrona (cache primeiro) e retorna seus bytes (ou None)"""
+        return self.baixar_com_motivo(url_pdf)[0]
+
+    def baixar_com_motivo(self, url_pdf):
+        """Obtém um único PDF (cache primeiro) e retorna (bytes, None) ou (None, motivo da falha)"""
+        chave = ChavePagina.de_url(url_pdf) if self.cache else None
+
+        if chave:
+            conteudo = self.cache.obter(chave)
+            if conteudo:
+                logger.info(f"PDF da página {tuple(chave)} obtido do cache")
+                return conteudo, None
+
+        conteudo, falha = self.sessao.obter_pdf_com_motivo(url_pdf)
+
+        if chave and conteudo:
+            try:
+                self.cache.armazenar(chave, conteudo)
+            except Exception as e:
+                logger.warning(f"Erro ao armazenar PDF no cache de páginas: {e}")
+
+        return conteudo, falha
+
+    async def _baixar_e_processar(self, url_pdf, semaforo, executor_download, executor_processamento, processar):
+        """Baixa uma URL respeitando o semáforo e, se houver, processa os bytes obtidos"""
+        loop = asyncio.get_running_loop()
+
+        async with semaforo:
+            try:
+                conteudo, falha = await loop.run_in_executor(executor_download, self.baixar_com_motivo, url_pdf)
+            except Exception as e:
+                logger.error(f"Erro ao baixar PDF {url_pdf}: {e}")
+                return ResultadoDownload(url_pdf, None, FALHA_TRANSITORIA)
+
+        # O processamento acontece fora do semáforo para não segurar vagas de download
+        if conteudo is None or processar is None:
+            return ResultadoDownload(url_pdf, conteudo, falha)
+
+        try:
+            resultado = await loop.run_in_executor(executor_processamento or executor_download, processar, conteudo)
+            return ResultadoDownload(url_pdf, resultado, None if resultado is not None else FALHA_PROCESSAMENTO)
+        except Exception as e:
+            logger.error(f"Erro ao processar PDF {url_pdf}: {e}")
+            return ResultadoDownload(url_pdf, None, FALHA_PROCESSAMENTO)
+
+    async def iterar_async(self, urls, processar=None, executor_processamento=None):
+        """
+        Baixa todas as URLs em paralelo e gera um ResultadoDownload por URL, na ordem em que cada uma termina.
+        Se `processar` for informado, o resultado é o retorno de processar(bytes_do_pdf);
+        caso contrário, são os próprios bytes. Falhas resultam em None, com o motivo em `falha`.
+        """
+        urls_unicas = list(dict.fromkeys(urls))
+        if not urls_unicas:
+            return
+
+        logger.info(f"Baixando {len(urls_unicas)} PDFs com até {self.concorrencia} downloads simultâneos")
+
+        sucessos = 0
+        semaforo = asyncio.Semaphore(self.concorrencia)
+        with ThreadPoolExecutor(max_workers=self.concorrencia, thread_name_prefix="download_pdf") as executor_download:
+            tarefas = [
+                asyncio.ensure_future(self._baixar_e_processar(
+                    url_pdf, semaforo, executor_download, executor_processamento, processar
+                ))
+                for url_pdf in urls_unicas
+            ]
+
+            try:
+                for tarefa in asyncio.as_completed(tarefas):
+                    resultado = await tarefa
+                    sucessos += resultado.resultado is not None
+                    yield resultado
+            finally:
+                # Consumidor parou antes do fim: os downloads que ainda não começaram são cancelados
+                for tarefa in tarefas:
+                    tarefa.cancel()
+
+        logger.info(f"Download paralelo concluído: {sucessos} de {len(urls_unicas)} PDFs obtidos")
+
+    async def baixar_todos_async(self, urls, processar=None, executor_processamento=None):
+        """Baixa todas as URLs em paralelo e retorna um dicionário {url: resultado} (veja iterar_async)"""
+        return {
+            resultado.url: resultado.resultado
+            async for resultado in self.iterar_async(urls, processar, executor_processamento)
+        }
+
+    def iterar(self, urls, processar=None, executor_processamento=None):
+        """
+        Versão síncrona de iterar_async: gera o ResultadoDownload de cada PDF assim que ele fica pronto,
+        para que o chamador trate os primeiros resultados enquanto os demais ainda são baixados.
+        """
+        loop = asyncio.new_event_loop()
+        resultados = self.iterar_async(urls, processar, executor_processamento)
+        try:
+            while True:
+                try:
+                    yield loop.run_until_complete(resultados.__anext__())
+                except StopAsyncIteration:
+                    break
+        finally:
+            loop.run_until_complete(resultados.aclose())
+            pendentes = asyncio.all_tasks(loop)
+            if pendentes:
+                loop.run_until_complete(asyncio.gather(*pendentes, return_exceptions=True))
+            loop.close()
+
+    def baixar_todos(self, urls, processar=None, executor_processamento=None):
+        """Versão síncrona de baixar_todos_async, para uso a partir do código não assíncrono"""
+        return {resultado.url: resultado.resultado for resultado in self.iterar(urls, processar, executor_processamento)}
@@ -0,0 +1,116 @@
+import logging
+import threading
+import time
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from config import ESPERA_TIMEOUT, ESPERA_INTERVALO
+from busca_http import MENSAGEM_SEM_RESULTADOS
+
+logger = logging.getLogger("DJE_Scraper")
+
+class EstatisticasEsperas:
+    """Acumula, por tipo de espera, quantas vezes ela ocorreu, o tempo total esperado e quantas esgotaram o prazo"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._dados = {}
+
+    def registrar(self, descricao, segundos, esgotada):
+        """Soma uma espera aos totais da sua descrição"""
+        with self._lock:
+            dados = self._dados.setdefault(descricao, {'esperas': 0, 'esgotadas': 0, 'segundos': 0.0})
+            dados['esperas'] += 1
+            dados['esgotadas'] += 1 if esgotada else 0
+            dados['segundos'] += segundos
+
+    def resumo(self):
+        """Retorna os totais e a média de cada tipo de espera"""
+        with self._lock:
+            return {
+                descricao: dict(dados, media_segundos=dados['segundos'] / dados['esperas'])
+                for descricao, dados in self._dados.items()
+            }
+
+    def registrar_log(self):
+        """Escreve no log o resumo das esperas do navegador"""
+        for descricao, dados in self.resumo().items():
+            logger.info(f"Espera '{descricao}': {dados['esperas']} vezes, {dados['esgotadas']} esgotadas, "
+                        f"total de {dados['segundos']:.2f}s (média de {dados['media_segundos']:.2f}s)")
+
+# Estatísticas do processo principal
+estatisticas_esperas = EstatisticasEsperas()
+
+def _registrar_espera(descricao, inicio, timeout, esgotada):
+    """Registra nas estatísticas e no log quanto tempo uma espera levou"""
+    segundos = time.monotonic() - inicio
+    estatisticas_esperas.registrar(descricao, segundos, esgotada)
+    if esgotada:
+        logger.warning(f"Espera '{descricao}' esgotou o prazo de {timeout}s")
+    else:
+        logger.info(f"Espera '{descricao}' concluída em {segundos:.2f}s")
+
+def esperar(driver, condicao, descricao, timeout=ESPERA_TIMEOUT):
+    """
+    Espera a condição do Selenium (função que recebe o driver) ficar verdadeira, por até `timeout` segundos.
+    Retorna o valor da condição, ou None se o prazo esgotar; o tempo esperado vai para o log e as estatísticas.
+    """
+    inicio = time.monotonic()
+    try:
+        resultado = WebDriverWait(driver, timeout, poll_frequency=ESPERA_INTERVALO).until(condicao)
+    except TimeoutException:
+        _registrar_espera(descricao, inicio, timeout, True)
+        return None
+
+    _registrar_espera(descricao, inicio, timeout, False)
+    return resultado
+
+def documento_pronto(driver):
+    """Condição: o documento do contexto atual (página ou frame) terminou de carregar"""
+    return driver.execute_script("return document.readyState") == "complete"
+
+def resultados_da_pesquisa(driver):
+    """Condição: a página de resultados da pesquisa carregou (com a lista de resultados ou a mensagem sem resultados)"""
+    if driver.find_elements(By.ID, "divResultadosInferior"):
+        return True
+    return bool(driver.find_elements(By.XPATH, f"//*[contains(text(), '{MENSAGEM_SEM_RESULTADOS}')]"))
+
+def texto_selecionado(driver):
+    """Condição: há texto selecionado na página (retorna o texto)"""
+    return driver.execute_script("return window.getSelection().toString();") or False
+
+def documento_atual(driver):
+    """Elemento raiz do documento atual, para esperar a sua substituição depois de uma navegação"""
+    return driver.find_element(By.TAG_NAME, "html")
+
+def esperar_carregamento(driver, descricao, timeout=ESPERA_TIMEOUT):
+    """Espera o documento do contexto atual terminar de carregar. Retorna True se carregou no prazo"""
+    return esperar(driver, documento_pronto, descricao, timeout) is not None
+
+def esperar_troca_de_pagina(driver, documento_anterior, descricao, timeout=ESPERA_TIMEOUT):
+    """
+    Espera o documento anterior (obtido com documento_atual antes da ação) ser substituído
+    e o novo terminar de carregar. Retorna True se a página trocou no prazo.
+    """
+    if esperar(driver, EC.staleness_of(documento_anterior), descricao, timeout) is None:
+        return False
+    return esperar_carregamento(driver, f"{descricao} (carregamento)", timeout)
+
+def executar_script_assincrono(driver, script, descricao, *argumentos, timeout=ESPERA_TIMEOUT):
+    """
+    Executa um script assíncrono (que entrega o resultado chamando o último argumento) e espera a resposta
+    por até `timeout` segundos. Retorna o resultado, ou None se o prazo esgotar.
+    """
+    driver.set_script_timeout(timeout)
+    inicio = time.monotonic()
+    try:
+        resultado = driver.execute_async_script(script, *argumentos)
+    except TimeoutException:
+        _registrar_espera(descricao, inicio, timeout, True)
+        return None
+
+    _registrar_espera(descricao, inicio, timeout, False)
+    return resultado
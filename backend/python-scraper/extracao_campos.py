@@ -0,0 +1,381 @@
+import datetime
+import logging
+import re
+from decimal import Decimal
+
+logger = logging.getLogger("DJE_Scraper")
+
+# Normalização: quebras de linha e sequências de espaços viram um único espaço
+_ESPACOS = re.compile(r'\s+')
+
+# Âncoras localizadas em uma única varredura do texto normalizado (em minúsculas).
+# As regras de cada campo só são avaliadas a partir dessas posições.
+_TERMOS_ANCORAS = r'processo|autos|número|numeração|vistos|adv:|homologo os cálculos|r\$|juros'
+_ANCORAS = re.compile(_TERMOS_ANCORAS)
+_ANCORAS_IGNORECASE = re.compile(_TERMOS_ANCORAS, re.IGNORECASE)
+
+# NÚMERO DO PROCESSO, na mesma ordem de prioridade da extração original.
+# O formato CNJ é buscado no texto inteiro; os demais padrões começam numa âncora.
+_NUMERO_CNJ = re.compile(r'\b(\d{7}-\d{2}\.\d{4}\.\d\.\d{2}\.\d{4})\b')
+_PADROES_NUMERO_ANCORADOS = [
+    ('Processo', re.compile(r'Processo\s+(\d+[-./]\d+[^-\s]*)')),
+    ('processo', re.compile(r'[Pp]rocesso\s+[Nn][º°]?\s*:\s*(\d{7}-\d{2}\.\d{4}\.\d\.\d{2}\.\d{4})')),
+    ('processo', re.compile(r'[Pp]rocesso\s+[Nn][º°]?\s*[.:]\s*(\d{20})')),
+    ('processo', re.compile(r'[Pp]rocesso\s+(\d{20})')),
+    ('processo', re.compile(r'[Pp]rocesso\s+[Nn][º°]?\s*[.:]\s*(\d+[-./]\d+[-./]\d+)')),
+    ('processo', re.compile(r'[Pp]rocesso\s+[Nn][º°]?\s*[.:]\s*(\d+[-./]\d+)')),
+    ('processo', re.compile(r'[Pp]rocesso\s+[Nn][º°]?\s*[.:]\s*(\d+)')),
+    ('autos', re.compile(r'(?:Autos|Número|Numeração)[^:]*:\s*(\d+[-./]?\d*[-./]?\d*[-./]?\d*[-./]?\d*)')),
+    ('Processo', re.compile(r'Processo\s+[^\n]*?(\d{7}-\d{2}\.\d{4}\.\d\.\d{2}\.\d{4})')),
+]
+
+# AUTOR: nome que antecede "- Vistos."
+_AUTOR_VISTOS = re.compile(r'(?:Permanent[e]|Espécie|Acidente|Fazenda Pública|Art\. 86|\))?\s*-\s*([^-]+?)\s+-\s+Vistos')
+_AUTOR_TIPO_PROCESSO = re.compile(r'Processo\s+\d+[-./\d\s()]+(?: - [^-]+){1,3} - ([^-]+) -')
+_AUTOR_ENTRE_TIPO_E_VISTOS = [
+    re.compile(r'(?:Auxílio-Acidente|Benefícios em Espécie|Procedimento Comum)\s*\([^)]*\)\s*-\s*([^-]+?)\s*-\s*Vistos', re.IGNORECASE),
+    re.compile(r'(?:Auxílio-Acidente|Benefícios em Espécie|Incapacidade Laborativa)\s*(?:Permanent[e])?(?:\([^)]*\))?\s*-\s*([^-]+?)\s*-\s*Vistos', re.IGNORECASE),
+    re.compile(r'\([^)]*Art\.\s*86[^)]*\)\s*-\s*([^-]+?)\s*-\s*Vistos', re.IGNORECASE),
+]
+_AUTOR_INSS = re.compile(r'^(INSS|Instituto Nacional)', re.IGNORECASE)
+_AUTOR_INVALIDO = re.compile(r'outorgando poderes|advogado|advocacia|requisição|crédito|despacho|decisão', re.IGNORECASE)
+
+# ADVOGADOS: "ADV: NOME (OAB NÚMERO/UF)", possivelmente vários separados por vírgula ou " E "
+_ADVOGADO = re.compile(r'ADV:\s+([^(]+)\s*(\(OAB [^)]+\))', re.IGNORECASE)
+_SEPARADOR_ADVOGADOS = re.compile(r',\s*|\s+[eE]\s+')
+
+# VALORES MONETÁRIOS
+_SECAO_VALORES = re.compile(r'homologo os cálculos[^.]*correspondem ao[^R$]*(.+?)(?=\.\s*Os valores)', re.IGNORECASE | re.DOTALL)
+_VALOR_PRINCIPAL = re.compile(r'R\$\s*([0-9.,]+)[^;,]*(?:principal\s*bruto(?:/líquido)?|bruto/líquido)', re.IGNORECASE)
+_VALOR_JUROS = re.compile(r'R\$\s*([0-9.,]+)[^;,]*(?:juros\s*morat[óo]rios)', re.IGNORECASE)
+_VALOR_HONORARIOS = re.compile(r'R\$\s*([0-9.,]+)[^;,]*(?:honor[áa]rios\s*advocat[íi]cios)', re.IGNORECASE)
+_SEM_JUROS = re.compile(r'sem\s*-\s*juros\s*morat[óo]rios', re.IGNORECASE)
+_CARACTERES_NAO_NUMERICOS = re.compile(r'[^\d,.]')
+
+def normalizar_texto(texto):
+    """
+    Troca quebras de linha e sequências de espaços por um único espaço
+    (mesmo resultado de re.sub(r'\\s+', ' ', texto), porém bem mais rápido).
+    """
+    normalizado = ' '.join(texto.split())
+    if not normalizado:
+        return ' ' if texto else ''
+    if texto[0].isspace():
+        normalizado = ' ' + normalizado
+    if texto[-1].isspace():
+        normalizado += ' '
+    return normalizado
+
+def localizar_ancoras(texto):
+    """
+    Percorre o texto uma única vez e devolve as posições de cada âncora,
+    agrupadas pelo termo em minúsculas (ex.: 'processo', 'adv:', 'r$').
+    """
+    minusculo = texto.lower()
+    if len(minusculo) == len(texto):
+        matches = _ANCORAS.finditer(minusculo)
+    else:
+        # Alguns caracteres mudam de tamanho em minúsculas; as posições não seriam as mesmas
+        matches = _ANCORAS_IGNORECASE.finditer(texto)
+
+    ancoras = {}
+    for match in matches:
+        ancoras.setdefault(match.group().lower(), []).append(match.start())
+    return ancoras
+
+def limpar_valor_monetario(valor_str):
+    """
+    Limpa e formata valores monetários.
+    Remove R$, espaços e formata corretamente para conversão para float.
+    """
+    if not valor_str:
+        return None
+
+    # Remove caracteres não numéricos, exceto pontos e vírgulas
+    valor_str = _CARACTERES_NAO_NUMERICOS.sub('', valor_str)
+
+    # Tratamento para diferentes formatos de números (1.234,56 ou 1234,56 ou 1,234.56)
+    try:
+        # Formato brasileiro (1.234,56)
+        if ',' in valor_str and '.' in valor_str and valor_str.rindex('.') < valor_str.rindex(','):
+            valor_str = valor_str.replace('.', '').replace(',', '.')
+        # Formato com vírgula como decimal (1234,56)
+        elif ',' in valor_str and '.' not in valor_str:
+            valor_str = valor_str.replace(',', '.')
+
+        return valor_str
+    except Exception as e:
+        logger.warning(f"Erro ao limpar valor monetário '{valor_str}': {e}")
+        return None
+
+def _posicoes(texto, ancoras, termo, *formas):
+    """Posições da âncora `termo`, opcionalmente só as escritas exatamente em uma das `formas`"""
+    posicoes = ancoras.get(termo, [])
+    if not formas:
+        return posicoes
+    return [posicao for posicao in posicoes if texto.startswith(formas, posicao)]
+
+def _primeiro_match(padrao, texto, posicoes):
+    """Primeiro match do padrão começando em uma das posições (equivale a search, pois o padrão começa na âncora)"""
+    for posicao in posicoes:
+        match = padrao.match(texto, posicao)
+        if match:
+            return match
+    return None
+
+def _extrair_numero(texto, ancoras):
+    """Número do processo, testando os padrões na ordem de prioridade"""
+    match = _NUMERO_CNJ.search(texto)
+
+    if not match:
+        posicoes_por_ancora = {
+            'Processo': _posicoes(texto, ancoras, 'processo', 'Processo'),
+            'processo': _posicoes(texto, ancoras, 'processo', 'Processo', 'processo'),
+            'autos': sorted(
+                _posicoes(texto, ancoras, 'autos', 'Autos')
+                + _posicoes(texto, ancoras, 'número', 'Número')
+                + _posicoes(texto, ancoras, 'numeração', 'Numeração')
+            ),
+        }
+        for ancora, padrao in _PADROES_NUMERO_ANCORADOS:
+            match = _primeiro_match(padrao, texto, posicoes_por_ancora[ancora])
+            if match:
+                break
+
+    if not match:
+        return None
+
+    numero_processo = _ESPACOS.sub('', match.group(1).strip())
+    logger.debug(f"Número do processo extraído: {numero_processo}")
+    return numero_processo
+
+def _autor_antes_de_vistos(texto, ancoras):
+    """
+    Equivale a buscar _AUTOR_VISTOS no texto inteiro: para cada "Vistos", só há match se ele
+    vier depois de " - ", e o nome é o trecho desde o hífen anterior (que não pode conter hífens).
+    """
+    for posicao in _posicoes(texto, ancoras, 'vistos', 'Vistos'):
+        hifen_final = texto.rfind('-', 0, posicao)
+        if hifen_final < 0 or texto[hifen_final + 1:posicao].strip() or hifen_final + 1 == posicao:
+            continue
+        hifen_inicial = texto.rfind('-', 0, hifen_final)
+        if hifen_inicial < 0:
+            continue
+        match = _AUTOR_VISTOS.search(texto, hifen_inicial, posicao + len('Vistos'))
+        if match:
+            return match
+    return None
+
+def _extrair_autor(texto, ancoras):
+    """Autor do processo: nome que antecede "- Vistos.", com os padrões alternativos da extração original"""
+    autor = None
+
+    autor_match = _autor_antes_de_vistos(texto, ancoras)
+    if autor_match:
+        autor = autor_match.group(1).strip()
+        logger.debug(f"Autor extraído (antes de '- Vistos'): {autor}")
+    else:
+        autor_match = _primeiro_match(_AUTOR_TIPO_PROCESSO, texto, _posicoes(texto, ancoras, 'processo', 'Processo'))
+        if autor_match:
+            autor = autor_match.group(1).strip()
+            logger.debug(f"Autor extraído (após tipo do processo): {autor}")
+        elif 'vistos' in ancoras:
+            # Os padrões terminam em "Vistos": a busca não precisa ir além da última ocorrência
+            limite = ancoras['vistos'][-1] + len('vistos')
+            for padrao in _AUTOR_ENTRE_TIPO_E_VISTOS:
+                autor_match = padrao.search(texto, 0, limite)
+                if autor_match:
+                    autor_extraido = autor_match.group(1).strip()
+                    if autor_extraido and len(autor_extraido) > 3 and not _AUTOR_INSS.search(autor_extraido):
+                        autor = autor_extraido
+                        logger.debug(f"Autor extraído (entre tipo e Vistos): {autor}")
+                        break
+
+    # Verificação final para garantir que não pegou texto errado
+    if autor and (len(autor) > 50 or len(autor) < 3 or _AUTOR_INVALIDO.search(autor)):
+        autor = None
+        logger.warning("Autor extraído parece inválido, ignorando")
+
+        # Tenta um último método mais simples
+        partes = texto.split(' - ')
+        for i, parte in enumerate(partes):
+            if i > 0 and i < len(partes)-1 and 'Vistos' in partes[i+1]:
+                autor_candidato = parte.strip()
+                if len(autor_candidato) > 3 and len(autor_candidato) < 50:
+                    autor = autor_candidato
+                    logger.debug(f"Autor extraído (método simples): {autor}")
+                    break
+
+    return autor
+
+def _extrair_advogados(texto, ancoras):
+    """Advogados no formato "ADV: NOME (OAB ...)", separados por "; " """
+    advogados_encontrados = []
+    fim_anterior = 0
+
+    # Equivale ao finditer: cada match começa numa âncora "ADV:" que não foi consumida pelo anterior
+    for posicao in ancoras.get('adv:', []):
+        if posicao < fim_anterior:
+            continue
+        match = _ADVOGADO.match(texto, posicao)
+        if not match:
+            continue
+        fim_anterior = match.end()
+
+        advogado_texto = f"{match.group(1).strip()} {match.group(2).strip()}"
+
+        # Vírgulas ou " E " indicam múltiplos advogados
+        if ',' in advogado_texto or ' E ' in advogado_texto.upper():
+            partes = _SEPARADOR_ADVOGADOS.split(advogado_texto)
+        else:
+            partes = [advogado_texto]
+
+        for parte in partes:
+            parte = parte.strip()
+            if parte and len(parte) > 3:
+                parte = _ESPACOS.sub(' ', parte).strip()
+                if parte not in advogados_encontrados:
+                    advogados_encontrados.append(parte)
+                    logger.debug(f"Advogado extraído: {parte}")
+
+    return "; ".join(advogados_encontrados) if advogados_encontrados else None
+
+def converter_valor(valor_bruto):
+    """Converte o valor capturado por um dos padrões monetários para float"""
+    valor_str = limpar_valor_monetario(valor_bruto)
+    return float(valor_str) if valor_str else None
+
+def _extrair_valores(texto, ancoras, converter=converter_valor):
+    """
+    Valor principal, juros moratórios e honorários advocatícios.
+    `converter` recebe o valor capturado (ex.: '1.234,56') e devolve o número.
+    """
+    def _valor(match):
+        return converter(match.group(1).strip())
+
+    # Seção de valores após "homologo os cálculos" até "Os valores"
+    secao_valores = None
+    valores_match = _primeiro_match(_SECAO_VALORES, texto, ancoras.get('homologo os cálculos', []))
+    if valores_match:
+        secao_valores = valores_match.group(1).strip()
+        logger.debug(f"Seção de valores encontrada: {secao_valores}")
+
+    posicoes_reais = ancoras.get('r$', [])
+
+    # Valor principal: primeiro na seção, depois no texto completo
+    valor_principal = None
+    if secao_valores:
+        valor_match = _VALOR_PRINCIPAL.search(secao_valores)
+        if valor_match:
+            valor_principal = _valor(valor_match)
+    if not valor_principal:
+        valor_match = _primeiro_match(_VALOR_PRINCIPAL, texto, posicoes_reais)
+        if valor_match:
+            valor_principal = _valor(valor_match)
+
+    # Juros moratórios, a não ser que o texto diga "sem - juros moratórios"
+    valor_juros_moratorios = None
+    if secao_valores and not _SEM_JUROS.search(secao_valores):
+        valor_match = _VALOR_JUROS.search(secao_valores)
+        if valor_match:
+            valor_juros_moratorios = _valor(valor_match)
+    if valor_juros_moratorios is None:
+        sem_juros = 'juros' in ancoras and _SEM_JUROS.search(texto)
+        if not sem_juros:
+            valor_match = _primeiro_match(_VALOR_JUROS, texto, posicoes_reais)
+            if valor_match:
+                valor_juros_moratorios = _valor(valor_match)
+
+    # Honorários advocatícios: primeiro na seção, depois no texto completo
+    honorarios_advocaticios = None
+    if secao_valores:
+        valor_match = _VALOR_HONORARIOS.search(secao_valores)
+        if valor_match:
+            honorarios_advocaticios = _valor(valor_match)
+    if not honorarios_advocaticios:
+        valor_match = _primeiro_match(_VALOR_HONORARIOS, texto, posicoes_reais)
+        if valor_match:
+            honorarios_advocaticios = _valor(valor_match)
+
+    logger.debug(f"Valores extraídos: principal={valor_principal}, juros={valor_juros_moratorios}, "
+                 f"honorários={honorarios_advocaticios}")
+    return valor_principal, valor_juros_moratorios, honorarios_advocaticios
+
+def extrair_campos_processo(processo_texto):
+    """
+    Extrai os dados de um processo individual: normaliza o texto uma vez, localiza as âncoras
+    (Processo, Vistos, ADV:, homologo os cálculos, R$) em uma única varredura e avalia cada regra
+    apenas a partir dessas posições. Retorna o mesmo dicionário da extração original;
+    erros de conversão de valores propagam para o chamador.
+    """
+    dados_processo = {
+        'conteudo_completo': processo_texto,
+        'data_disponibilizacao': datetime.date.today().strftime("%Y-%m-%d")
+    }
+
+    texto = normalizar_texto(processo_texto)
+    ancoras = localizar_ancoras(texto)
+
+    dados_processo['numero_processo'] = _extrair_numero(texto, ancoras)
+    dados_processo['autor'] = _extrair_autor(texto, ancoras)
+    dados_processo['advogado'] = _extrair_advogados(texto, ancoras)
+
+    valor_principal, valor_juros_moratorios, honorarios_advocaticios = _extrair_valores(texto, ancoras)
+    dados_processo['valor_principal'] = valor_principal
+    dados_processo['valor_juros_moratorios'] = valor_juros_moratorios
+    dados_processo['honorarios_advocaticios'] = honorarios_advocaticios
+
+    return dados_processo
+
+# Colunas devolvidas pela extração em lote, na ordem dos processos recebidos
+CAMPOS_LOTE = [
+    'conteudo_completo', 'numero_processo', 'autor', 'advogado',
+    'valor_principal', 'valor_juros_moratorios', 'honorarios_advocaticios', 'valido'
+]
+
+def _conversor_decimal():
+    """
+    Conversor de valores monetários para Decimal com memória: no lote, cada valor distinto
+    é normalizado uma única vez (os mesmos valores se repetem muito entre processos).
+    """
+    convertidos = {}
+
+    def converter(valor_bruto):
+        if valor_bruto not in convertidos:
+            valor_str = limpar_valor_monetario(valor_bruto)
+            convertidos[valor_bruto] = Decimal(valor_str) if valor_str else None
+        return convertidos[valor_bruto]
+
+    return converter
+
+def extrair_campos_lote(segmentos):
+    """
+    Extrai os campos de vários processos de uma vez e devolve um dicionário de colunas
+    (listas alinhadas com a entrada, ver CAMPOS_LOTE), com os valores monetários em Decimal.
+    Aceita textos ou SegmentoProcesso. Processos cujos valores não puderem ser convertidos
+    ficam com os campos vazios e `valido` False, no lugar de interromper o lote.
+    """
+    colunas = {campo: [] for campo in CAMPOS_LOTE}
+    converter = _conversor_decimal()
+
+    for segmento in segmentos:
+        processo_texto = getattr(segmento, 'texto', segmento)
+        texto = normalizar_texto(processo_texto)
+        ancoras = localizar_ancoras(texto)
+
+        try:
+            linha = (
+                _extrair_numero(texto, ancoras),
+                _extrair_autor(texto, ancoras),
+                _extrair_advogados(texto, ancoras),
+            ) + _extrair_valores(texto, ancoras, converter) + (True,)
+        except (ValueError, ArithmeticError) as e:
+            logger.warning(f"Processo ignorado na extração em lote: {e}")
+            linha = (None,) * 6 + (False,)
+
+        colunas['conteudo_completo'].append(processo_texto)
+        for campo, valor in zip(CAMPOS_LOTE[1:], linha):
+            colunas[campo].append(valor)
+
+    logger.info(f"Extração em lote: {len(colunas['valido'])} processos, {sum(colunas['valido'])} válidos")
+    return colunas
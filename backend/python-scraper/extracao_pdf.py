@@ -0,0 +1,311 @@
+import hashlib
+import io
+import json
+import logging
+import logging.handlers
+import multiprocessing
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import PyPDF2
+
+from cache_texto import CacheTextoExtraido
+from config import EXTRACAO_PROCESSOS, ORDEM_EXTRATORES, PDFMINER_LAPARAMS, ARQUIVO_CACHE_TEXTO
+
+logger = logging.getLogger("DJE_Scraper")
+
+# Registro dos motores de extração disponíveis, indexados pelo nome
+REGISTRO_EXTRATORES = {}
+
+# Medição de uma tentativa de extração: motor, tempo gasto e tamanho do texto obtido
+Medicao = namedtuple('Medicao', ['extrator', 'segundos', 'caracteres', 'aceito'])
+
+# Resultado completo de uma extração (serializável, para voltar do pool de processos)
+ResultadoExtracao = namedtuple('ResultadoExtracao', ['texto', 'extrator', 'medicoes'])
+
+def registrar_extrator(classe):
+    """Decorador que adiciona um motor de extração ao registro"""
+    REGISTRO_EXTRATORES[classe.nome] = classe
+    return classe
+
+class ExtratorTexto:
+    """Interface dos motores de extração de texto de PDF"""
+
+    nome = None
+    versao = "1"
+
+    def extrair(self, conteudo_pdf):
+        """Recebe os bytes do PDF e retorna o texto extraído"""
+        raise NotImplementedError
+
+    @property
+    def identificador(self):
+        """Nome e versão do motor, usados para identificar textos gerados por ele"""
+        return f"{self.nome}:{self.versao}"
+
+@registrar_extrator
+class ExtratorPyPDF2(ExtratorTexto):
+    """Extração rápida com PyPDF2"""
+
+    nome = "pypdf2"
+    versao = PyPDF2.__version__
+
+    def extrair(self, conteudo_pdf):
+        reader = PyPDF2.PdfReader(io.BytesIO(conteudo_pdf))
+        logger.info(f"Extraindo texto de {len(reader.pages)} páginas com PyPDF2")
+
+        textos = []
+        for page in reader.pages:
+            texto_pagina = page.extract_text()
+            if texto_pagina:
+                textos.append(texto_pagina + "\n\n")
+
+        return "".join(textos)
+
+@registrar_extrator
+class ExtratorPdfminer(ExtratorTexto):
+    """Extração com pdfminer.six (mais precisa, porém mais lenta), com LAParams ajustáveis"""
+
+    nome = "pdfminer"
+
+    def __init__(self, laparams=None):
+        """laparams: dicionário com os parâmetros de LAParams (padrão: PDFMINER_LAPARAMS)"""
+        import pdfminer
+
+        self.parametros = dict(PDFMINER_LAPARAMS if laparams is None else laparams)
+        assinatura = hashlib.sha1(json.dumps(self.parametros, sort_keys=True).encode()).hexdigest()[:8]
+        self.versao = f"{pdfminer.__version__}-{assinatura}"
+
+    def extrair(self, conteudo_pdf):
+        from pdfminer.high_level import extract_text
+        from pdfminer.layout import LAParams
+
+        logger.info("Tentando extrair texto com pdfminer.six")
+        return extract_text(io.BytesIO(conteudo_pdf), laparams=LAParams(**self.parametros))
+
+@registrar_extrator
+class ExtratorOCR(ExtratorTexto):
+    """Último recurso: OCR via Tesseract (pytesseract e pdf2image são opcionais)"""
+
+    nome = "ocr"
+
+    def extrair(self, conteudo_pdf):
+        import pytesseract
+        from pdf2image import convert_from_bytes
+
+        logger.info("Tentando extrair texto via OCR (Tesseract)")
+
+        # Converte PDF para imagens diretamente a partir dos bytes
+        images = convert_from_bytes(bytes(conteudo_pdf))
+
+        textos = []
+        for i, image in enumerate(images):
+            logger.info(f"Processando página {i+1} com OCR")
+            textos.append(pytesseract.image_to_string(image, lang='por') + "\n\n")
+
+        return "".join(textos)
+
+# Instâncias reaproveitadas dentro de cada processo
+_instancias_extratores = {}
+
+def obter_extrator(nome):
+    """Retorna a instância do motor registrado com esse nome"""
+    if nome not in _instancias_extratores:
+        if nome not in REGISTRO_EXTRATORES:
+            raise ValueError(f"Extrator de texto desconhecido: {nome}")
+        _instancias_extratores[nome] = REGISTRO_EXTRATORES[nome]()
+    return _instancias_extratores[nome]
+
+# Cache de texto extraído aberto sob demanda em cada processo (None = ainda não aberto, False = indisponível)
+_cache_texto = None
+
+def obter_cache_texto():
+    """Retorna o cache de texto extraído deste processo, ou None se estiver desativado"""
+    global _cache_texto
+    if _cache_texto is None:
+        _cache_texto = False
+        if ARQUIVO_CACHE_TEXTO:
+            try:
+                _cache_texto = CacheTextoExtraido(ARQUIVO_CACHE_TEXTO)
+            except Exception as e:
+                logger.warning(f"Cache de texto extraído indisponível: {e}")
+    return _cache_texto or None
+
+def fechar_cache_texto():
+    """Fecha o cache de texto extraído deste processo, se estiver aberto"""
+    global _cache_texto
+    if _cache_texto:
+        _cache_texto.fechar()
+    _cache_texto = None
+
+def assinatura_cadeia(ordem, minimo_caracteres):
+    """
+    Identifica a cadeia de motores (nome e versão de cada um, na ordem) e o mínimo de caracteres,
+    já que um texto extraído só é reaproveitável se a mesma cadeia fosse produzi-lo de novo.
+    """
+    identificadores = ",".join(obter_extrator(nome).identificador for nome in ordem)
+    return f"{identificadores};min={minimo_caracteres}"
+
+def extrair_com_medicoes(conteudo_pdf, minimo_caracteres=50, ordem=None, usar_cache=True):
+    """
+    Extrai o texto de um PDF em memória tentando os motores na ordem configurada
+    (padrão: ORDEM_EXTRATORES) e para no primeiro que produzir mais de `minimo_caracteres`.
+    Antes de extrair consulta o cache de texto pelo SHA-256 do PDF e pela assinatura da cadeia.
+    Retorna um ResultadoExtracao com o texto (ou None), o motor aceito e as medições de cada tentativa.
+    """
+    medicoes = []
+
+    if not conteudo_pdf:
+        return ResultadoExtracao(None, None, medicoes)
+
+    ordem = ordem or ORDEM_EXTRATORES
+    cache = obter_cache_texto() if usar_cache else None
+    sha256_pdf = assinatura = None
+
+    if cache:
+        inicio = time.perf_counter()
+        try:
+            sha256_pdf = hashlib.sha256(conteudo_pdf).hexdigest()
+            assinatura = assinatura_cadeia(ordem, minimo_caracteres)
+            encontrado = cache.obter(sha256_pdf, assinatura)
+        except Exception as e:
+            logger.warning(f"Erro ao consultar o cache de texto extraído: {e}")
+            cache = encontrado = None
+
+        if encontrado:
+            texto, nome = encontrado
+            segundos = time.perf_counter() - inicio
+            medicoes.append(Medicao('cache', segundos, len(texto), True))
+            logger.info(f"Texto de {nome} reaproveitado do cache: {len(texto)} caracteres em {segundos:.3f}s")
+            return ResultadoExtracao(texto, nome, medicoes)
+
+    for nome in ordem:
+        inicio = time.perf_counter()
+        texto = None
+        try:
+            texto = obter_extrator(nome).extrair(conteudo_pdf)
+        except ImportError:
+            logger.warning(f"Extrator '{nome}' indisponível (bibliotecas não instaladas)")
+        except Exception as e:
+            logger.warning(f"Erro ao extrair texto com '{nome}': {e}")
+
+        segundos = time.perf_counter() - inicio
+        aceito = bool(texto) and len(texto) > minimo_caracteres
+        medicoes.append(Medicao(nome, segundos, len(texto) if texto else 0, aceito))
+
+        if aceito:
+            logger.info(f"Texto extraído com {nome}: {len(texto)} caracteres em {segundos:.3f}s")
+            if cache:
+                try:
+                    cache.armazenar(sha256_pdf, assinatura, nome, texto)
+                except Exception as e:
+                    logger.warning(f"Erro ao gravar no cache de texto extraído: {e}")
+            return ResultadoExtracao(texto, nome, medicoes)
+
+        logger.warning(f"{nome} extraiu texto insuficiente, tentando próximo método")
+
+    logger.error("Não foi possível extrair texto do PDF")
+    return ResultadoExtracao(None, None, medicoes)
+
+class EstatisticasExtratores:
+    """Acumula, por motor, o tempo gasto e o tamanho do texto produzido"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._dados = {}
+
+    def registrar(self, medicoes):
+        """Soma as medições de uma extração aos totais de cada motor"""
+        with self._lock:
+            for medicao in medicoes:
+                dados = self._dados.setdefault(medicao.extrator, {
+                    'tentativas': 0, 'aceitos': 0, 'segundos': 0.0, 'caracteres': 0
+                })
+                dados['tentativas'] += 1
+                dados['aceitos'] += 1 if medicao.aceito else 0
+                dados['segundos'] += medicao.segundos
+                dados['caracteres'] += medicao.caracteres
+
+    def resumo(self):
+        """Retorna os totais e médias por motor"""
+        with self._lock:
+            return {
+                nome: dict(dados,
+                           media_segundos=dados['segundos'] / dados['tentativas'],
+                           media_caracteres=dados['caracteres'] / dados['tentativas'])
+                for nome, dados in self._dados.items()
+            }
+
+    def registrar_log(self):
+        """Escreve no log o resumo de desempenho de cada motor"""
+        for nome, dados in self.resumo().items():
+            logger.info(f"Extrator {nome}: {dados['tentativas']} tentativas, {dados['aceitos']} aceitas, "
+                        f"média de {dados['media_segundos']:.3f}s e {dados['media_caracteres']:.0f} caracteres")
+
+# Estatísticas do processo principal
+estatisticas_extratores = EstatisticasExtratores()
+
+def extrair_texto_pdf(conteudo_pdf, minimo_caracteres=50, ordem=None):
+    """
+    Extrai o texto de um PDF recebido como bytes/memoryview, sem gravar nada em disco.
+    Retorna o primeiro texto aceito pela cadeia de motores, ou None.
+    """
+    resultado = extrair_com_medicoes(conteudo_pdf, minimo_caracteres, ordem)
+    estatisticas_extratores.registrar(resultado.medicoes)
+    return resultado.texto
+
+class _RepassadorLog(logging.Handler):
+    """Entrega ao logger de mesmo nome, no processo principal, os registros vindos dos processos de extração"""
+
+    def emit(self, record):
+        logging.getLogger(record.name).handle(record)
+
+def _configurar_log_trabalhador(fila_log, nivel):
+    """
+    Inicializador dos processos do pool: o logger do scraper passa a enviar os registros pela fila
+    para o processo principal, que os grava com os seus handlers (arquivo e console)
+    """
+    logger_trabalhador = logging.getLogger("DJE_Scraper")
+    logger_trabalhador.handlers[:] = [logging.handlers.QueueHandler(fila_log)]
+    logger_trabalhador.setLevel(nivel)
+    logger_trabalhador.propagate = False
+
+class PoolExtracao(ProcessPoolExecutor):
+    """
+    Pool de processos da extração de texto. Os processos não têm o logging configurado pelo main.py,
+    então os logs dos motores são repassados por uma fila ao processo principal enquanto o pool existir.
+    """
+
+    def __init__(self, processos):
+        contexto = multiprocessing.get_context("spawn")
+        self._fila_log = contexto.Queue()
+        self._ouvinte_log = logging.handlers.QueueListener(self._fila_log, _RepassadorLog())
+        self._ouvinte_log.start()
+        super().__init__(
+            max_workers=processos, mp_context=contexto,
+            initializer=_configurar_log_trabalhador, initargs=(self._fila_log, logger.getEffectiveLevel())
+        )
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        """Encerra os processos e, depois deles, o repasse dos logs (que só para se a espera for pedida)"""
+        super().shutdown(wait=wait, cancel_futures=cancel_futures)
+        if wait and self._ouvinte_log is not None:
+            self._ouvinte_log.stop()
+            self._ouvinte_log = None
+            self._fila_log.close()
+
+def criar_pool_extracao(processos=EXTRACAO_PROCESSOS):
+    """
+    Cria o pool de processos usado para extrair texto dos PDFs em paralelo com os downloads.
+    Usa o contexto 'spawn' porque o processo principal já tem threads (Selenium, downloads).
+    """
+    processos = max(1, int(processos))
+    logger.info(f"Criando pool de extração de texto com {processos} processos")
+    return PoolExtracao(processos)
+
+# Função de extração usada pelo pool (precisa ser serializável entre processos);
+# devolve as medições para que as estatísticas sejam somadas no processo principal
+extrair_texto_pagina = partial(extrair_com_medicoes, minimo_caracteres=50)
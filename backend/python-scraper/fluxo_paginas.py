@@ -0,0 +1,85 @@
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from config import FLUXO_PAGINAS_CAPACIDADE
+
+logger = logging.getLogger("DJE_Scraper")
+
+class FluxoPaginas:
+    """
+    Sequência das páginas dos cadernos do diário, indexada por ChavePagina.
+    Cada página é obtida uma única vez (por `obter_texto`) e o texto das páginas usadas
+    mais recentemente fica em memória, então a junção de um processo com a continuação
+    na página seguinte é resolvida sem navegador e sem baixar a página de novo.
+    Threads que pedem ao mesmo tempo uma página ainda não obtida esperam a primeira obtê-la.
+    """
+
+    def __init__(self, obter_texto, capacidade=FLUXO_PAGINAS_CAPACIDADE):
+        """
+        obter_texto: função que recebe uma ChavePagina e retorna o texto da página (ou None).
+        capacidade: quantidade de páginas mantidas em memória.
+        """
+        self._obter_texto = obter_texto
+        self.capacidade = max(1, int(capacidade))
+        self._paginas = OrderedDict()
+        self._lock = threading.Lock()
+        self._em_andamento = {}
+        self.obtidas = 0
+        self.reaproveitadas = 0
+
+    def registrar(self, chave, texto):
+        """Guarda o texto de uma página já obtida por outro caminho (ex.: download paralelo)"""
+        if not chave:
+            return
+
+        with self._lock:
+            self._paginas[chave] = texto
+            self._paginas.move_to_end(chave)
+            while len(self._paginas) > self.capacidade:
+                self._paginas.popitem(last=False)
+
+    def texto(self, chave):
+        """Retorna o texto da página, da memória quando possível (None se não puder ser obtido)"""
+        with self._lock:
+            if chave in self._paginas:
+                self._paginas.move_to_end(chave)
+                self.reaproveitadas += 1
+                return self._paginas[chave]
+
+            futuro = self._em_andamento.get(chave)
+            obter = futuro is None
+            if obter:
+                futuro = self._em_andamento[chave] = Future()
+                self.obtidas += 1
+            else:
+                self.reaproveitadas += 1
+
+        # Outra thread já está obtendo a página: espera o resultado dela
+        if not obter:
+            return futuro.result()
+
+        try:
+            logger.info(f"Obtendo página {tuple(chave)} para o fluxo de páginas")
+            texto = self._obter_texto(chave)
+        except Exception as e:
+            futuro.set_exception(e)
+            raise
+        else:
+            # Falhas também são guardadas, para não repetir a tentativa na mesma execução
+            self.registrar(chave, texto)
+            futuro.set_result(texto)
+            return texto
+        finally:
+            with self._lock:
+                self._em_andamento.pop(chave, None)
+
+    def proxima(self, chave):
+        """Retorna (chave, texto) da página seguinte do mesmo caderno"""
+        chave_proxima = chave.proxima()
+        return chave_proxima, self.texto(chave_proxima)
+
+    def registrar_log(self):
+        """Escreve no log quantas páginas foram obtidas e quantas reaproveitadas da memória"""
+        logger.info(f"Fluxo de páginas: {self.obtidas} páginas obtidas, {self.reaproveitadas} reaproveitadas da memória")
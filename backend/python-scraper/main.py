@@ -5,9 +5,14 @@ import logging
 import sys
 import traceback
 import platform
+import argparse
 from scraper import DJEScraper
-from database import conectar_banco, verificar_publicacao_existente, salvar_publicacao, verificar_banco_vazio, Database
-from config import HORARIOS_EXECUCAO, eh_fim_de_semana
+from carga_historica import CargaHistorica
+from varredura_caderno import VarreduraCaderno
+from downloader import BaixadorPDF
+from cache_paginas import CachePaginasPDF
+from database import conectar_banco, devolver_conexao, fechar_pool_conexoes, salvar_publicacoes, verificar_banco_vazio, Database
+from config import HORARIOS_EXECUCAO, DIRETORIO_CACHE_PAGINAS, DIAS_PRIMEIRA_BUSCA, eh_fim_de_semana
 
 # Configuração de logging
 logging.basicConfig(
@@ -62,6 +67,13 @@ def executar_scraping():
     primeira_execucao = verificar_banco_vazio(conn)
     logger.info(f"Primeira execução: {primeira_execucao}")
     
+    # Na primeira execução, o período inteiro é carregado em fatias de datas paralelas
+    if primeira_execucao:
+        devolver_conexao(conn)
+        executar_carga_historica(hoje - datetime.timedelta(days=DIAS_PRIMEIRA_BUSCA), hoje)
+        logger.info("Processo de scraping finalizado.")
+        return
+    
     # Inicializa o scraper
     scraper = None
     try:
@@ -69,115 +81,14 @@ def executar_scraping():
         scraper = DJEScraper()
         logger.info("Scraper inicializado com sucesso.")
         
-        # Busca as publicações
+        # Busca as publicações: o pipeline do scraper baixa, extrai e salva cada uma uma única vez
         logger.info("Iniciando busca de publicações...")
         publicacoes = scraper.buscar_publicacoes(primeira_execucao)
         logger.info(f"Encontradas {len(publicacoes)} publicações que atendem aos critérios.")
-        
-        # Processa e salva as publicações
-        novas_publicacoes = 0
-        for publicacao_item in publicacoes:
-            # Processa a publicação
-            publicacao = scraper.processar_publicacao(publicacao_item)
-            
-            if publicacao:
-                # Verifica se publicacao é uma lista ou um único dicionário
-                if isinstance(publicacao, list):
-                    logger.info(f"Recebidos {len(publicacao)} processos válidos da publicação")
-                    for proc in publicacao:
-                        # Verifica se o processo já existe no banco
-                        if not verificar_publicacao_existente(
-                            conn, 
-                            proc.get('numero_processo'), 
-                            proc.get('data_disponibilizacao'),
-                            proc.get('conteudo_completo')
-                        ):
-                            # Salva o novo processo
-                            id_publicacao = salvar_publicacao(conn, proc)
-                            if id_publicacao:
-                                novas_publicacoes += 1
-                                logger.info(f"Novo processo salvo com ID {id_publicacao}")
-                else:
-                    # Caso seja um único dicionário
-                    # Verifica se a publicação já existe no banco
-                    if not verificar_publicacao_existente(
-                        conn, 
-                        publicacao.get('numero_processo'), 
-                        publicacao.get('data_disponibilizacao'),
-                        publicacao.get('conteudo_completo')
-                    ):
-                        # Salva a nova publicação
-                        id_publicacao = salvar_publicacao(conn, publicacao)
-                        if id_publicacao:
-                            novas_publicacoes += 1
-                            logger.info(f"Nova publicação salva com ID {id_publicacao}")
-        
-        logger.info(f"Total de {novas_publicacoes} novas publicações salvas no banco de dados.")
     
     except Exception as e:
-        error_msg = str(e)
         logger.error(f"Erro durante o processo de scraping: {e}")
-        
-        # Trata especificamente o erro de tensores
-        if "Attempting to use a delegate that only supports static-sized tensors with a graph that has dynamic-sized tensors" in error_msg:
-            logger.warning("Detectado erro de tensores dinâmicos. Continuando com o processamento das publicações...")
-            
-            # Se o erro ocorrer e o scraper já foi inicializado, tenta processar as publicações encontradas
-            if scraper:
-                try:
-                    # Busca links diretamente
-                    resultados_publicacoes = scraper.extrair_links_publicacoes()
-                    logger.info(f"Encontrados {len(resultados_publicacoes)} links de publicações após erro de tensores.")
-                    
-                    # Processa cada publicação
-                    publicacoes = []
-                    for resultado in resultados_publicacoes:
-                        try:
-                            # Se o snippet já contém ambas as palavras-chave, processa diretamente
-                            if resultado['contem_rpv'] and resultado['contem_pagamento_inss']:
-                                logger.info(f"Processando publicação com palavras-chave já confirmadas: {resultado['url']}")
-                            
-                            publicacao = scraper.processar_publicacao(resultado)
-                            if publicacao:
-                                # Verifica se publicacao é uma lista ou um único dicionário
-                                if isinstance(publicacao, list):
-                                    logger.info(f"Recebidos {len(publicacao)} processos válidos da publicação {resultado['url']}")
-                                    for proc in publicacao:
-                                        publicacoes.append(proc)
-                                        
-                                        # Verifica se o processo já existe no banco
-                                        if not verificar_publicacao_existente(
-                                            conn, 
-                                            proc.get('numero_processo'), 
-                                            proc.get('data_disponibilizacao'),
-                                            proc.get('conteudo_completo')
-                                        ):
-                                            # Salva o novo processo
-                                            id_publicacao = salvar_publicacao(conn, proc)
-                                            if id_publicacao:
-                                                logger.info(f"Novo processo salvo com ID {id_publicacao} após erro de tensores")
-                                else:
-                                    # Caso seja um único dicionário
-                                    publicacoes.append(publicacao)
-                                
-                                # Verifica se a publicação já existe no banco
-                                if not verificar_publicacao_existente(
-                                    conn, 
-                                    publicacao.get('numero_processo'), 
-                                    publicacao.get('data_disponibilizacao'),
-                                    publicacao.get('conteudo_completo')
-                                ):
-                                    # Salva a nova publicação
-                                    id_publicacao = salvar_publicacao(conn, publicacao)
-                                    if id_publicacao:
-                                        logger.info(f"Nova publicação salva com ID {id_publicacao} após erro de tensores")
-                        except Exception as pub_error:
-                            logger.error(f"Erro ao processar publicação {resultado['url']}: {pub_error}")
-                            continue
-                except Exception as recovery_error:
-                    logger.error(f"Erro durante a recuperação após erro de tensores: {recovery_error}")
-        else:
-            logger.error(f"Detalhes do erro: {traceback.format_exc()}")
+        logger.error(f"Detalhes do erro: {traceback.format_exc()}")
     
     finally:
         # Fecha o scraper e a conexão com o banco de dados
@@ -190,13 +101,62 @@ def executar_scraping():
                 
         if conn:
             try:
-                conn.close()
-                logger.info("Conexão com o banco de dados fechada.")
+                devolver_conexao(conn)
+                logger.info("Conexão com o banco de dados devolvida ao pool.")
             except Exception as e:
                 logger.error(f"Erro ao fechar conexão com o banco de dados: {e}")
     
     logger.info("Processo de scraping finalizado.")
 
+def executar_carga_historica(data_inicial, data_final):
+    """Carrega as publicações do período em fatias de datas pesquisadas em paralelo"""
+    carga = None
+    try:
+        carga = CargaHistorica()
+        return carga.executar(data_inicial, data_final)
+    except Exception as e:
+        logger.error(f"Erro durante a carga histórica: {e}")
+        logger.error(f"Detalhes do erro: {traceback.format_exc()}")
+        return None
+    finally:
+        if carga:
+            carga.fechar()
+
+def executar_varredura_caderno(cd_volume, nu_diario, cd_caderno, data_disponibilizacao):
+    """Varre um caderno inteiro (sem o formulário de pesquisa) e salva os processos encontrados"""
+    logger.info(f"Iniciando varredura do caderno {cd_caderno} do diário {nu_diario} (volume {cd_volume})...")
+    
+    conn = conectar_banco()
+    if not conn:
+        logger.error("Não foi possível conectar ao banco de dados. Abortando varredura.")
+        return
+    
+    cache_paginas = None
+    varredura = None
+    try:
+        if DIRETORIO_CACHE_PAGINAS:
+            cache_paginas = CachePaginasPDF()
+        varredura = VarreduraCaderno(baixador=BaixadorPDF(cache=cache_paginas))
+        
+        publicacoes = varredura.varrer(cd_volume, nu_diario, cd_caderno, data_disponibilizacao)
+        
+        # Grava todas as publicações em lote (as já existentes são ignoradas)
+        resultado = salvar_publicacoes(conn, publicacoes)
+        novas_publicacoes = resultado['inseridas'] if resultado else 0
+        
+        logger.info(f"Varredura concluída: {novas_publicacoes} novas publicações salvas de {len(publicacoes)} encontradas.")
+    
+    except Exception as e:
+        logger.error(f"Erro durante a varredura do caderno: {e}")
+        logger.error(f"Detalhes do erro: {traceback.format_exc()}")
+    
+    finally:
+        if varredura:
+            varredura.fechar()
+        if cache_paginas:
+            cache_paginas.fechar()
+        devolver_conexao(conn)
+
 def agendar_tarefas():
     """Agenda as tarefas para execução nos horários especificados"""
     logger.info("Configurando o agendamento das tarefas...")
@@ -212,7 +172,38 @@ def agendar_tarefas():
     
     logger.info("Tarefas agendadas com sucesso.")
 
+def _data_iso(valor):
+    """Valida uma data AAAA-MM-DD da linha de comando"""
+    try:
+        return datetime.date.fromisoformat(valor).isoformat()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"data inválida: {valor!r} (use AAAA-MM-DD)")
+
+def ler_argumentos():
+    """Lê as opções de linha de comando"""
+    parser = argparse.ArgumentParser(description="Scraper do Diário da Justiça Eletrônico (DJE/TJSP)")
+    parser.add_argument(
+        "--varrer-caderno", nargs=3, type=int, metavar=("CD_VOLUME", "NU_DIARIO", "CD_CADERNO"),
+        help="varre todas as páginas de um caderno (sem o formulário de pesquisa) e encerra"
+    )
+    parser.add_argument(
+        "--data-disponibilizacao", metavar="AAAA-MM-DD", type=_data_iso,
+        help="data de disponibilização do diário varrido, gravada nos processos (obrigatória com --varrer-caderno)"
+    )
+    argumentos = parser.parse_args()
+    if argumentos.varrer_caderno and not argumentos.data_disponibilizacao:
+        parser.error("--varrer-caderno exige --data-disponibilizacao (a data do diário varrido)")
+    return argumentos
+
 if __name__ == "__main__":
+    argumentos = ler_argumentos()
+    
+    # Modo de varredura completa de um caderno: executa uma vez e encerra
+    if argumentos.varrer_caderno:
+        executar_varredura_caderno(*argumentos.varrer_caderno, data_disponibilizacao=argumentos.data_disponibilizacao)
+        fechar_pool_conexoes()
+        sys.exit(0)
+    
     logger.info("Iniciando aplicação de scraping do DJE...")
     
     try:
@@ -229,6 +220,7 @@ if __name__ == "__main__":
             time.sleep(1)
     except KeyboardInterrupt:
         logger.info("Aplicação interrompida pelo usuário.")
+        fechar_pool_conexoes()
     except Exception as e:
         logger.error(f"Erro não tratado na aplicação principal: {e}")
         logger.error(f"Detalhes: {traceback.format_exc()}")
@@ -0,0 +1,315 @@
+import logging
+from collections import namedtuple
+
+logger = logging.getLogger("DJE_Scraper")
+
+# Tabela com as versões do schema já aplicadas no banco
+TABELA_VERSOES = 'schema_migracoes'
+
+# Chave do advisory lock que impede dois processos de aplicarem a mesma migração ao mesmo tempo
+CHAVE_LOCK_MIGRACOES = 5_318_021
+
+# Índice único da chave natural da publicação
+INDICE_CHAVE_PUBLICACAO = 'uq_publicacoes_processo_data'
+# Índice único parcial do hash do conteúdo das publicações sem número de processo
+INDICE_CHAVE_SEM_PROCESSO = 'uq_publicacoes_hash_sem_processo'
+# Tabela que recebe as publicações duplicadas retiradas na criação do índice único (nada é apagado sem cópia)
+TABELA_DUPLICADAS = 'publicacoes_duplicadas'
+
+# Caracteres do conteúdo considerados na busca textual
+BUSCA_TEXTO_MAXIMO_CARACTERES = 200000
+
+# Uma migração do schema: `aplicar` recebe um cursor e roda dentro da transação que registra a versão
+Migracao = namedtuple('Migracao', ['versao', 'descricao', 'aplicar'])
+
+def _criar_tabela_publicacoes(cursor):
+    """Schema public, enum de status e tabela de publicações"""
+    cursor.execute("CREATE SCHEMA IF NOT EXISTS public")
+
+    cursor.execute("""
+    DO $$
+    BEGIN
+        IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'status_enum') THEN
+            CREATE TYPE status_enum AS ENUM ('nova', 'lida', 'enviada', 'processada');
+        END IF;
+    END
+    $$;
+    """)
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS publicacoes (
+        id SERIAL PRIMARY KEY,
+        numero_processo VARCHAR(50),
+        data_disponibilizacao DATE,
+        autor TEXT,
+        reu TEXT DEFAULT 'Instituto Nacional do Seguro Social - INSS',
+        advogado TEXT,
+        valor_principal DECIMAL(10, 2),
+        valor_juros_moratorios DECIMAL(10, 2),
+        honorarios_advocaticios DECIMAL(10, 2),
+        conteudo_completo TEXT,
+        status status_enum DEFAULT 'nova',
+        data_criacao TIMESTAMP NOT NULL DEFAULT NOW(),
+        data_atualizacao TIMESTAMP
+    )
+    """)
+
+def _arquivar_duplicadas(cursor, particao, condicao, descricao):
+    """
+    Move para TABELA_DUPLICADAS as publicações repetidas em `particao` entre as que atendem `condicao`
+    (fica a já trabalhada no Kanban ou, entre iguais, a mais antiga). Nenhuma linha é apagada sem cópia;
+    a quantidade movida e as chaves vão para o log. Retorna o total de publicações movidas.
+    """
+    # Mesmas colunas de publicacoes (sem defaults nem restrições), mais o momento do arquivamento
+    cursor.execute(f"CREATE TABLE IF NOT EXISTS {TABELA_DUPLICADAS} (LIKE publicacoes)")
+    cursor.execute(f"ALTER TABLE {TABELA_DUPLICADAS} ADD COLUMN IF NOT EXISTS arquivada_em TIMESTAMP NOT NULL DEFAULT NOW()")
+
+    cursor.execute(f"""
+    WITH duplicadas AS (
+        SELECT id FROM (
+            SELECT id, ROW_NUMBER() OVER (PARTITION BY {particao} ORDER BY (status <> 'nova') DESC, id) AS ordem
+            FROM publicacoes
+            WHERE {condicao}
+        ) numeradas
+        WHERE ordem > 1
+    ), movidas AS (
+        DELETE FROM publicacoes WHERE id IN (SELECT id FROM duplicadas) RETURNING *
+    ), arquivadas AS (
+        INSERT INTO {TABELA_DUPLICADAS} SELECT movidas.*, NOW() FROM movidas
+        RETURNING {particao}
+    )
+    SELECT {particao}, COUNT(*) FROM arquivadas GROUP BY {particao} ORDER BY {particao}
+    """)
+    chaves = cursor.fetchall()
+    total = sum(linha[-1] for linha in chaves)
+    if chaves:
+        logger.warning(f"{total} publicações duplicadas ({len(chaves)} chaves) movidas para {TABELA_DUPLICADAS} "
+                       f"antes da criação do {descricao}")
+        for *chave, quantidade in chaves:
+            logger.warning(f"Duplicada arquivada: {', '.join(str(valor) for valor in chave)} ({quantidade} cópias)")
+    return total
+
+def _criar_chave_publicacao(cursor):
+    """
+    Chave natural da publicação: move as duplicatas antigas para TABELA_DUPLICADAS
+    e cria o índice único usado pelo ON CONFLICT
+    """
+    cursor.execute("SELECT 1 FROM pg_indexes WHERE indexname = %s", (INDICE_CHAVE_PUBLICACAO,))
+    if cursor.fetchone():
+        return
+
+    _arquivar_duplicadas(
+        cursor, "numero_processo, data_disponibilizacao",
+        "numero_processo IS NOT NULL AND data_disponibilizacao IS NOT NULL", "índice único da chave"
+    )
+    cursor.execute(f"CREATE UNIQUE INDEX {INDICE_CHAVE_PUBLICACAO} ON publicacoes (numero_processo, data_disponibilizacao)")
+
+def _criar_hash_conteudo(cursor):
+    """Hash do conteúdo gravado (calculado na inserção), para a verificação por conteúdo usar índice"""
+    cursor.execute("ALTER TABLE publicacoes ADD COLUMN IF NOT EXISTS hash_conteudo VARCHAR(32)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_publicacoes_hash_conteudo ON publicacoes (hash_conteudo)")
+
+def _criar_indices_consultas(cursor):
+    """Índices das consultas da API: colunas do Kanban, filtros por data e listagem por data de criação"""
+    # Coluna do Kanban: WHERE status = ... ORDER BY data_criacao DESC
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_publicacoes_status_data_criacao ON publicacoes (status, data_criacao DESC)")
+    # Filtros e buscas por período de disponibilização
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_publicacoes_data_disponibilizacao ON publicacoes (data_disponibilizacao)")
+    # Listagem geral, ordenada por padrão pela data de criação
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_publicacoes_data_criacao ON publicacoes (data_criacao DESC)")
+
+def _criar_busca_texto(cursor):
+    """
+    Busca textual: tsvector em português (processo e partes com peso maior que o conteúdo) com índice GIN.
+    Um trigger mantém a coluna nas inserções e nas atualizações dos campos pesquisados, venham elas do
+    scraper ou da API; as linhas antigas são preenchidas em lotes por Database.preencher_busca_texto.
+    """
+    cursor.execute("ALTER TABLE publicacoes ADD COLUMN IF NOT EXISTS busca_texto TSVECTOR")
+
+    # O conteúdo é limitado para o tsvector não passar do tamanho máximo aceito pelo PostgreSQL
+    cursor.execute(f"""
+    CREATE OR REPLACE FUNCTION publicacoes_busca_texto(
+        numero_processo TEXT, autor TEXT, reu TEXT, advogado TEXT, conteudo_completo TEXT
+    ) RETURNS TSVECTOR LANGUAGE SQL IMMUTABLE AS $$
+        SELECT setweight(to_tsvector('portuguese', concat_ws(' ', numero_processo, autor)), 'A')
+            || setweight(to_tsvector('portuguese', concat_ws(' ', reu, advogado)), 'B')
+            || setweight(to_tsvector('portuguese', left(coalesce(conteudo_completo, ''), {BUSCA_TEXTO_MAXIMO_CARACTERES})), 'C')
+    $$
+    """)
+    cursor.execute("""
+    CREATE OR REPLACE FUNCTION publicacoes_atualizar_busca_texto() RETURNS TRIGGER LANGUAGE plpgsql AS $$
+    BEGIN
+        NEW.busca_texto := publicacoes_busca_texto(NEW.numero_processo, NEW.autor, NEW.reu, NEW.advogado, NEW.conteudo_completo);
+        RETURN NEW;
+    END
+    $$
+    """)
+    cursor.execute("DROP TRIGGER IF EXISTS trg_publicacoes_busca_texto ON publicacoes")
+    cursor.execute("""
+    CREATE TRIGGER trg_publicacoes_busca_texto
+    BEFORE INSERT OR UPDATE OF numero_processo, autor, reu, advogado, conteudo_completo ON publicacoes
+    FOR EACH ROW EXECUTE FUNCTION publicacoes_atualizar_busca_texto()
+    """)
+
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_publicacoes_busca_texto ON publicacoes USING GIN (busca_texto)")
+    # Localiza as linhas ainda sem tsvector para o preenchimento em lotes
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_publicacoes_busca_texto_pendente ON publicacoes (id) WHERE busca_texto IS NULL")
+
+def _criar_paginas_texto(cursor):
+    """
+    Texto das páginas do diário gravado uma única vez (por página e hash do texto): as publicações cujo conteúdo
+    é um trecho da página guardam só a referência e as posições, e publicacao_conteudo() remonta o texto na leitura.
+    A busca textual passa a usar o conteúdo remontado.
+    """
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS paginas_texto (
+        id SERIAL PRIMARY KEY,
+        cd_volume INTEGER NOT NULL,
+        nu_diario INTEGER NOT NULL,
+        cd_caderno INTEGER NOT NULL,
+        nu_seqpagina INTEGER NOT NULL,
+        hash_texto VARCHAR(32) NOT NULL,
+        texto TEXT NOT NULL,
+        data_criacao TIMESTAMP NOT NULL DEFAULT NOW()
+    )
+    """)
+    cursor.execute("""
+    CREATE UNIQUE INDEX IF NOT EXISTS uq_paginas_texto_pagina_hash
+    ON paginas_texto (cd_volume, nu_diario, cd_caderno, nu_seqpagina, hash_texto)
+    """)
+
+    cursor.execute("ALTER TABLE publicacoes ADD COLUMN IF NOT EXISTS pagina_texto_id INTEGER REFERENCES paginas_texto (id)")
+    cursor.execute("ALTER TABLE publicacoes ADD COLUMN IF NOT EXISTS conteudo_inicio INTEGER")
+    cursor.execute("ALTER TABLE publicacoes ADD COLUMN IF NOT EXISTS conteudo_fim INTEGER")
+
+    # Conteúdo da publicação: o copiado na própria linha ou, se não houver, o trecho [inicio, fim) da página
+    cursor.execute("""
+    CREATE OR REPLACE FUNCTION publicacao_conteudo(
+        conteudo_completo TEXT, pagina_texto_id INTEGER, conteudo_inicio INTEGER, conteudo_fim INTEGER
+    ) RETURNS TEXT LANGUAGE SQL STABLE AS $$
+        SELECT COALESCE(conteudo_completo, (
+            SELECT substr(texto, conteudo_inicio + 1, conteudo_fim - conteudo_inicio)
+            FROM paginas_texto WHERE id = pagina_texto_id
+        ))
+    $$
+    """)
+
+    cursor.execute("""
+    CREATE OR REPLACE FUNCTION publicacoes_atualizar_busca_texto() RETURNS TRIGGER LANGUAGE plpgsql AS $$
+    BEGIN
+        NEW.busca_texto := publicacoes_busca_texto(
+            NEW.numero_processo, NEW.autor, NEW.reu, NEW.advogado,
+            publicacao_conteudo(NEW.conteudo_completo, NEW.pagina_texto_id, NEW.conteudo_inicio, NEW.conteudo_fim)
+        );
+        RETURN NEW;
+    END
+    $$
+    """)
+    cursor.execute("DROP TRIGGER IF EXISTS trg_publicacoes_busca_texto ON publicacoes")
+    cursor.execute("""
+    CREATE TRIGGER trg_publicacoes_busca_texto
+    BEFORE INSERT OR UPDATE OF numero_processo, autor, reu, advogado, conteudo_completo,
+        pagina_texto_id, conteudo_inicio, conteudo_fim ON publicacoes
+    FOR EACH ROW EXECUTE FUNCTION publicacoes_atualizar_busca_texto()
+    """)
+
+def _criar_chave_sem_processo(cursor):
+    """
+    Chave das publicações sem número de processo, que o índice da chave natural não alcança (NULLs são
+    distintos): índice único parcial no hash do conteúdo, usado pelo ON CONFLICT dessas publicações.
+    As duplicatas antigas vão para TABELA_DUPLICADAS antes da criação do índice.
+    """
+    # O preenchimento em lotes do hash roda só depois das migrações; aqui bastam as linhas sem processo
+    cursor.execute("""
+    UPDATE publicacoes SET hash_conteudo = MD5(conteudo_completo)
+    WHERE numero_processo IS NULL AND hash_conteudo IS NULL AND conteudo_completo IS NOT NULL
+    """)
+    _arquivar_duplicadas(
+        cursor, "hash_conteudo", "numero_processo IS NULL AND hash_conteudo IS NOT NULL",
+        "índice único das publicações sem processo"
+    )
+    cursor.execute(f"""
+    CREATE UNIQUE INDEX IF NOT EXISTS {INDICE_CHAVE_SEM_PROCESSO}
+    ON publicacoes (hash_conteudo) WHERE numero_processo IS NULL
+    """)
+
+def _criar_indice_hash_pendente(cursor):
+    """Localiza as linhas ainda sem hash do conteúdo, para o preenchimento em lotes verificar com um EXISTS barato"""
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_publicacoes_hash_conteudo_pendente ON publicacoes (id)
+    WHERE hash_conteudo IS NULL AND conteudo_completo IS NOT NULL
+    """)
+
+# Migrações em ordem de versão; uma migração aplicada nunca é alterada, mudanças novas entram no fim da lista.
+# As primeiras só usam comandos idempotentes, então bancos criados antes do controle de versões as aplicam sem erro.
+MIGRACOES = [
+    Migracao(1, 'tabela de publicações e enum de status', _criar_tabela_publicacoes),
+    Migracao(2, 'índice único da chave da publicação', _criar_chave_publicacao),
+    Migracao(3, 'hash do conteúdo com índice', _criar_hash_conteudo),
+    Migracao(4, 'índices das consultas por status e datas', _criar_indices_consultas),
+    Migracao(5, 'busca textual em português com índice GIN', _criar_busca_texto),
+    Migracao(6, 'texto das páginas separado das publicações', _criar_paginas_texto),
+    Migracao(7, 'índice único do hash das publicações sem número de processo', _criar_chave_sem_processo),
+    Migracao(8, 'índice parcial das publicações sem hash do conteúdo', _criar_indice_hash_pendente),
+]
+
+def versoes_aplicadas(conn):
+    """Retorna o conjunto das versões já aplicadas (cria a tabela de versões se necessário)"""
+    with conn.cursor() as cursor:
+        cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {TABELA_VERSOES} (
+            versao INTEGER PRIMARY KEY,
+            descricao TEXT NOT NULL,
+            aplicada_em TIMESTAMP NOT NULL DEFAULT NOW()
+        )
+        """)
+        cursor.execute(f"SELECT versao FROM {TABELA_VERSOES}")
+        return {linha[0] for linha in cursor.fetchall()}
+
+def aplicar_migracoes(conn, migracoes=MIGRACOES):
+    """
+    Aplica, em ordem, as migrações ainda não registradas na tabela de versões. Cada migração roda numa
+    transação junto com o registro da sua versão, sob um advisory lock, então é aplicada uma única vez
+    mesmo com vários processos iniciando juntos. Retorna True se o schema ficou na versão mais recente.
+    """
+    autocommit_original = conn.autocommit
+    try:
+        conn.autocommit = True
+        aplicadas = versoes_aplicadas(conn)
+        pendentes = [migracao for migracao in sorted(migracoes, key=lambda m: m.versao) if migracao.versao not in aplicadas]
+        if not pendentes:
+            return True
+
+        conn.autocommit = False
+        for migracao in pendentes:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_xact_lock(%s)", (CHAVE_LOCK_MIGRACOES,))
+
+                # Outro processo pode ter aplicado a migração enquanto esperávamos o lock
+                cursor.execute(f"SELECT 1 FROM {TABELA_VERSOES} WHERE versao = %s", (migracao.versao,))
+                if cursor.fetchone():
+                    conn.commit()
+                    continue
+
+                logger.info(f"Aplicando migração {migracao.versao}: {migracao.descricao}")
+                migracao.aplicar(cursor)
+                cursor.execute(
+                    f"INSERT INTO {TABELA_VERSOES} (versao, descricao) VALUES (%s, %s)",
+                    (migracao.versao, migracao.descricao)
+                )
+            conn.commit()
+
+        logger.info(f"Schema do banco na versão {pendentes[-1].versao}")
+        return True
+    except Exception as e:
+        logger.error(f"Erro ao aplicar as migrações do banco de dados: {e}")
+        try:
+            conn.rollback()
+        except Exception:
+            pass
+        return False
+    finally:
+        try:
+            conn.autocommit = autocommit_original
+        except Exception:
+            pass
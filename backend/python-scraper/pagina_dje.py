@@ -0,0 +1,43 @@
+import re
+from collections import namedtuple
+
+from config import DJE_URL_BASE
+
+# URL base das páginas do Diário da Justiça Eletrônico
+URL_BASE_CDJE = DJE_URL_BASE
+
+# Parâmetros que identificam uma página de um caderno nas URLs do DJE
+PADRAO_PARAMETROS_PAGINA = re.compile(r'cdVolume=(\d+)&nuDiario=(\d+)&cdCaderno=(\d+)&nuSeqpagina=(\d+)')
+
+class ChavePagina(namedtuple('ChavePagina', ['cd_volume', 'nu_diario', 'cd_caderno', 'nu_seqpagina'])):
+    """Identifica uma página publicada do diário: (cdVolume, nuDiario, cdCaderno, nuSeqpagina)"""
+
+    __slots__ = ()
+
+    @classmethod
+    def de_url(cls, url):
+        """Extrai a chave de uma URL consultaSimples.do ou getPaginaDoDiario.do (None se não houver)"""
+        if not url:
+            return None
+
+        match = PADRAO_PARAMETROS_PAGINA.search(url)
+        if not match:
+            return None
+
+        return cls(*(int(valor) for valor in match.groups()))
+
+    def _parametros(self):
+        return (f"cdVolume={self.cd_volume}&nuDiario={self.nu_diario}"
+                f"&cdCaderno={self.cd_caderno}&nuSeqpagina={self.nu_seqpagina}")
+
+    def url_pdf(self):
+        """URL direta do PDF da página"""
+        return f"{URL_BASE_CDJE}/getPaginaDoDiario.do?{self._parametros()}"
+
+    def url_consulta(self):
+        """URL da página de visualização (com frames) usada nos resultados da pesquisa"""
+        return f"{URL_BASE_CDJE}/consultaSimples.do?{self._parametros()}"
+
+    def proxima(self):
+        """Chave da página seguinte do mesmo caderno"""
+        return self._replace(nu_seqpagina=self.nu_seqpagina + 1)
@@ -0,0 +1,110 @@
+import logging
+import queue
+import threading
+import time
+
+from config import PIPELINE_CAPACIDADE_FILA
+
+logger = logging.getLogger("DJE_Scraper")
+
+# Marca o fim dos itens numa fila entre estágios
+_FIM = object()
+
+class Estagio:
+    """
+    Um estágio do pipeline: `funcao` recebe um item e retorna o item para o próximo estágio,
+    ou None quando o item termina nesse estágio. `concorrencia` threads executam o estágio.
+    """
+
+    def __init__(self, nome, funcao, concorrencia=1):
+        self.nome = nome
+        self.funcao = funcao
+        self.concorrencia = max(1, int(concorrencia))
+        self.processados = 0
+        self.falhas = 0
+        self.segundos = 0.0
+        self._lock = threading.Lock()
+
+    def _registrar(self, segundos, falhou):
+        """Soma a execução de um item às estatísticas do estágio"""
+        with self._lock:
+            self.processados += 1
+            self.segundos += segundos
+            if falhou:
+                self.falhas += 1
+
+class Pipeline:
+    """
+    Estágios encadeados por filas limitadas (`capacidade_fila` itens entre dois estágios).
+    Cada item passa uma única vez por cada estágio, na ordem; como as filas são limitadas,
+    um estágio lento segura os anteriores em vez de acumular itens em memória.
+    Um erro num item é registrado no log e encerra apenas aquele item.
+    """
+
+    def __init__(self, estagios, capacidade_fila=PIPELINE_CAPACIDADE_FILA):
+        self.estagios = list(estagios)
+        self.capacidade_fila = max(1, int(capacidade_fila))
+
+    def _trabalhar(self, estagio, entrada, saida, restantes, lock_restantes):
+        """Laço de uma thread do estágio: consome a fila de entrada até o fim dos itens"""
+        while True:
+            item = entrada.get()
+            if item is _FIM:
+                # Devolve o fim para as outras threads do estágio; a última a sair avisa o próximo
+                entrada.put(_FIM)
+                with lock_restantes:
+                    restantes[0] -= 1
+                    ultima = restantes[0] == 0
+                if ultima and saida is not None:
+                    saida.put(_FIM)
+                return
+
+            inicio = time.perf_counter()
+            resultado = None
+            falhou = False
+            try:
+                resultado = estagio.funcao(item)
+            except Exception as e:
+                falhou = True
+                logger.error(f"Erro no estágio '{estagio.nome}' do pipeline: {e}")
+            estagio._registrar(time.perf_counter() - inicio, falhou)
+
+            if resultado is not None and saida is not None:
+                saida.put(resultado)
+
+    def executar(self, itens):
+        """
+        Alimenta o primeiro estágio com os itens (na thread atual, que pode ser um gerador lento,
+        como a descoberta dos links) e aguarda até que todos tenham atravessado o pipeline
+        """
+        filas = [queue.Queue(maxsize=self.capacidade_fila) for _ in self.estagios]
+        threads = []
+
+        for indice, estagio in enumerate(self.estagios):
+            saida = filas[indice + 1] if indice + 1 < len(filas) else None
+            restantes = [estagio.concorrencia]
+            lock_restantes = threading.Lock()
+            for numero in range(estagio.concorrencia):
+                thread = threading.Thread(
+                    target=self._trabalhar,
+                    args=(estagio, filas[indice], saida, restantes, lock_restantes),
+                    name=f"pipeline_{estagio.nome}_{numero}",
+                    daemon=True
+                )
+                thread.start()
+                threads.append(thread)
+
+        try:
+            for item in itens:
+                filas[0].put(item)
+        finally:
+            # Mesmo se a origem falhar, os itens já enviados terminam o percurso
+            filas[0].put(_FIM)
+            for thread in threads:
+                thread.join()
+
+    def registrar_log(self):
+        """Escreve no log os itens, as falhas e o tempo ocupado de cada estágio"""
+        for estagio in self.estagios:
+            logger.info(f"Pipeline, estágio '{estagio.nome}' ({estagio.concorrencia} threads): "
+                        f"{estagio.processados} itens, {estagio.falhas} falhas, {estagio.segundos:.1f}s ocupados")
@@ -0,0 +1,246 @@
+import logging
+import threading
+
+from config import PIPELINE_CONCORRENCIA_DOWNLOAD, PIPELINE_CONCORRENCIA_EXTRACAO, PIPELINE_CONCORRENCIA_PROCESSAMENTO, DB_LOTE_INSERCAO
+from database import Database
+from diario_execucao import ETAPA_DESCOBERTA, ETAPA_BAIXADA, ETAPA_EXTRAIDA
+from extracao_pdf import extrair_texto_pagina, estatisticas_extratores
+from pagina_dje import ChavePagina
+from pipeline import Pipeline, Estagio
+from segmentacao import segmentar_processos
+
+logger = logging.getLogger("DJE_Scraper")
+
+class PipelinePublicacoes:
+    """
+    Pipeline das publicações encontradas numa pesquisa: a descoberta dos links (na thread de quem chama)
+    alimenta os estágios de download, extração de texto, página seguinte (para os processos que continuam
+    na próxima página), processamento dos processos e gravação em lote no banco,
+    cada um com a sua concorrência e ligados por filas limitadas. Cada publicação passa uma única vez
+    por cada estágio; o andamento de cada uma é registrado no diário de execução, se houver.
+
+    Os itens são dicionários com 'url', 'snippet', 'data_disponibilizacao' (data do diário lida no resultado
+    da pesquisa) e 'etapa' (e 'texto_pdf'/'processos' quando retomados do diário).
+    """
+
+    def __init__(self, scraper, execucao_id=None, data_disponibilizacao=None, janela=None):
+        """
+        scraper: DJEScraper que fornece o baixador, o pool de extração e o processamento das publicações.
+        execucao_id: execução do diário de execução em que o andamento é registrado (None não registra).
+        data_disponibilizacao: se informada (AAAA-MM-DD), é a data dos processos das publicações cujo resultado
+        da pesquisa não trouxe a data do diário. Sem nenhuma das duas, vale a data padrão da extração (hoje).
+        janela: (data_inicial, data_final) pesquisadas; as chaves já gravadas nesse período são carregadas
+        em memória e as publicações repetidas não chegam ao banco.
+        """
+        self.scraper = scraper
+        self.execucao_id = execucao_id
+        self.diario = scraper.diario_execucao if execucao_id is not None else None
+        self.data_disponibilizacao = data_disponibilizacao
+        self.janela = janela
+        self.pool_extracao = scraper._obter_pool_extracao()
+        self.db = None
+
+        self.publicacoes = []
+        self.salvas = 0
+        self._lote_gravacao = []
+        self._processos_no_lote = 0
+        self.adiadas = []
+        self._lock = threading.Lock()
+
+        self.pipeline = Pipeline([
+            Estagio('download', self.baixar, PIPELINE_CONCORRENCIA_DOWNLOAD),
+            Estagio('extracao', self.extrair_texto, PIPELINE_CONCORRENCIA_EXTRACAO),
+            Estagio('pagina_seguinte', self.obter_pagina_seguinte, PIPELINE_CONCORRENCIA_DOWNLOAD),
+            Estagio('processamento', self.processar, PIPELINE_CONCORRENCIA_PROCESSAMENTO),
+            Estagio('gravacao', self.persistir, 1),
+        ])
+
+    def baixar(self, item):
+        """Estágio de download: obtém os bytes do PDF da página (cache de páginas primeiro)"""
+        if item['etapa'] == ETAPA_DESCOBERTA:
+            url_pdf = item['url'].replace("consultaSimples.do", "getPaginaDoDiario.do")
+            item['conteudo_pdf'] = self.scraper.baixador.baixar(url_pdf)
+        return item
+
+    def extrair_texto(self, item):
+        """Estágio de extração: extrai o texto do PDF no pool de processos"""
+        conteudo_pdf = item.pop('conteudo_pdf', None)
+
+        if conteudo_pdf:
+            if self.pool_extracao:
+                resultado = self.pool_extracao.submit(extrair_texto_pagina, conteudo_pdf).result()
+            else:
+                resultado = extrair_texto_pagina(conteudo_pdf)
+            estatisticas_extratores.registrar(resultado.medicoes)
+
+            item['texto_pdf'] = resultado.texto
+            if resultado.texto:
+                item['etapa'] = ETAPA_BAIXADA
+                if self.diario:
+                    self.diario.marcar_baixadas(self.execucao_id, {item['url']: resultado.texto})
+
+        # Disponibiliza o texto para a junção de processos de páginas vizinhas
+        if item.get('texto_pdf'):
+            self.scraper.fluxo_paginas.registrar(ChavePagina.de_url(item['url']), item['texto_pdf'])
+        return item
+
+    def obter_pagina_seguinte(self, item):
+        """
+        Estágio da página seguinte: se a página termina num processo aberto, baixa e extrai a página seguinte
+        pelo fluxo de páginas, para que a junção no processamento encontre o texto já em memória
+        """
+        texto_pdf = item.get('texto_pdf')
+        if item['etapa'] == ETAPA_EXTRAIDA or not texto_pdf:
+            return item
+
+        segmento_aberto = None
+        for segmento in segmentar_processos(texto_pdf):
+            segmento_aberto = segmento if segmento.aberto else None
+
+        chave_pagina = ChavePagina.de_url(item['url'])
+        if segmento_aberto and chave_pagina:
+            try:
+                self.scraper.fluxo_paginas.proxima(chave_pagina)
+            except Exception as e:
+                # O processamento tenta de novo pelo fluxo de páginas
+                logger.warning(f"Erro ao obter a página seguinte de {item['url']}: {e}")
+        return item
+
+    def processar(self, item, usar_navegador=False):
+        """
+        Estágio de processamento: separa os processos da página e extrai os seus campos.
+        Publicações sem texto dependem dos métodos alternativos pelo navegador, que só fica livre
+        depois da descoberta; por isso elas são adiadas para o fim do pipeline.
+        """
+        if item['etapa'] == ETAPA_EXTRAIDA:
+            logger.info(f"Publicação já extraída em execução anterior: {item['url']}")
+            return item
+
+        if not item.get('texto_pdf') and not usar_navegador:
+            with self._lock:
+                self.adiadas.append(item)
+            return None
+
+        logger.info(f"Processando publicação: {item['url']}")
+        dados_publicacao = self.scraper.processar_publicacao({
+            'url': item['url'],
+            'snippet': item.get('snippet', ''),
+            'texto_pdf': item.get('texto_pdf')
+        })
+
+        # Verifica se o resultado é uma lista ou um único dicionário
+        if not dados_publicacao:
+            processos = []
+            logger.warning(f"Não foi possível extrair dados da publicação {item['url']}")
+        elif isinstance(dados_publicacao, list):
+            processos = dados_publicacao
+        else:
+            processos = [dados_publicacao]
+
+        # A data do diário lida no resultado vale mesmo numa pesquisa de vários dias
+        data_disponibilizacao = item.get('data_disponibilizacao') or self.data_disponibilizacao
+        if not data_disponibilizacao and self.janela and self.janela[0] != self.janela[1]:
+            logger.warning(f"Data do diário não identificada no resultado de {item['url']} numa pesquisa de vários dias: "
+                           f"os processos ficam com a data da extração")
+        for processo in processos:
+            if data_disponibilizacao:
+                processo['data_disponibilizacao'] = data_disponibilizacao
+            logger.info(f"Processo adicionado com sucesso: Processo {processo.get('numero_processo', 'N/A')}")
+
+        item['processos'] = processos
+        item['etapa'] = ETAPA_EXTRAIDA
+        if self.diario:
+            self.diario.marcar_extraida(self.execucao_id, item['url'], processos)
+        return item
+
+    def persistir(self, item):
+        """
+        Estágio de gravação: acumula as publicações e as grava no banco em lotes de DB_LOTE_INSERCAO
+        processos (uma única conexão), marcando cada URL como persistida depois da gravação do lote
+        """
+        processos = item.get('processos') or []
+        with self._lock:
+            self.publicacoes.extend(processos)
+
+        # O texto da página vai junto para o banco, que guarda só a referência do trecho de cada processo
+        texto_pagina = item.pop('texto_pdf', None)
+        if self.db is None:
+            return None
+
+        if texto_pagina:
+            chave_pagina = ChavePagina.de_url(item['url'])
+            for processo in processos:
+                processo['chave_pagina'] = chave_pagina
+                processo['texto_pagina'] = texto_pagina
+
+        self._lote_gravacao.append(item)
+        self._processos_no_lote += len(processos)
+        if self._processos_no_lote >= DB_LOTE_INSERCAO:
+            self.gravar_lote()
+        return None
+
+    def gravar_lote(self):
+        """Grava no banco as publicações acumuladas pelo estágio de gravação"""
+        itens, self._lote_gravacao, self._processos_no_lote = self._lote_gravacao, [], 0
+        if not itens or self.db is None:
+            return
+
+        processos = [processo for item in itens for processo in item.get('processos') or []]
+        resultado = self.db.inserir_publicacoes(processos)
+        for processo in processos:
+            processo.pop('chave_pagina', None)
+            processo.pop('texto_pagina', None)
+
+        # Com falha, as URLs ficam pendentes para serem salvas de novo numa retomada
+        if resultado is None:
+            logger.error(f"Falha ao gravar lote de {len(processos)} publicações no banco")
+            return
+
+        self.salvas += resultado['inseridas']
+        if self.diario:
+            for item in itens:
+                self.diario.marcar_persistida(self.execucao_id, item['url'])
+
+    def executar(self, itens):
+        """
+        Passa os itens (lista ou gerador da descoberta) pelo pipeline e, no fim, processa as publicações adiadas.
+        Retorna True se as publicações puderam ser gravadas no banco, False se não houve conexão.
+        """
+        # Conecta ao banco de dados uma única vez
+        self.db = Database()
+        if not self.db.conn:
+            logger.error("Não foi possível conectar ao banco de dados. As publicações serão processadas, mas não salvas.")
+            self.db = None
+        else:
+            # Limpa conexões ociosas em transação antes de iniciar
+            conexoes_limpas = self.db.limpar_conexoes_ociosas()
+            if conexoes_limpas > 0:
+                logger.info(f"Foram limpas {conexoes_limpas} conexões ociosas antes de iniciar as inserções")
+            if self.janela:
+                self.db.carregar_chaves_existentes(*self.janela)
+
+        banco_disponivel = self.db is not None
+        try:
+            self.pipeline.executar(itens)
+
+            if self.adiadas:
+                logger.info(f"Processando {len(self.adiadas)} publicações sem texto do PDF pelos métodos alternativos")
+            for item in self.adiadas:
+                try:
+                    item = self.processar(item, usar_navegador=True)
+                    self.persistir(item)
+                except Exception as e:
+                    logger.error(f"Erro ao processar publicação {item['url']}: {e}")
+
+            # Grava o que restou do último lote
+            self.gravar_lote()
+            logger.info(f"Salvas {self.salvas} de {len(self.publicacoes)} publicações no banco de dados")
+        finally:
+            self.pipeline.registrar_log()
+            if self.db:
+                # Limpa conexões ociosas novamente ao finalizar e fecha a conexão com o banco
+                self.db.limpar_conexoes_ociosas()
+                self.db.fechar_conexao()
+                self.db = None
+
+        return banco_disponivel
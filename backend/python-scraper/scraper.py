@@ -1,4 +1,3 @@
-import time
 import re
 import datetime
 import logging
@@ -13,22 +12,89 @@ from selenium.webdriver.support.ui import Select
 from webdriver_manager.chrome import ChromeDriverManager
 from bs4 import BeautifulSoup
 import requests
+from urllib.parse import urljoin
 import os
 import platform
-import tempfile
-import PyPDF2
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import NoSuchElementException
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.keys import Keys
 
-from config import DJE_URL, CONSULTA_AVANCADA_URL, CADERNO, PALAVRAS_CHAVE, DIAS_PRIMEIRA_BUSCA, eh_fim_de_semana
+from config import DJE_URL, DJE_URL_BASE, CONSULTA_AVANCADA_URL, CADERNO, CODIGO_CADERNO, DIAS_PRIMEIRA_BUSCA, DIRETORIO_CACHE_PAGINAS, ORDEM_EXTRATORES, ARQUIVO_DIARIO_EXECUCAO, BUSCA_HTTP_ATIVA, ESPERA_TIMEOUT_CURTO, eh_fim_de_semana
 from standalone_chrome import get_chromedriver_path
+from downloader import BaixadorPDF
+from sessao_http import SessaoDJE
+from busca_http import BuscaHTTP, PESQUISA_LIVRE, ler_total_resultados, classificar_snippet, ler_data_resultado
+from esperas import (esperar, esperar_carregamento, esperar_troca_de_pagina, executar_script_assincrono,
+                     documento_atual, resultados_da_pesquisa, texto_selecionado, estatisticas_esperas)
+from cache_paginas import CachePaginasPDF
+from pagina_dje import ChavePagina
+from fluxo_paginas import FluxoPaginas
+from extracao_campos import extrair_campos_processo, extrair_campos_lote
+from segmentacao import segmentar_processos, separar_continuacao, fim_processo, contem_palavras_chave
+from diario_execucao import DiarioExecucao, ETAPA_DESCOBERTA
+from pipeline_publicacoes import PipelinePublicacoes
+from extracao_pdf import extrair_texto_pdf, extrair_texto_pagina, criar_pool_extracao, estatisticas_extratores, fechar_cache_texto
 
 logger = logging.getLogger("DJE_Scraper")
 
 class DJEScraper:
-    def __init__(self):
-        """Inicializa o scraper com um navegador Chrome headless"""
+    def __init__(self, pool_extracao=None, cache_paginas=None):
+        """
+        Inicializa o scraper. A pesquisa é feita por HTTP (busca_http.BuscaHTTP); o navegador Chrome headless
+        só é iniciado quando algo precisa dele (pesquisa pelo formulário como alternativa, métodos alternativos
+        de extração do texto).
+        pool_extracao / cache_paginas: recursos compartilhados entre vários scrapers (ex.: na carga
+        histórica); quando informados, não são encerrados por fechar().
+        """
+        self._driver = None
+        self.wait = None
+        
+        # Sessão HTTP única para a pesquisa e os downloads, semeada com os cookies do navegador (se estiver aberto)
+        self.sessao_http = SessaoDJE(obter_cookies_navegador=self._obter_cookies_navegador)
+        
+        # Pesquisa sem navegador; o formulário pelo Selenium fica como alternativa
+        self.busca_http = BuscaHTTP(self.sessao_http) if BUSCA_HTTP_ATIVA else None
+        self._pesquisa_http = False
+        self._periodo_pesquisado = None
+        
+        # Recursos recebidos de fora pertencem a quem os criou
+        self._pool_proprio = pool_extracao is None
+        self._cache_proprio = cache_paginas is None
+        
+        # Cache em disco dos PDFs das páginas, consultado antes de cada download
+        self.cache_paginas = cache_paginas
+        if cache_paginas is None and DIRETORIO_CACHE_PAGINAS:
+            try:
+                self.cache_paginas = CachePaginasPDF()
+            except Exception as e:
+                logger.warning(f"Cache de páginas indisponível, seguindo sem cache: {e}")
+        
+        self.baixador = BaixadorPDF(sessao=self.sessao_http, cache=self.cache_paginas)
+        
+        # Pool de processos da extração de texto, criado na primeira utilização
+        self.pool_extracao = pool_extracao
+        
+        # Páginas já obtidas, reaproveitadas para juntar processos divididos entre páginas
+        self.fluxo_paginas = FluxoPaginas(self._obter_texto_pagina)
+        
+        # Diário das execuções, para retomar uma execução interrompida do mesmo período
+        self.diario_execucao = None
+        if ARQUIVO_DIARIO_EXECUCAO:
+            try:
+                self.diario_execucao = DiarioExecucao()
+            except Exception as e:
+                logger.warning(f"Diário de execução indisponível, seguindo sem retomada: {e}")
+    
+    @property
+    def driver(self):
+        """Navegador Chrome, iniciado na primeira utilização"""
+        if self._driver is None:
+            self._iniciar_navegador()
+        return self._driver
+    
+    def _iniciar_navegador(self):
+        """Inicia o navegador Chrome headless"""
+        logger.info("Iniciando o navegador Chrome...")
         chrome_options = Options()
         
         # Adiciona opção headless para execução em servidor
@@ -61,10 +127,10 @@ class DJEScraper:
                 if driver_path and os.path.exists(driver_path):
                     logger.info(f"Usando ChromeDriver personalizado em: {driver_path}")
                     service = Service(executable_path=driver_path)
-                    self.driver = webdriver.Chrome(service=service, options=chrome_options)
+                    self._driver = webdriver.Chrome(service=service, options=chrome_options)
                 else:
                     logger.info("Tentando usar o ChromeDriverManager no Windows...")
-                    self.driver = webdriver.Chrome(options=chrome_options)
+                    self._driver = webdriver.Chrome(options=chrome_options)
             else:
                 # Em ambiente Docker/Linux, usar método explícito
                 logger.info("Ambiente Linux detectado, usando configuração específica para Docker...")
@@ -78,19 +144,19 @@ class DJEScraper:
                     # e o ChromeDriver compatível do webdriver_manager
                     from selenium.webdriver.chrome.service import Service as ChromeService
                     
-                    self.driver = webdriver.Chrome(
+                    self._driver = webdriver.Chrome(
                         service=ChromeService(ChromeDriverManager(path="/tmp/chromedriver").install()),
                         options=chrome_options
                     )
                 else:
                     # Em um Linux não-Docker, tentar abordagem padrão
-                    self.driver = webdriver.Chrome(
+                    self._driver = webdriver.Chrome(
                         service=Service(ChromeDriverManager().install()), 
                         options=chrome_options
                     )
                 
             # Configurações adicionais após inicialização
-            self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
+            self._driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
                 "source": """
                 Object.defineProperty(navigator, 'webdriver', {
                     get: () => undefined
@@ -98,7 +164,7 @@ class DJEScraper:
                 """
             })
             
-            self.wait = WebDriverWait(self.driver, 20)  # Aumentado para 20 segundos
+            self.wait = WebDriverWait(self._driver, 20)  # Aumentado para 20 segundos
             logger.info("Chrome inicializado com sucesso.")
             
         except Exception as e:
@@ -127,20 +193,45 @@ class DJEScraper:
                 chrome_options.binary_location = "/usr/bin/google-chrome"
                 
                 # Criar instância do Chrome
-                self.driver = webdriver.Chrome(options=chrome_options)
+                self._driver = webdriver.Chrome(options=chrome_options)
                 
-                self.wait = WebDriverWait(self.driver, 20)
+                self.wait = WebDriverWait(self._driver, 20)
                 logger.info("Chrome inicializado com sucesso usando configuração de contingência.")
                 
             except Exception as e2:
                 logger.error(f"Erro na abordagem final: {e2}")
                 raise Exception(f"Não foi possível inicializar o Chrome. Erro original: {e}. Erro final: {e2}")
-    
+        
     def fechar(self):
-        """Fecha o navegador"""
-        if self.driver:
+        """Fecha o navegador e a sessão HTTP"""
+        if getattr(self, 'sessao_http', None):
+            self.sessao_http.fechar()
+        
+        estatisticas_extratores.registrar_log()
+        estatisticas_esperas.registrar_log()
+        
+        if getattr(self, 'fluxo_paginas', None):
+            self.fluxo_paginas.registrar_log()
+        
+        if getattr(self, 'pool_extracao', None) and self._pool_proprio:
+            self.pool_extracao.shutdown(wait=True, cancel_futures=True)
+            self.pool_extracao = None
+        
+        if self._pool_proprio:
+            fechar_cache_texto()
+        
+        if getattr(self, 'diario_execucao', None):
+            self.diario_execucao.fechar()
+        
+        if getattr(self, 'cache_paginas', None) and self._cache_proprio:
+            estatisticas = self.cache_paginas.estatisticas()
+            logger.info(f"Cache de páginas: {estatisticas['acertos']} acertos, {estatisticas['falhas']} falhas, "
+                        f"{estatisticas['pdfs']} PDFs ({estatisticas['tamanho_bytes'] / (1024 * 1024):.1f} MB)")
+            self.cache_paginas.fechar()
+        
+        if self._driver:
             try:
-                self.driver.quit()
+                self._driver.quit()
                 logger.info("Navegador Chrome fechado com sucesso.")
             except Exception as e:
                 logger.error(f"Erro ao fechar o navegador Chrome: {e}")
@@ -151,13 +242,12 @@ class DJEScraper:
             # Acessa diretamente a URL de consulta avançada com #buscaavancada
             logger.info(f"Acessando diretamente a URL de consulta avançada: {CONSULTA_AVANCADA_URL}")
             self.driver.get(CONSULTA_AVANCADA_URL)
-            
-            # Espera mais tempo para garantir carregamento completo
-            time.sleep(5)
+            esperar_carregamento(self.driver, "carregamento da consulta avançada")
             
             # Força JavaScript para garantir que estamos na seção correta
             self.driver.execute_script("window.location.hash = '#buscaavancada';")
-            time.sleep(2)
+            esperar(self.driver, EC.visibility_of_element_located((By.NAME, "dadosConsulta.dtInicio")),
+                    "formulário da consulta avançada visível")
             
             # Verifica se estamos na página de consulta avançada
             if "consultaAvancada.do" in self.driver.current_url:
@@ -188,11 +278,13 @@ class DJEScraper:
                 # Limpa e preenche os campos
                 campo_data_inicial.clear()
                 campo_data_inicial.send_keys(data_inicial_str)
-                time.sleep(1)
+                esperar(self.driver, EC.text_to_be_present_in_element_value((By.NAME, "dadosConsulta.dtInicio"), data_inicial_str),
+                        "data inicial preenchida", ESPERA_TIMEOUT_CURTO)
                 
                 campo_data_final.clear()
                 campo_data_final.send_keys(data_final_str)
-                time.sleep(1)
+                esperar(self.driver, EC.text_to_be_present_in_element_value((By.NAME, "dadosConsulta.dtFim"), data_final_str),
+                        "data final preenchida", ESPERA_TIMEOUT_CURTO)
                 
                 logger.info("Datas preenchidas com sucesso.")
                 return True
@@ -213,12 +305,13 @@ class DJEScraper:
             try:
                 select_element = self.driver.find_element(By.NAME, "dadosConsulta.cdCaderno")
                 
-                # Seleciona diretamente o valor 12 para o caderno desejado
+                # Seleciona diretamente o valor do caderno desejado
                 select_caderno = Select(select_element)
-                select_caderno.select_by_value("12")
+                select_caderno.select_by_value(CODIGO_CADERNO)
                 
-                logger.info("Caderno selecionado com sucesso usando o value=12")
-                time.sleep(1)
+                esperar(self.driver, EC.text_to_be_present_in_element_value((By.NAME, "dadosConsulta.cdCaderno"), CODIGO_CADERNO),
+                        "caderno selecionado", ESPERA_TIMEOUT_CURTO)
+                logger.info(f"Caderno selecionado com sucesso usando o value={CODIGO_CADERNO}")
                 return True
             except NoSuchElementException as e:
                 logger.error(f"Erro ao encontrar select de caderno: {e}")
@@ -232,7 +325,7 @@ class DJEScraper:
         """Preenche o campo de palavras-chave para a pesquisa"""
         try:
             # Formata as palavras-chave no formato esperado pelo site
-            palavras_str = '"RPV" e "pagamento pelo INSS"'
+            palavras_str = PESQUISA_LIVRE
             logger.info(f"Preenchendo palavras-chave: {palavras_str}")
             
             # Usa o nome correto do campo fornecido
@@ -242,7 +335,8 @@ class DJEScraper:
                 # Limpa e preenche o campo
                 campo_palavras.clear()
                 campo_palavras.send_keys(palavras_str)
-                time.sleep(1)
+                esperar(self.driver, EC.text_to_be_present_in_element_value((By.NAME, "dadosConsulta.pesquisaLivre"), palavras_str),
+                        "palavras-chave preenchidas", ESPERA_TIMEOUT_CURTO)
                 
                 logger.info("Palavras-chave preenchidas com sucesso")
                 return True
@@ -267,8 +361,8 @@ class DJEScraper:
                 botao_pesquisar.click()
                 logger.info("Botão de pesquisa clicado, aguardando resultados...")
                 
-                # Aguarda o carregamento dos resultados (um tempo maior para garantir)
-                time.sleep(10)
+                # Aguarda a página de resultados
+                self._esperar_resultados_pesquisa()
                 
                 # Verifica se ainda estamos na mesma página ou se a página mudou
                 if "consultaAvancada.do" in self.driver.current_url and "#buscaavancada" in self.driver.current_url:
@@ -289,14 +383,48 @@ class DJEScraper:
             logger.error(f"Erro ao executar pesquisa: {e}")
             return False
     
+    def _esperar_resultados_pesquisa(self):
+        """
+        Espera a página de resultados da pesquisa (lista de resultados ou mensagem sem resultados);
+        a página do formulário não tem nenhum dos dois, então não há risco de ler a página antiga
+        """
+        esperar(self.driver, resultados_da_pesquisa, "resultados da pesquisa")
+    
     def extrair_links_publicacoes(self):
         """Extrai os links para as publicações encontradas na pesquisa, junto com seus snippets de texto"""
+        return list(self.iterar_links_publicacoes())
+    
+    def iterar_links_publicacoes(self):
+        """
+        Gera os links das publicações encontradas na pesquisa, com seus snippets de texto,
+        à medida que as páginas de resultados são percorridas. Numa pesquisa por HTTP cuja paginação
+        não pôde ser seguida, refaz a pesquisa pelo navegador e completa com os links que faltaram.
+        """
+        if not self._pesquisa_http:
+            yield from self._iterar_links_navegador()
+            return
+        
+        urls_vistas = set()
+        for resultado in self.busca_http.iterar_links_publicacoes():
+            urls_vistas.add(resultado['url'])
+            yield resultado
+        
+        if self.busca_http.paginacao_incompleta and self._periodo_pesquisado:
+            logger.warning("Paginação por HTTP incompleta, completando os resultados pelo navegador")
+            self._pesquisa_http = False
+            if self._pesquisar_periodo_navegador(*self._periodo_pesquisado):
+                for resultado in self._iterar_links_navegador():
+                    if resultado['url'] not in urls_vistas:
+                        urls_vistas.add(resultado['url'])
+                        yield resultado
+    
+    def _iterar_links_navegador(self):
+        """Gera os links das publicações percorrendo as páginas de resultados no navegador"""
         try:
             logger.info("Extraindo links das publicações...")
             
-            # Estrutura para armazenar URLs e snippets
-            resultado_links = []
-            base_url = "https://dje.tjsp.jus.br"
+            # URLs já geradas, para evitar duplicações
+            urls_vistas = set()
             
             # Processa todas as páginas de resultados
             pagina_atual = 1
@@ -329,40 +457,25 @@ class DJEScraper:
                                     match = re.search(r"popup\('([^']+)'\)", onclick)
                                     if match:
                                         caminho = match.group(1)
-                                        url_completa = base_url + caminho
+                                        url_completa = urljoin(DJE_URL_BASE + '/', caminho)
                                         
                                         # Busca o snippet de texto
                                         snippet_elem = linha.find_element(By.CLASS_NAME, "ementaClass2")
                                         snippet = snippet_elem.text.strip() if snippet_elem else ""
                                         
-                                        # Verifica palavras-chave no snippet
-                                        contem_rpv = re.search(r'\brpv\b', snippet, re.IGNORECASE) is not None
-                                        
-                                        # Busca por variações de "pagamento pelo INSS" no snippet
-                                        padroes_pagamento_inss = [
-                                            r'pagamento\s+pelo\s+inss',
-                                            r'inss\s+.{0,30}?\s+pagamento',
-                                            r'pagamento\s+.{0,30}?\s+inss',
-                                            r'inss\s+.{0,30}?\s+efetuar\s+.{0,10}?\s+pagamento',
-                                            r'inss\s+.{0,30}?\s+realizar\s+.{0,10}?\s+pagamento'
-                                        ]
-                                        
-                                        contem_pagamento_inss = False
-                                        for padrao in padroes_pagamento_inss:
-                                            if re.search(padrao, snippet, re.IGNORECASE):
-                                                contem_pagamento_inss = True
-                                                break
-                                                
-                                        # Adiciona à lista de resultados (evitando duplicações)
-                                        url_ja_existe = any(item['url'] == url_completa for item in resultado_links)
+                                        # Verifica palavras-chave no snippet (RPV e variações de "pagamento pelo INSS")
+                                        contem_rpv, contem_pagamento_inss = classificar_snippet(snippet)
                                         
-                                        if not url_ja_existe:
-                                            resultado_links.append({
+                                        # Gera o resultado (evitando duplicações)
+                                        if url_completa not in urls_vistas:
+                                            urls_vistas.add(url_completa)
+                                            yield {
                                                 'url': url_completa,
                                                 'snippet': snippet,
+                                                'data_disponibilizacao': ler_data_resultado(linha.text),
                                                 'contem_rpv': contem_rpv,
                                                 'contem_pagamento_inss': contem_pagamento_inss
-                                            })
+                                            }
                                             
                                             logger.info(f"URL extraída com snippet: {url_completa}")
                                             if contem_rpv and contem_pagamento_inss:
@@ -382,8 +495,10 @@ class DJEScraper:
                             links_paginacao[0].click()
                             logger.info(f"Navegando para a próxima página de resultados")
                             
-                            # Aguarda o carregamento da nova página
-                            time.sleep(5)
+                            # Aguarda a tabela de resultados atual ser substituída pela da nova página
+                            esperar(self.driver, EC.staleness_of(div_resultados), "troca da página de resultados")
+                            esperar(self.driver, EC.presence_of_element_located((By.ID, "divResultadosInferior")),
+                                    "resultados da nova página")
                             
                             # Incrementa o contador de páginas
                             pagina_atual += 1
@@ -412,18 +527,19 @@ class DJEScraper:
                                     match = re.search(r"popup\('([^']+)'\)", onclick)
                                     if match:
                                         caminho = match.group(1)
-                                        url_completa = base_url + caminho
+                                        url_completa = urljoin(DJE_URL_BASE + '/', caminho)
                                         
                                         # Tenta encontrar texto próximo ao link
                                         parent = link.find_element(By.XPATH, ".//..")
                                         snippet = parent.text if parent else ""
                                         
-                                        resultado_links.append({
+                                        urls_vistas.add(url_completa)
+                                        yield {
                                             'url': url_completa,
                                             'snippet': snippet,
                                             'contem_rpv': "rpv" in snippet.lower(),
                                             'contem_pagamento_inss': "pagamento" in snippet.lower() and "inss" in snippet.lower()
-                                        })
+                                        }
                                         
                                         logger.info(f"URL alternativa encontrada: {url_completa}")
                             except Exception as link_error:
@@ -433,12 +549,10 @@ class DJEScraper:
                     logger.error(f"Erro ao processar página {pagina_atual}: {e}")
                     tem_proxima_pagina = False
             
-            logger.info(f"Total de {len(resultado_links)} links com snippets extraídos de todas as páginas")
-            return resultado_links
+            logger.info(f"Total de {len(urls_vistas)} links com snippets extraídos de todas as páginas")
             
         except Exception as e:
             logger.error(f"Erro ao extrair links das publicações: {e}")
-            return []
     
     def salvar_html_pagina(self, nome_arquivo):
         """Função vazia para compatibilidade, não salva mais HTML"""
@@ -457,26 +571,35 @@ class DJEScraper:
             
             # ABORDAGEM 1: Sempre tentar primeiro baixar o PDF diretamente
             # Esta abordagem evita problemas com iframes e restrições de segurança
-            try:
-                # Construir a URL direta do PDF
-                # Exemplo: consultaSimples.do?cdVolume=19&nuDiario=4199&cdCaderno=12&nuSeqpagina=3572
-                # Para: getPaginaDoDiario.do?cdVolume=19&nuDiario=4199&cdCaderno=12&nuSeqpagina=3572
-                url_pdf = url_publicacao.replace("consultaSimples.do", "getPaginaDoDiario.do")
-                logger.info(f"URL direta para o PDF construída: {url_pdf}")
-                
-                # Baixa e extrai o PDF diretamente
-                texto_completo = self.baixar_e_extrair_pdf_direto(url_pdf)
-                
-                if texto_completo and len(texto_completo) > 50:
-                    logger.info(f"Texto extraído com sucesso do PDF via download direto ({len(texto_completo)} caracteres)")
-                    # Continua com o processamento
-                else:
-                    logger.warning("Não foi possível extrair texto do PDF via download direto")
-                    # Tenta o método alternativo
+            # Se o texto já foi obtido pelo download paralelo, reaproveita-o
+            texto_completo = publicacao_item.get('texto_pdf')
+            if texto_completo and len(texto_completo) > 50:
+                logger.info(f"Usando texto do PDF obtido pelo download paralelo ({len(texto_completo)} caracteres)")
+            else:
+                try:
+                    # Construir a URL direta do PDF
+                    # Exemplo: consultaSimples.do?cdVolume=19&nuDiario=4199&cdCaderno=12&nuSeqpagina=3572
+                    # Para: getPaginaDoDiario.do?cdVolume=19&nuDiario=4199&cdCaderno=12&nuSeqpagina=3572
+                    url_pdf = url_publicacao.replace("consultaSimples.do", "getPaginaDoDiario.do")
+                    logger.info(f"URL direta para o PDF construída: {url_pdf}")
+                    
+                    # Baixa e extrai o PDF diretamente (pelo fluxo de páginas, que evita baixar a mesma página duas vezes)
+                    chave_pagina = ChavePagina.de_url(url_publicacao)
+                    if chave_pagina:
+                        texto_completo = self.fluxo_paginas.texto(chave_pagina)
+                    else:
+                        texto_completo = self.baixar_e_extrair_pdf_direto(url_pdf)
+                    
+                    if texto_completo and len(texto_completo) > 50:
+                        logger.info(f"Texto extraído com sucesso do PDF via download direto ({len(texto_completo)} caracteres)")
+                        # Continua com o processamento
+                    else:
+                        logger.warning("Não foi possível extrair texto do PDF via download direto")
+                        # Tenta o método alternativo
+                        texto_completo = None
+                except Exception as e:
+                    logger.error(f"Erro ao baixar/extrair PDF diretamente: {e}")
                     texto_completo = None
-            except Exception as e:
-                logger.error(f"Erro ao baixar/extrair PDF diretamente: {e}")
-                texto_completo = None
             
             # Se não conseguiu extrair via download direto, tenta os métodos antigos
             if not texto_completo:
@@ -495,7 +618,7 @@ class DJEScraper:
                 if not texto_completo:
                     try:
                         self.driver.get(url_publicacao)
-                        time.sleep(3)  # Espera para carregar
+                        esperar_carregamento(self.driver, "carregamento da publicação")
                         
                         processos_validos = self.processar_pagina_completa()
                         if processos_validos:
@@ -535,70 +658,42 @@ class DJEScraper:
                     return None
             
             # Aqui temos o texto completo do PDF, agora vamos processá-lo
-            # Primeiro verificamos se há processos incompletos
-            tem_processo_incompleto = self.verificar_processo_incompleto(texto_completo)
+            # Divide o texto em processos numa única passada; o último pode estar aberto (incompleto)
+            segmentos = list(segmentar_processos(texto_completo))
+            segmento_aberto = segmentos[-1] if segmentos and segmentos[-1].aberto else None
             
             # Se houver processo incompleto, precisamos tentar acessar a próxima página
-            if tem_processo_incompleto:
+            if segmento_aberto:
                 logger.info("Detectado processo incompleto no texto. Tentando acessar a próxima página...")
                 
-                # Construir a URL da próxima página
-                # Extrair parâmetros da URL atual
-                params_match = re.search(r'cdVolume=(\d+)&nuDiario=(\d+)&cdCaderno=(\d+)&nuSeqpagina=(\d+)', url_publicacao)
+                # A próxima página vem do fluxo de páginas: da memória se já foi obtida
+                # (ex.: também é resultado da pesquisa), senão é baixada uma única vez
+                chave_pagina = ChavePagina.de_url(url_publicacao)
                 
-                if params_match:
-                    cd_volume = params_match.group(1)
-                    nu_diario = params_match.group(2)
-                    cd_caderno = params_match.group(3)
-                    nu_seqpagina = int(params_match.group(4))
-                    
-                    # Incrementa o número da página
-                    proxima_pagina = nu_seqpagina + 1
-                    
-                    # Constrói a URL da próxima página
-                    url_proxima = f"https://dje.tjsp.jus.br/cdje/consultaSimples.do?cdVolume={cd_volume}&nuDiario={nu_diario}&cdCaderno={cd_caderno}&nuSeqpagina={proxima_pagina}"
-                    logger.info(f"URL da próxima página: {url_proxima}")
-                    
-                    # Acessa a próxima página
+                if chave_pagina:
                     try:
-                        self.driver.get(url_proxima)
-                        time.sleep(3)  # Espera para carregar
-                        
-                        # Tenta extrair o PDF da próxima página
-                        url_pdf_proxima = url_proxima.replace("consultaSimples.do", "getPaginaDoDiario.do")
-                        texto_proxima_pagina = self.baixar_e_extrair_pdf_direto(url_pdf_proxima)
+                        chave_proxima, texto_proxima_pagina = self.fluxo_paginas.proxima(chave_pagina)
                         
                         if texto_proxima_pagina and len(texto_proxima_pagina) > 50:
-                            logger.info(f"Texto da próxima página extraído com sucesso ({len(texto_proxima_pagina)} caracteres)")
+                            logger.info(f"Texto da próxima página {tuple(chave_proxima)} disponível ({len(texto_proxima_pagina)} caracteres)")
                             
-                            # Extrai o último processo incompleto
-                            ultima_ocorrencia = texto_completo.rfind("Processo")
-                            if ultima_ocorrencia != -1:
-                                processo_incompleto = texto_completo[ultima_ocorrencia:]
+                            # Procura a continuação do processo incompleto na próxima página
+                            continuacao, primeiro_processo = separar_continuacao(texto_proxima_pagina)
+                            
+                            if continuacao is not None:
+                                # Concatena o processo incompleto com sua continuação
+                                # e adiciona o restante do texto da próxima página
+                                texto_completo += " " + continuacao + " " + texto_proxima_pagina[primeiro_processo:]
                                 
-                                # Procura a continuação na próxima página
-                                primeiro_processo = texto_proxima_pagina.find("Processo")
+                                # Só o trecho a partir do processo incompleto precisa ser segmentado de novo
+                                segmentos = segmentos[:-1] + list(segmentar_processos(texto_completo, segmento_aberto.inicio))
                                 
-                                if primeiro_processo > 0:
-                                    # Há conteúdo antes do primeiro "Processo" na próxima página
-                                    continuacao = texto_proxima_pagina[:primeiro_processo].strip()
-                                    
-                                    # Concatena o processo incompleto com sua continuação
-                                    processo_completo = processo_incompleto + " " + continuacao
-                                    
-                                    # Substitui o processo incompleto no texto original
-                                    texto_completo = texto_completo[:ultima_ocorrencia] + processo_completo
-                                    
-                                    # Adiciona o restante do texto da próxima página
-                                    texto_completo += " " + texto_proxima_pagina[primeiro_processo:]
-                                    
-                                    logger.info("Texto das duas páginas concatenado com sucesso")
+                                logger.info("Texto das duas páginas concatenado com sucesso")
                     except Exception as e:
-                        logger.error(f"Erro ao acessar próxima página: {e}")
+                        logger.error(f"Erro ao obter próxima página: {e}")
             
-            # Agora processa o texto completo (potencialmente concatenado de múltiplas páginas)
-            # Divide o texto em processos individuais
-            processos = re.findall(r'(Processo.*?ADV:.*?\(OAB.*?\))', texto_completo, re.DOTALL)
+            # Agora processa os processos do texto completo (potencialmente concatenado de múltiplas páginas)
+            processos = [segmento.texto for segmento in segmentos if not segmento.aberto]
             logger.info(f"Encontrados {len(processos)} processos no texto")
             
             if not processos:
@@ -606,10 +701,7 @@ class DJEScraper:
                 return None
             
             # Filtra os processos que contêm as palavras-chave
-            processos_validos = []
-            for processo in processos:
-                if "RPV" in processo and "pagamento pelo INSS" in processo:
-                    processos_validos.append(processo)
+            processos_validos = [processo for processo in processos if contem_palavras_chave(processo)]
             
             logger.info(f"Encontrados {len(processos_validos)} processos válidos com as palavras-chave")
             
@@ -636,423 +728,244 @@ class DJEScraper:
             logger.error(f"Erro ao processar publicação: {e}")
             return None
     
+    def _obter_cookies_navegador(self, renovar=False):
+        """
+        Retorna os cookies do navegador; se renovar, recarrega a página inicial antes.
+        Sem navegador aberto retorna None, e a sessão HTTP obtém os cookies sozinha.
+        """
+        if self._driver is None:
+            return None
+        if renovar:
+            self.driver.get(DJE_URL)
+            esperar_carregamento(self.driver, "carregamento da página inicial (cookies)")
+        return self.driver.get_cookies()
+    
+    def _obter_pool_extracao(self):
+        """Retorna o pool de processos da extração de texto, criando-o se necessário"""
+        if self.pool_extracao is None:
+            try:
+                self.pool_extracao = criar_pool_extracao()
+            except Exception as e:
+                logger.warning(f"Não foi possível criar o pool de extração, usando threads: {e}")
+        return self.pool_extracao
+    
     def baixar_e_extrair_pdf_direto(self, url_pdf):
         """Baixa e extrai texto de um PDF diretamente da URL"""
         try:
             logger.info(f"Baixando PDF diretamente da URL: {url_pdf}")
             
-            # Usar session com cookies do Selenium para manter autenticação
-            session = requests.Session()
-            
-            # Adiciona cookies do Selenium à sessão
-            cookies = self.driver.get_cookies()
-            if cookies:
-                logger.info(f"Adicionados {len(cookies)} cookies do Selenium à sessão")
-                for cookie in cookies:
-                    session.cookies.set(cookie['name'], cookie['value'])
-            
-            # Acessa a página inicial para garantir que temos todos os cookies
-            initial_response = session.get("https://dje.tjsp.jus.br/cdje/index.do")
-            logger.info("Acessada página inicial para obter cookies de sessão")
-            
-            # Faz a requisição para o PDF
-            logger.info("Fazendo requisição para o PDF...")
-            response = session.get(url_pdf, stream=True, timeout=30)
-            
-            # Verifica se o PDF foi baixado com sucesso
-            if response.status_code != 200:
-                logger.error(f"Erro ao baixar PDF: Status {response.status_code}")
+            # Usa o cache de páginas e a sessão HTTP compartilhada (cookies do Selenium já aplicados)
+            conteudo_pdf = self.baixador.baixar(url_pdf)
+            if not conteudo_pdf:
                 return None
             
-            # Verifica se o conteúdo é realmente um PDF
-            if not response.content.startswith(b'%PDF'):
-                # Se não for PDF, verifica se é uma página de erro ou login
-                if b'<html' in response.content[:100]:
-                    logger.error("Recebido HTML ao invés de PDF, possível erro de autenticação")
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    error_text = soup.get_text()
-                    logger.error(f"Texto do erro: {error_text[:200]}...")
-                    return None
-                else:
-                    logger.error("Conteúdo recebido não é PDF nem HTML")
-                    return None
-            
             logger.info("Conteúdo PDF válido recebido")
-            
-            # Salva o PDF temporariamente
-            with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as temp_file:
-                temp_path = temp_file.name
-                temp_file.write(response.content)
-            
-            logger.info(f"PDF salvo temporariamente em: {temp_path}")
-            
-            # Extrai o texto do PDF
-            try:
-                # Método 1: Usar PyPDF2
-                texto_completo = ""
-                with open(temp_path, 'rb') as file:
-                    reader = PyPDF2.PdfReader(file)
-                    num_paginas = len(reader.pages)
-                    
-                    logger.info(f"Extraindo texto de {num_paginas} páginas com PyPDF2")
-                    
-                    for i in range(num_paginas):
-                        page = reader.pages[i]
-                        texto_pagina = page.extract_text()
-                        
-                        if texto_pagina:
-                            texto_completo += texto_pagina + "\n\n"
-                    
-                    if texto_completo and len(texto_completo) > 50:
-                        logger.info(f"Texto extraído com PyPDF2: {len(texto_completo)} caracteres")
-                        
-                        # Limpeza do arquivo temporário
-                        try:
-                            os.unlink(temp_path)
-                        except Exception as e:
-                            logger.warning(f"Erro ao remover arquivo temporário: {e}")
-                            
-                        return texto_completo
-                    else:
-                        logger.warning("PyPDF2 extraiu texto insuficiente, tentando método alternativo")
-                
-                # Método 2: pdfminer.six (geralmente mais preciso, mas mais lento)
-                try:
-                    from pdfminer.high_level import extract_text
-                    
-                    logger.info("Tentando extrair texto com pdfminer.six")
-                    texto_pdfminer = extract_text(temp_path)
-                    
-                    if texto_pdfminer and len(texto_pdfminer) > 50:
-                        logger.info(f"Texto extraído com pdfminer.six: {len(texto_pdfminer)} caracteres")
-                        
-                        # Limpeza do arquivo temporário
-                        try:
-                            os.unlink(temp_path)
-                        except Exception as e:
-                            logger.warning(f"Erro ao remover arquivo temporário: {e}")
-                            
-                        return texto_pdfminer
-                    else:
-                        logger.warning("pdfminer.six extraiu texto insuficiente")
-                except ImportError:
-                    logger.warning("pdfminer.six não está instalado")
-                except Exception as e:
-                    logger.warning(f"Erro ao extrair texto com pdfminer.six: {e}")
-                
-                # Limpa o arquivo temporário se chegou aqui
-                try:
-                    os.unlink(temp_path)
-                except Exception as e:
-                    logger.warning(f"Erro ao remover arquivo temporário: {e}")
-                
-                # Se chegou aqui, nenhum método funcionou
-                logger.error("Não foi possível extrair texto do PDF")
-                return None
-                
-            except Exception as e:
-                logger.error(f"Erro ao processar o PDF: {e}")
-                
-                # Tenta limpar o arquivo temporário mesmo em caso de erro
-                try:
-                    os.unlink(temp_path)
-                except Exception as cleanup_error:
-                    logger.warning(f"Erro ao remover arquivo temporário: {cleanup_error}")
-                
-                return None
+            return self.extrair_texto_pdf_bytes(conteudo_pdf)
                 
         except Exception as e:
             logger.error(f"Erro ao baixar e extrair PDF direto: {e}")
             return None
     
-    def _extrair_dados_processo(self, processo_texto):
-        """Extrai todos os dados de um processo individual"""
+    def _obter_texto_pagina(self, chave):
+        """Obtém o texto de uma página do diário pela chave (usado pelo fluxo de páginas), extraído no pool de processos"""
         try:
-            # Cria um dicionário para armazenar os dados extraídos
-            dados_processo = {
-                'conteudo_completo': processo_texto,
-                'data_disponibilizacao': datetime.date.today().strftime("%Y-%m-%d")
-            }
-            
-            # Pré-processamento do texto para facilitar extração
-            texto_processado = processo_texto.replace('\n', ' ').replace('\r', ' ')
-            texto_processado = re.sub(r'\s+', ' ', texto_processado)
-            
-            # EXTRAÇÃO DO NÚMERO DO PROCESSO
-            numero_processo = None
-            
-            # Lista de padrões para encontrar o número do processo em diferentes formatos
-            padroes_processo = [
-                # Formato CNJ completo
-                r'\b(\d{7}-\d{2}\.\d{4}\.\d\.\d{2}\.\d{4})\b',
-                # Processo com formato específico
-                r'Processo\s+(\d+[-./]\d+[^-\s]*)',
-                # Outros formatos comuns
-                r'[Pp]rocesso\s+[Nn][º°]?\s*:\s*(\d{7}-\d{2}\.\d{4}\.\d\.\d{2}\.\d{4})',
-                r'[Pp]rocesso\s+[Nn][º°]?\s*[.:]\s*(\d{20})',
-                r'[Pp]rocesso\s+(\d{20})',
-                # Outros formatos comuns
-                r'[Pp]rocesso\s+[Nn][º°]?\s*[.:]\s*(\d+[-./]\d+[-./]\d+)',
-                r'[Pp]rocesso\s+[Nn][º°]?\s*[.:]\s*(\d+[-./]\d+)',
-                r'[Pp]rocesso\s+[Nn][º°]?\s*[.:]\s*(\d+)',
-                # Busca genérica
-                r'(?:Autos|Número|Numeração)[^:]*:\s*(\d+[-./]?\d*[-./]?\d*[-./]?\d*[-./]?\d*)',
-                # Busca por padrões em tabelas/formatação espaçada
-                r'Processo\s+[^\n]*?(\d{7}-\d{2}\.\d{4}\.\d\.\d{2}\.\d{4})',
-                r'\b(\d{7}-\d{2}\.\d{4}\.\d\.\d{2}\.\d{4})\b'
-            ]
-            
-            for padrao in padroes_processo:
-                processo_match = re.search(padrao, texto_processado)
-                if processo_match:
-                    numero_processo = processo_match.group(1).strip()
-                    # Remove possíveis pontos e traços extras
-                    numero_processo = re.sub(r'\s+', '', numero_processo)
-                    logger.info(f"Número do processo extraído: {numero_processo}")
-                    break
-            
-            dados_processo['numero_processo'] = numero_processo
-            
-            # EXTRAÇÃO DO AUTOR - REGRA: nome que antecede "- Vistos."
-            autor = None
+            conteudo_pdf = self.baixador.baixar(chave.url_pdf())
+            if not conteudo_pdf:
+                return None
             
-            # Padrão principal: o último nome antes de "- Vistos."
-            autor_match = re.search(r'(?:Permanent[e]|Espécie|Acidente|Fazenda Pública|Art\. 86|\))?\s*-\s*([^-]+?)\s+-\s+Vistos', texto_processado)
-            if autor_match:
-                autor = autor_match.group(1).strip()
-                logger.info(f"Autor extraído (antes de '- Vistos'): {autor}")
-            else:
-                # Tenta outro padrão comum em vários documentos - nome após o tipo do processo
-                padrao_tipo_processo = r'Processo\s+\d+[-./\d\s()]+(?: - [^-]+){1,3} - ([^-]+) -'
-                autor_match = re.search(padrao_tipo_processo, texto_processado)
-                if autor_match:
-                    autor = autor_match.group(1).strip()
-                    logger.info(f"Autor extraído (após tipo do processo): {autor}")
-                else:
-                    # Busca por padrões comuns de Auxílio-Acidente ou Benefícios em Espécie
-                    padroes_tipo_processo = [
-                        r'(?:Auxílio-Acidente|Benefícios em Espécie|Procedimento Comum)\s*\([^)]*\)\s*-\s*([^-]+?)\s*-\s*Vistos',
-                        r'(?:Auxílio-Acidente|Benefícios em Espécie|Incapacidade Laborativa)\s*(?:Permanent[e])?(?:\([^)]*\))?\s*-\s*([^-]+?)\s*-\s*Vistos',
-                        r'\([^)]*Art\.\s*86[^)]*\)\s*-\s*([^-]+?)\s*-\s*Vistos'
-                    ]
-                    
-                    for padrao in padroes_tipo_processo:
-                        autor_match = re.search(padrao, texto_processado, re.IGNORECASE)
-                        if autor_match:
-                            autor_extraido = autor_match.group(1).strip()
-                            if autor_extraido and len(autor_extraido) > 3 and not re.search(r'^(INSS|Instituto Nacional)', autor_extraido, re.IGNORECASE):
-                                autor = autor_extraido
-                                logger.info(f"Autor extraído (entre tipo e Vistos): {autor}")
-                                break
-            
-            # Verificação final para garantir que não pegou texto errado
-            if autor and (len(autor) > 50 or len(autor) < 3 or 
-                         re.search(r'outorgando poderes|advogado|advocacia|requisição|crédito|despacho|decisão', autor, re.IGNORECASE)):
-                autor = None
-                logger.warning("Autor extraído parece inválido, ignorando")
-                
-                # Tenta um último método mais simples
-                partes = texto_processado.split(' - ')
-                for i, parte in enumerate(partes):
-                    if i > 0 and i < len(partes)-1 and 'Vistos' in partes[i+1]:
-                        autor_candidato = parte.strip()
-                        if len(autor_candidato) > 3 and len(autor_candidato) < 50:
-                            autor = autor_candidato
-                            logger.info(f"Autor extraído (método simples): {autor}")
-                            break
-            
-            dados_processo['autor'] = autor
-            
-            # EXTRAÇÃO DO ADVOGADO - ABORDAGEM MELHORADA PARA MÚLTIPLOS ADVOGADOS
-            advogados_encontrados = []
-            
-            # Expressão regular para o formato "ADV: NOME (OAB NÚMERO/UF)" com captura da OAB
-            advogado_matches = re.finditer(r'ADV:\s+([^(]+)\s*(\(OAB [^)]+\))', texto_processado, re.IGNORECASE)
-            for match in advogado_matches:
-                nome_advogado = match.group(1).strip()
-                oab_texto = match.group(2).strip()
-                advogado_texto = f"{nome_advogado} {oab_texto}"
-                
-                # Processa o texto para tratar casos de múltiplos advogados
-                # Verifica se há vírgulas ou " E " no texto, indicando múltiplos advogados
-                if ',' in advogado_texto or ' E ' in advogado_texto.upper():
-                    # Divide por vírgula ou " E "
-                    adv_parts = re.split(r',\s*|\s+[eE]\s+', advogado_texto)
-                    for adv_part in adv_parts:
-                        adv_part = adv_part.strip()
-                        if adv_part and len(adv_part) > 3:
-                            # Limpa o texto
-                            adv_part = re.sub(r'\s+', ' ', adv_part).strip()
-                            # Evita duplicação
-                            if adv_part not in advogados_encontrados:
-                                advogados_encontrados.append(adv_part)
-                                logger.info(f"Advogado extraído (múltiplo): {adv_part}")
-                else:
-                    # Advogado único
-                    if advogado_texto and len(advogado_texto) > 3:
-                        # Limpa o texto extraído
-                        advogado_texto = re.sub(r'\s+', ' ', advogado_texto).strip()
-                        # Evita duplicação
-                        if advogado_texto not in advogados_encontrados:
-                            advogados_encontrados.append(advogado_texto)
-                            logger.info(f"Advogado extraído: {advogado_texto}")
-            
-            # Tenta uma expressão alternativa se não encontrou advogados
-            if not advogados_encontrados:
-                padrao_alternativo = r'- ADV:\s+([^(]+)\s*(\(OAB [^)]+\))'
-                advogado_matches = re.finditer(padrao_alternativo, texto_processado, re.IGNORECASE)
-                for match in advogado_matches:
-                    nome_advogado = match.group(1).strip()
-                    oab_texto = match.group(2).strip()
-                    advogado_texto = f"{nome_advogado} {oab_texto}"
-                    
-                    # Processa para múltiplos advogados
-                    if ',' in advogado_texto or ' E ' in advogado_texto.upper():
-                        adv_parts = re.split(r',\s*|\s+[eE]\s+', advogado_texto)
-                        for adv_part in adv_parts:
-                            adv_part = adv_part.strip()
-                            if adv_part and len(adv_part) > 3:
-                                adv_part = re.sub(r'\s+', ' ', adv_part).strip()
-                                if adv_part not in advogados_encontrados:
-                                    advogados_encontrados.append(adv_part)
-                                    logger.info(f"Advogado extraído (alt-múltiplo): {adv_part}")
-                    else:
-                        if advogado_texto and len(advogado_texto) > 3:
-                            advogado_texto = re.sub(r'\s+', ' ', advogado_texto).strip()
-                            if advogado_texto not in advogados_encontrados:
-                                advogados_encontrados.append(advogado_texto)
-                                logger.info(f"Advogado extraído (alt): {advogado_texto}")
-            
-            # Combina múltiplos advogados se encontrados
-            advogado = "; ".join(advogados_encontrados) if advogados_encontrados else None
-            dados_processo['advogado'] = advogado
-            
-            # EXTRAÇÃO DE VALORES MONETÁRIOS COM NOVAS REGRAS
-            
-            # Primeiro, procura por toda a seção de valores após "homologo os cálculos" até o final do parágrafo
-            secao_valores = None
-            valores_match = re.search(r'homologo os cálculos[^.]*correspondem ao[^R$]*(.+?)(?=\.\s*Os valores)', texto_processado, re.IGNORECASE | re.DOTALL)
-            if valores_match:
-                secao_valores = valores_match.group(1).strip()
-                logger.info(f"Seção de valores encontrada: {secao_valores}")
-            
-            # Valor principal
-            valor_principal = None
-            if secao_valores:
-                # Procura por "R$ X - principal bruto/líquido" na seção de valores
-                valor_match = re.search(r'R\$\s*([0-9.,]+)[^;,]*(?:principal\s*bruto(?:/líquido)?|bruto/líquido)', secao_valores, re.IGNORECASE)
-                if valor_match:
-                    valor_str = valor_match.group(1).strip()
-                    valor_str = self._limpar_valor_monetario(valor_str)
-                    valor_principal = float(valor_str) if valor_str else None
-                    logger.info(f"Valor principal bruto/líquido extraído: {valor_principal}")
-            
-            # Se não encontrou na seção específica, tenta no texto completo
-            if not valor_principal:
-                valor_match = re.search(r'R\$\s*([0-9.,]+)[^;,]*(?:principal\s*bruto(?:/líquido)?|bruto/líquido)', texto_processado, re.IGNORECASE)
-                if valor_match:
-                    valor_str = valor_match.group(1).strip()
-                    valor_str = self._limpar_valor_monetario(valor_str)
-                    valor_principal = float(valor_str) if valor_str else None
-                    logger.info(f"Valor principal bruto/líquido extraído (texto completo): {valor_principal}")
-            
-            # Renomeado para valor_principal para compatibilidade com o novo modelo
-            dados_processo['valor_principal'] = valor_principal
-            
-            # Valor dos juros moratórios
-            valor_juros_moratorios = None
-            if secao_valores:
-                # Primeiro verifica se contém "sem - juros moratórios"
-                if re.search(r'sem\s*-\s*juros\s*morat[óo]rios', secao_valores, re.IGNORECASE):
-                    logger.info("Sem juros moratórios mencionado na seção de valores")
-                else:
-                    # Procura por "R$ X - juros moratórios" na seção de valores
-                    valor_match = re.search(r'R\$\s*([0-9.,]+)[^;,]*(?:juros\s*morat[óo]rios)', secao_valores, re.IGNORECASE)
-                    if valor_match:
-                        valor_str = valor_match.group(1).strip()
-                        valor_str = self._limpar_valor_monetario(valor_str)
-                        valor_juros_moratorios = float(valor_str) if valor_str else None
-                        logger.info(f"Valor dos juros moratórios extraído: {valor_juros_moratorios}")
-            
-            # Se não encontrou na seção específica, tenta no texto completo
-            if valor_juros_moratorios is None:
-                if re.search(r'sem\s*-\s*juros\s*morat[óo]rios', texto_processado, re.IGNORECASE):
-                    logger.info("Sem juros moratórios mencionado no texto")
-                else:
-                    valor_match = re.search(r'R\$\s*([0-9.,]+)[^;,]*(?:juros\s*morat[óo]rios)', texto_processado, re.IGNORECASE)
-                    if valor_match:
-                        valor_str = valor_match.group(1).strip()
-                        valor_str = self._limpar_valor_monetario(valor_str)
-                        valor_juros_moratorios = float(valor_str) if valor_str else None
-                        logger.info(f"Valor dos juros moratórios extraído (texto completo): {valor_juros_moratorios}")
-            
-            dados_processo['valor_juros_moratorios'] = valor_juros_moratorios
-            
-            # Honorários advocatícios
-            honorarios_advocaticios = None
-            if secao_valores:
-                # Procura por "R$ X - honorários advocatícios" na seção de valores
-                valor_match = re.search(r'R\$\s*([0-9.,]+)[^;,]*(?:honor[áa]rios\s*advocat[íi]cios)', secao_valores, re.IGNORECASE)
-                if valor_match:
-                    valor_str = valor_match.group(1).strip()
-                    valor_str = self._limpar_valor_monetario(valor_str)
-                    honorarios_advocaticios = float(valor_str) if valor_str else None
-                    logger.info(f"Valor dos honorários advocatícios extraído: {honorarios_advocaticios}")
-            
-            # Se não encontrou na seção específica, tenta no texto completo
-            if not honorarios_advocaticios:
-                valor_match = re.search(r'R\$\s*([0-9.,]+)[^;,]*(?:honor[áa]rios\s*advocat[íi]cios)', texto_processado, re.IGNORECASE)
-                if valor_match:
-                    valor_str = valor_match.group(1).strip()
-                    valor_str = self._limpar_valor_monetario(valor_str)
-                    honorarios_advocaticios = float(valor_str) if valor_str else None
-                    logger.info(f"Valor dos honorários advocatícios extraído (texto completo): {honorarios_advocaticios}")
-            
-            dados_processo['honorarios_advocaticios'] = honorarios_advocaticios
+            pool_extracao = self._obter_pool_extracao()
+            if not pool_extracao:
+                return self.extrair_texto_pdf_bytes(conteudo_pdf)
             
+            resultado = pool_extracao.submit(extrair_texto_pagina, conteudo_pdf).result()
+            estatisticas_extratores.registrar(resultado.medicoes)
+            return resultado.texto
+        
+        except Exception as e:
+            logger.error(f"Erro ao obter a página {tuple(chave)}: {e}")
+            return None
+    
+    def extrair_texto_pdf_bytes(self, conteudo_pdf):
+        """Extrai o texto de um PDF já baixado, direto da memória (sem arquivos temporários)"""
+        try:
+            return extrair_texto_pdf(conteudo_pdf, minimo_caracteres=50)
+        except Exception as e:
+            logger.error(f"Erro ao extrair texto do PDF: {e}")
+            return None
+    
+    def _extrair_dados_processo(self, processo_texto):
+        """Extrai todos os dados de um processo individual (ver extracao_campos.extrair_campos_processo)"""
+        try:
+            dados_processo = extrair_campos_processo(processo_texto)
+            logger.info(f"Dados extraídos do processo {dados_processo['numero_processo']}: "
+                        f"autor={dados_processo['autor']}, advogado={dados_processo['advogado']}")
             return dados_processo
             
         except Exception as e:
             logger.error(f"Erro ao extrair dados do processo: {e}")
             return None
     
-    def _limpar_valor_monetario(self, valor_str):
+    def extrair_lote(self, segmentos):
         """
-        Função auxiliar para limpar e formatar valores monetários.
-        Remove R$, espaços e formata corretamente para conversão para float.
+        Extrai os dados de vários processos de uma vez (textos ou segmentos de segmentar_processos).
+        Retorna colunas alinhadas com a entrada: numero_processo, autor, advogado e os três
+        valores monetários em Decimal (ver extracao_campos.extrair_campos_lote).
         """
-        if not valor_str:
+        try:
+            return extrair_campos_lote(segmentos)
+        except Exception as e:
+            logger.error(f"Erro na extração em lote: {e}")
             return None
+    
+    def pesquisar_periodo(self, data_inicial, data_final):
+        """
+        Pesquisa o período na consulta avançada: primeiro direto por HTTP, sem navegador; se falhar,
+        preenche e submete o formulário no navegador. Retorna True se a pesquisa foi executada (com ou sem resultados).
+        """
+        self._periodo_pesquisado = (data_inicial, data_final)
+        self._pesquisa_http = bool(self.busca_http) and self.busca_http.pesquisar(data_inicial, data_final)
+        if self._pesquisa_http:
+            return True
+        
+        if self.busca_http:
+            logger.warning("Pesquisa por HTTP falhou, usando o formulário no navegador")
+        return self._pesquisar_periodo_navegador(data_inicial, data_final)
+    
+    def _pesquisar_periodo_navegador(self, data_inicial, data_final):
+        """Preenche e submete o formulário de consulta avançada no navegador"""
+        # Acessa a página de consulta avançada
+        if not self.acessar_consulta_avancada():
+            logger.error("Falha ao acessar a página de consulta avançada")
+            return False
+        
+        # Usa palavras-chave específicas para encontrar publicações relevantes
+        palavras_chave_especificas = '"RPV" e "pagamento pelo INSS"'
+        
+        # Tenta preencher o formulário usando a abordagem JavaScript
+        if not self.preencher_formulario_javascript(data_inicial, data_final):
+            logger.warning("Falha ao preencher o formulário via JavaScript. Tentando método tradicional...")
+            
+            # Se falhar com JavaScript, tenta o método tradicional
+            if not self.selecionar_datas(data_inicial, data_final):
+                logger.error("Falha ao preencher datas")
+                return False
+            
+            if not self.selecionar_caderno(CADERNO):
+                logger.error("Falha ao selecionar caderno")
+                return False
             
-        # Remove caracteres não numéricos, exceto pontos e vírgulas
-        valor_str = re.sub(r'[^\d,.]', '', valor_str)
+            if not self.preencher_palavras_chave(palavras_chave_especificas):
+                logger.error("Falha ao preencher palavras-chave")
+                return False
+        
+        # Tenta submeter o formulário usando JavaScript
+        if not self.submeter_formulario_javascript():
+            logger.warning("Falha ao submeter o formulário via JavaScript. Tentando método tradicional...")
+            
+            # Se falhar, tenta o método tradicional
+            if not self.executar_pesquisa():
+                logger.error("Falha ao executar pesquisa")
+                return False
+        
+        return True
+    
+    def contar_resultados(self):
+        """
+        Lê o total de resultados informado na primeira página de resultados da pesquisa
+        (ex.: "Resultados 1 a 10 de 153"). Retorna None se o total não puder ser identificado.
+        """
+        if self._pesquisa_http:
+            return self.busca_http.contar_resultados()
         
-        # Tratamento para diferentes formatos de números (1.234,56 ou 1234,56 ou 1,234.56)
         try:
-            # Formato brasileiro (1.234,56)
-            if ',' in valor_str and '.' in valor_str and valor_str.rindex('.') < valor_str.rindex(','):
-                valor_str = valor_str.replace('.', '').replace(',', '.')
-            # Formato com vírgula como decimal (1234,56)
-            elif ',' in valor_str and '.' not in valor_str:
-                valor_str = valor_str.replace(',', '.')
-                
-            return valor_str
+            total = ler_total_resultados(self.driver.find_element(By.TAG_NAME, "body").text)
+            if total is None:
+                logger.warning("Total de resultados da pesquisa não identificado")
+            return total
         except Exception as e:
-            logger.warning(f"Erro ao limpar valor monetário '{valor_str}': {e}")
+            logger.warning(f"Erro ao contar resultados da pesquisa: {e}")
             return None
     
-    # Método antigo removido, substituído pelo _limpar_valor_monetario
+    def _descobrir_publicacoes(self, execucao_id=None):
+        """
+        Gera os itens do pipeline a partir dos links da pesquisa, registrando cada um no diário de execução.
+        Numa execução retomada antes do fim da descoberta, links já salvos são pulados e os pendentes
+        continuam da etapa registrada.
+        """
+        diario = self.diario_execucao if execucao_id is not None else None
+        persistidas = diario.persistidas(execucao_id) if diario else set()
+        pendentes = {item['url']: item for item in diario.pendentes(execucao_id)} if diario else {}
+        total = 0
+        
+        for resultado in self.iterar_links_publicacoes():
+            total += 1
+            url_publicacao = resultado['url']
+            if url_publicacao in persistidas:
+                continue
+            if url_publicacao in pendentes:
+                yield pendentes[url_publicacao]
+                continue
+            
+            if diario:
+                diario.registrar_descoberta(execucao_id, [resultado])
+            yield {'url': url_publicacao, 'snippet': resultado.get('snippet', ''),
+                   'data_disponibilizacao': resultado.get('data_disponibilizacao'), 'etapa': ETAPA_DESCOBERTA}
+        
+        if diario:
+            diario.concluir_descoberta(execucao_id)
+        logger.info(f"Encontrados {total} links de publicações")
+    
+    def executar_periodo(self, data_inicial, data_final, limite_resultados=None, data_disponibilizacao=None):
+        """
+        Pesquisa, processa e salva as publicações do período pelo pipeline de publicações, registrando
+        o andamento no diário de execução. Se a execução anterior do mesmo período foi interrompida depois
+        da descoberta, pula a pesquisa e continua apenas o trabalho pendente. Com `limite_resultados`,
+        uma pesquisa com mais resultados que o limite não é processada e o retorno vem com 'excedeu_limite'.
+        Retorna um dicionário com 'publicacoes', 'salvas', 'total_resultados' e 'excedeu_limite',
+        ou None se a pesquisa falhar.
+        """
+        resultado = {'publicacoes': [], 'salvas': 0, 'total_resultados': None, 'excedeu_limite': False}
+        diario = self.diario_execucao
+        
+        execucao = diario.retomar_execucao(data_inicial, data_final) if diario else None
+        execucao_id = execucao[0] if execucao else None
+        
+        if execucao and execucao[1]:
+            itens = diario.pendentes(execucao_id)
+            logger.info(f"Retomando execução interrompida de {data_inicial.strftime('%d/%m/%Y')} a "
+                        f"{data_final.strftime('%d/%m/%Y')}: {len(itens)} publicações pendentes")
+        else:
+            if not self.pesquisar_periodo(data_inicial, data_final):
+                return None
+            
+            if limite_resultados is not None:
+                resultado['total_resultados'] = self.contar_resultados()
+                if resultado['total_resultados'] is not None and resultado['total_resultados'] > limite_resultados:
+                    resultado['excedeu_limite'] = True
+                    return resultado
+            
+            if diario and execucao_id is None:
+                execucao_id = diario.iniciar_execucao(data_inicial, data_final)
+            
+            # Os links são processados à medida que as páginas de resultados são percorridas
+            itens = self._descobrir_publicacoes(execucao_id)
+        
+        pipeline = PipelinePublicacoes(self, execucao_id, data_disponibilizacao, janela=(data_inicial, data_final))
+        banco_disponivel = pipeline.executar(itens)
+        resultado['publicacoes'] = pipeline.publicacoes
+        resultado['salvas'] = pipeline.salvas
+        
+        # Sem conexão com o banco, a execução fica aberta para ser retomada
+        if execucao_id is not None and banco_disponivel:
+            diario.concluir_execucao(execucao_id)
+        
+        return resultado
     
     def buscar_publicacoes(self, primeira_execucao=False):
         """Realiza a busca de publicações no DJE"""
         publicacoes = []
         
         try:
-            # Acessa a página de consulta avançada
-            if not self.acessar_consulta_avancada():
-                logger.error("Falha ao acessar a página de consulta avançada")
-                return publicacoes
-            
             # Define o período de busca
             hoje = datetime.date.today()
             
@@ -1072,128 +985,9 @@ class DJEScraper:
                 logger.info(f"Hoje é fim de semana ({hoje.strftime('%d/%m/%Y')}). Pulando execução.")
                 return publicacoes
             
-            # Usa palavras-chave específicas para encontrar publicações relevantes
-            palavras_chave_especificas = '"RPV" e "pagamento pelo INSS"'
-            
-            # Tenta preencher o formulário usando a abordagem JavaScript
-            if not self.preencher_formulario_javascript(data_inicial, data_final):
-                logger.warning("Falha ao preencher o formulário via JavaScript. Tentando método tradicional...")
-                
-                # Se falhar com JavaScript, tenta o método tradicional
-                if not self.selecionar_datas(data_inicial, data_final):
-                    logger.error("Falha ao preencher datas")
-                    return publicacoes
-                
-                if not self.selecionar_caderno(CADERNO):
-                    logger.error("Falha ao selecionar caderno")
-                    return publicacoes
-                
-                if not self.preencher_palavras_chave(palavras_chave_especificas):
-                    logger.error("Falha ao preencher palavras-chave")
-                    return publicacoes
-            
-            # Tenta submeter o formulário usando JavaScript
-            if not self.submeter_formulario_javascript():
-                logger.warning("Falha ao submeter o formulário via JavaScript. Tentando método tradicional...")
-                
-                # Se falhar, tenta o método tradicional
-                if not self.executar_pesquisa():
-                    logger.error("Falha ao executar pesquisa")
-                    return publicacoes
-            
-            # Extrai os links das publicações encontradas com seus snippets
-            resultados_publicacoes = self.extrair_links_publicacoes()
-            logger.info(f"Encontrados {len(resultados_publicacoes)} links de publicações")
-            
-            # Processa cada publicação para extrair os dados
-            for idx, resultado in enumerate(resultados_publicacoes):
-                logger.info(f"Processando publicação {idx + 1} de {len(resultados_publicacoes)}: {resultado['url']}")
-                
-                try:
-                    # Preparar o item para processamento
-                    publicacao_item = {
-                        'url': resultado['url'],
-                        'snippet': resultado.get('snippet', '')
-                    }
-                    
-                    # Processa a publicação para extrair dados
-                    dados_publicacao = self.processar_publicacao(publicacao_item)
-                    
-                    if dados_publicacao:
-                        # Verifica se o resultado é uma lista ou um único dicionário
-                        if isinstance(dados_publicacao, list):
-                            # Se for uma lista, adiciona cada processo individualmente
-                            for processo in dados_publicacao:
-                                publicacoes.append(processo)
-                                logger.info(f"Processo adicionado com sucesso: Processo {processo.get('numero_processo', 'N/A')}")
-                        else:
-                            # Se for um único dicionário, adiciona normalmente
-                            publicacoes.append(dados_publicacao)
-                            logger.info(f"Publicação {idx + 1} adicionada com sucesso: Processo {dados_publicacao.get('numero_processo', 'N/A')}")
-                    else:
-                        logger.warning(f"Não foi possível extrair dados da publicação {idx + 1}")
-                        
-                except Exception as e:
-                    logger.error(f"Erro ao processar publicação {idx + 1}: {e}")
-            
-            logger.info(f"Total de {len(publicacoes)} publicações processadas e prontas para salvar no banco")
-            
-            # Salva todas as publicações com uma única conexão ao banco
-            if publicacoes:
-                # Importa a função de conexão com o banco
-                from database import Database
-                
-                # Conecta ao banco de dados uma única vez
-                logger.info(f"Conectando ao banco de dados para salvar {len(publicacoes)} publicações...")
-                db = Database()
-                
-                # Verifica se a conexão foi estabelecida
-                if not db.conn:
-                    logger.error("Não foi possível conectar ao banco de dados. Nenhuma publicação será salva.")
-                    return publicacoes
-                
-                # Limpa conexões ociosas em transação antes de iniciar
-                conexoes_limpas = db.limpar_conexoes_ociosas()
-                if conexoes_limpas > 0:
-                    logger.info(f"Foram limpas {conexoes_limpas} conexões ociosas antes de iniciar as inserções")
-                
-                publicacoes_salvas = 0
-                
-                # Usa tratamento de erro para todo o lote de inserções
-                try:
-                    for publicacao in publicacoes:
-                        try:
-                            # Prepara os dados para inserção
-                            valores = {
-                                'numero_processo': publicacao.get('numero_processo'),
-                                'data_disponibilizacao': publicacao.get('data_disponibilizacao'),
-                                'autor': publicacao.get('autor'),
-                                'reu': publicacao.get('reu', 'Instituto Nacional do Seguro Social - INSS'),
-                                'advogado': publicacao.get('advogado'),
-                                'valor_principal': publicacao.get('valor_principal'),
-                                'valor_juros_moratorios': publicacao.get('valor_juros_moratorios'),
-                                'honorarios_advocaticios': publicacao.get('honorarios_advocaticios'),
-                                'conteudo_completo': publicacao.get('conteudo_completo')
-                            }
-                            
-                            # Insere os dados na tabela publicacoes
-                            id_publicacao = db.inserir_publicacao(valores)
-                            
-                            if id_publicacao:
-                                publicacoes_salvas += 1
-                                logger.info(f"Publicação inserida com sucesso: ID {id_publicacao}")
-                                
-                        except Exception as e:
-                            logger.error(f"Erro ao inserir publicação no banco (processo {publicacao.get('numero_processo')}): {e}")
-                    
-                    logger.info(f"Salvas {publicacoes_salvas} de {len(publicacoes)} publicações no banco de dados")
-                except Exception as e:
-                    logger.error(f"Erro durante o processamento em lote de publicações: {e}")
-                finally:
-                    # Limpa conexões ociosas novamente ao finalizar
-                    db.limpar_conexoes_ociosas()
-                    # Fecha a conexão com o banco
-                    db.fechar_conexao()
+            resultado = self.executar_periodo(data_inicial, data_final)
+            if resultado:
+                publicacoes = resultado['publicacoes']
         
         except Exception as e:
             logger.error(f"Erro durante a busca de publicações: {e}")
@@ -1217,7 +1011,7 @@ class DJEScraper:
             
             // Seleciona o caderno
             var selectCaderno = document.getElementsByName('dadosConsulta.cdCaderno')[0];
-            selectCaderno.value = '12';
+            selectCaderno.value = arguments[3];
             
             // Dispara evento de mudança para garantir que o valor seja aplicado
             var event = new Event('change', { bubbles: true });
@@ -1230,14 +1024,14 @@ class DJEScraper:
             return (
                 document.getElementsByName('dadosConsulta.dtInicio')[0].value === arguments[0] &&
                 document.getElementsByName('dadosConsulta.dtFim')[0].value === arguments[1] &&
-                document.getElementsByName('dadosConsulta.cdCaderno')[0].value === '12' &&
+                document.getElementsByName('dadosConsulta.cdCaderno')[0].value === arguments[3] &&
                 document.getElementsByName('dadosConsulta.pesquisaLivre')[0].value === arguments[2]
             );
             """
             
             # Executa o script JavaScript
-            palavras_str = '"RPV" e "pagamento pelo INSS"'
-            resultado = self.driver.execute_script(script, data_inicial_str, data_final_str, palavras_str)
+            palavras_str = PESQUISA_LIVRE
+            resultado = self.driver.execute_script(script, data_inicial_str, data_final_str, palavras_str, CODIGO_CADERNO)
             
             # Verifica se o script foi bem-sucedido
             if resultado:
@@ -1281,8 +1075,8 @@ class DJEScraper:
             if resultado:
                 logger.info("Formulário submetido com sucesso via JavaScript")
                 
-                # Espera um tempo para o resultado da pesquisa
-                time.sleep(10)
+                # Aguarda a página de resultados
+                self._esperar_resultados_pesquisa()
                 
                 return True
             else:
@@ -1299,7 +1093,7 @@ class DJEScraper:
             # Acessa a página da publicação
             logger.info(f"Acessando página de publicação: {url_publicacao}")
             self.driver.get(url_publicacao)
-            time.sleep(2)
+            esperar_carregamento(self.driver, "carregamento da publicação")
             
             # Verifica o padrão de URL do TJSP e extrai os parâmetros
             padrao_url_tjsp = re.compile(r'cdVolume=(\d+)&nuDiario=(\d+)&cdCaderno=(\d+)&nuSeqpagina=(\d+)')
@@ -1313,7 +1107,7 @@ class DJEScraper:
                 nu_seqpagina = match_params.group(4)
                 
                 # Constrói a URL direta para o PDF usando o padrão getPaginaDoDiario.do
-                pdf_url = f"https://dje.tjsp.jus.br/cdje/getPaginaDoDiario.do?cdVolume={cd_volume}&nuDiario={nu_diario}&cdCaderno={cd_caderno}&nuSeqpagina={nu_seqpagina}"
+                pdf_url = f"{DJE_URL_BASE}/getPaginaDoDiario.do?cdVolume={cd_volume}&nuDiario={nu_diario}&cdCaderno={cd_caderno}&nuSeqpagina={nu_seqpagina}"
                 logger.info(f"URL direta para o PDF construída: {pdf_url}")
                 
                 # Baixa e extrai o texto do PDF diretamente
@@ -1367,7 +1161,7 @@ class DJEScraper:
                             # Busca no HTML por URLs de PDF
                             frame_url_match = re.search(r'getPaginaDoDiario\.do\?[^"\'<>]+', frame_html)
                             if frame_url_match:
-                                iframe_src = "https://dje.tjsp.jus.br/cdje/" + frame_url_match.group(0)
+                                iframe_src = f"{DJE_URL_BASE}/" + frame_url_match.group(0)
                                 logger.info(f"URL do PDF extraída do HTML do frame: {iframe_src}")
                             
                             # Volta para o contexto principal
@@ -1392,7 +1186,7 @@ class DJEScraper:
                     # Tenta outro padrão para o frame
                     frame_match = re.search(r'getPaginaDoDiario\.do\?[^\'"\s&<>]+', html)
                     if frame_match:
-                        iframe_src = "https://dje.tjsp.jus.br/cdje/" + frame_match.group(0)
+                        iframe_src = f"{DJE_URL_BASE}/" + frame_match.group(0)
                         logger.info(f"URL do frame extraída do HTML via regex simples: {iframe_src}")
                     else:
                         # Procura pelo src do frame no document principal
@@ -1415,7 +1209,7 @@ class DJEScraper:
                 # Se falhou a extração direta do PDF, tenta navegar até a URL e extrair o conteúdo
                 logger.info(f"Acessando URL do iframe: {iframe_src}")
                 self.driver.get(iframe_src)
-                time.sleep(3)  # Espera para carregar o conteúdo
+                esperar_carregamento(self.driver, "carregamento do iframe da publicação")
                 
                 # Verifica se há um PDF incorporado na página
                 pdf_embeds = self.driver.find_elements(By.CSS_SELECTOR, "embed[type='application/pdf'], object[type='application/pdf']")
@@ -1519,183 +1313,27 @@ class DJEScraper:
         Método otimizado para o caso específico do TJSP.
         """
         try:
-            import io
-            import requests
-            import tempfile
-            import os
-            from PyPDF2 import PdfReader
-            
             logger.info(f"Baixando PDF diretamente da URL: {pdf_url}")
             
-            # Adiciona headers para simular um navegador real (importante para alguns sites)
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Accept': 'application/pdf,*/*',
-                'Accept-Language': 'pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7',
-                'Connection': 'keep-alive',
-                'Referer': 'https://dje.tjsp.jus.br/'
-            }
-            
-            # Cria uma sessão para manter cookies e outras informações
-            session = requests.Session()
-            
-            # Adiciona os headers à sessão
-            session.headers.update(headers)
-            
-            # Tenta extrair cookies do Selenium e adicioná-los à sessão
-            try:
-                selenium_cookies = self.driver.get_cookies()
-                for cookie in selenium_cookies:
-                    session.cookies.set(cookie['name'], cookie['value'], domain=cookie['domain'])
-                logger.info(f"Adicionados {len(selenium_cookies)} cookies do Selenium à sessão")
-            except Exception as e:
-                logger.warning(f"Erro ao extrair cookies do Selenium: {e}")
-            
-            # Primeiro acessa a página principal para obter cookies de sessão
-            try:
-                session.get("https://dje.tjsp.jus.br/cdje/index.do", timeout=10)
-                logger.info("Acessada página inicial para obter cookies de sessão")
-            except Exception as e:
-                logger.warning(f"Erro ao acessar página inicial: {e}")
-            
-            # Agora tenta baixar o PDF
+            # Consulta o cache de páginas e, se preciso, usa a sessão HTTP compartilhada;
+            # ela renova os cookies pelo Selenium se o servidor devolver HTML no lugar do PDF
             try:
                 logger.info("Fazendo requisição para o PDF...")
-                response = session.get(pdf_url, timeout=30)
-                response.raise_for_status()  # Levanta exceção se o status não for 200
-                
-                # Verifica se o conteúdo realmente é um PDF
-                if response.content.startswith(b'%PDF'):
-                    logger.info("Conteúdo PDF válido recebido")
-                else:
-                    logger.warning("O conteúdo baixado não parece ser um PDF válido")
-                    # Verifica se é redirecionamento ou erro
-                    if b'<html' in response.content[:100]:
-                        logger.warning("O conteúdo parece ser HTML em vez de PDF")
-                        
-                        # Tenta acessar a página novamente pelo Selenium e então tentar o download
-                        try:
-                            self.driver.get(pdf_url)
-                            time.sleep(3)
-                            selenium_cookies = self.driver.get_cookies()
-                            
-                            # Reinicia a sessão com novos cookies
-                            session = requests.Session()
-                            session.headers.update(headers)
-                            
-                            for cookie in selenium_cookies:
-                                session.cookies.set(cookie['name'], cookie['value'], domain=cookie.get('domain', ''))
-                            
-                            # Tenta o download novamente
-                            logger.info("Tentando download novamente com cookies atualizados...")
-                            response = session.get(pdf_url, timeout=30)
-                            response.raise_for_status()
-                            
-                            if not response.content.startswith(b'%PDF'):
-                                logger.error("Falha na segunda tentativa de download")
-                                return None
-                        except Exception as e:
-                            logger.error(f"Erro na tentativa de obter novos cookies: {e}")
-                            return None
+                conteudo_pdf = self.baixador.baixar(pdf_url)
+                if not conteudo_pdf:
+                    logger.error("Falha ao obter o PDF")
+                    return None
+                logger.info("Conteúdo PDF válido recebido")
             except requests.exceptions.RequestException as e:
                 logger.error(f"Erro na requisição HTTP: {e}")
                 return None
             
-            # Salva o PDF em um arquivo temporário (útil para pdfminer que prefere arquivos)
-            with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as temp_file:
-                temp_path = temp_file.name
-                temp_file.write(response.content)
-                logger.info(f"PDF salvo temporariamente em: {temp_path}")
-            
-            texto_completo = ""
-            
-            # Tenta diferentes métodos de extração, começando pelo PyPDF2
-            try:
-                # Método 1: PyPDF2
-                with open(temp_path, 'rb') as file:
-                    reader = PdfReader(file)
-                    num_paginas = len(reader.pages)
-                    
-                    logger.info(f"Extraindo texto de {num_paginas} páginas com PyPDF2")
-                    
-                    for i in range(num_paginas):
-                        page = reader.pages[i]
-                        texto_pagina = page.extract_text()
-                        
-                        if texto_pagina:
-                            texto_completo += texto_pagina + "\n\n"
-                    
-                    if texto_completo and len(texto_completo) > 100:
-                        logger.info(f"Texto extraído com PyPDF2: {len(texto_completo)} caracteres")
-                        
-                        # Limpeza do arquivo temporário
-                        try:
-                            os.unlink(temp_path)
-                        except Exception as e:
-                            logger.warning(f"Erro ao remover arquivo temporário: {e}")
-                            
-                        return texto_completo
-                    else:
-                        logger.warning("PyPDF2 extraiu texto insuficiente, tentando método alternativo")
-            except Exception as e:
-                logger.warning(f"Erro ao extrair texto com PyPDF2: {e}")
-            
-            # Método 2: pdfminer.six (geralmente mais preciso, mas mais lento)
-            try:
-                from pdfminer.high_level import extract_text
-                
-                logger.info("Tentando extrair texto com pdfminer.six")
-                texto_pdfminer = extract_text(temp_path)
-                
-                if texto_pdfminer and len(texto_pdfminer) > 100:
-                    logger.info(f"Texto extraído com pdfminer.six: {len(texto_pdfminer)} caracteres")
-                    
-                    # Limpeza do arquivo temporário
-                    os.unlink(temp_path)
-                    return texto_pdfminer
-                else:
-                    logger.warning("pdfminer.six extraiu texto insuficiente")
-            except Exception as e:
-                logger.warning(f"Erro ao extrair texto com pdfminer.six: {e}")
-            
-            # Método 3: último recurso - OCR via Tesseract se disponível
-            try:
-                import pytesseract
-                from PIL import Image
-                from pdf2image import convert_from_path
-                
-                logger.info("Tentando extrair texto via OCR (Tesseract)")
-                
-                # Converte PDF para imagens
-                images = convert_from_path(temp_path)
-                
-                texto_ocr = ""
-                for i, image in enumerate(images):
-                    logger.info(f"Processando página {i+1} com OCR")
-                    texto_pagina = pytesseract.image_to_string(image, lang='por')
-                    texto_ocr += texto_pagina + "\n\n"
-                
-                if texto_ocr and len(texto_ocr) > 100:
-                    logger.info(f"Texto extraído via OCR: {len(texto_ocr)} caracteres")
-                    
-                    # Limpeza do arquivo temporário
-                    os.unlink(temp_path)
-                    return texto_ocr
-            except ImportError:
-                logger.warning("OCR não disponível (pytesseract/pdf2image não instalados)")
-            except Exception as e:
-                logger.warning(f"Erro ao extrair texto via OCR: {e}")
-            
-            # Limpeza do arquivo temporário
-            try:
-                os.unlink(temp_path)
-                logger.info("Arquivo temporário removido")
-            except Exception as e:
-                logger.warning(f"Erro ao remover arquivo temporário: {e}")
-            
-            # Se chegou aqui, nenhum método funcionou
-            logger.error("Todos os métodos de extração de texto do PDF falharam")
-            return None
+            # Extrai o texto direto da memória com os motores configurados e, por último, OCR
+            ordem = ORDEM_EXTRATORES if 'ocr' in ORDEM_EXTRATORES else ORDEM_EXTRATORES + ['ocr']
+            texto_completo = extrair_texto_pdf(conteudo_pdf, minimo_caracteres=100, ordem=ordem)
+            if not texto_completo:
+                logger.error("Todos os métodos de extração de texto do PDF falharam")
+            return texto_completo
             
         except Exception as e:
             logger.error(f"Erro ao baixar e processar o PDF: {e}")
@@ -1709,7 +1347,7 @@ class DJEScraper:
         try:
             logger.info(f"Tentando acessar bottomFrame com PDF em: {url_publicacao}")
             self.driver.get(url_publicacao)
-            time.sleep(3)
+            esperar_carregamento(self.driver, "carregamento da publicação")
             
             # Localiza o frame bottomFrame
             bottom_frame = None
@@ -1728,7 +1366,7 @@ class DJEScraper:
                 try:
                     self.driver.switch_to.frame(bottom_frame)
                     logger.info("Alternou para o bottomFrame")
-                    time.sleep(2)
+                    esperar_carregamento(self.driver, "carregamento do bottomFrame")
                     
                     # Procura por elementos de PDF no frame
                     pdf_embeds = self.driver.find_elements(By.CSS_SELECTOR, "embed[type='application/pdf']")
@@ -1754,18 +1392,16 @@ class DJEScraper:
                                 # Clica no elemento para focar
                                 actions = ActionChains(self.driver)
                                 actions.move_to_element(pdf_embed).click().perform()
-                                time.sleep(1)
                                 
                                 # Simula Ctrl+A para selecionar todo o texto
                                 actions.key_down(Keys.CONTROL).send_keys('a').key_up(Keys.CONTROL).perform()
-                                time.sleep(1)
                                 
-                                # Tenta obter o texto selecionado
-                                texto_selecionado = self.driver.execute_script("return window.getSelection().toString();")
+                                # Aguarda a seleção e obtém o texto selecionado
+                                selecao = esperar(self.driver, texto_selecionado, "seleção do texto do PDF", ESPERA_TIMEOUT_CURTO)
                                 
-                                if texto_selecionado and len(texto_selecionado) > 10:
-                                    logger.info(f"Texto extraído do PDF via seleção ({len(texto_selecionado)} caracteres)")
-                                    return texto_selecionado
+                                if selecao and len(selecao) > 10:
+                                    logger.info(f"Texto extraído do PDF via seleção ({len(selecao)} caracteres)")
+                                    return selecao
                             except Exception as e:
                                 logger.warning(f"Erro ao tentar selecionar texto do PDF: {e}")
                         
@@ -1785,7 +1421,7 @@ class DJEScraper:
                                     
                                     # Tenta acessar o iframe
                                     self.driver.switch_to.frame(iframe)
-                                    time.sleep(1)
+                                    esperar_carregamento(self.driver, "carregamento do iframe aninhado")
                                     
                                     # Verifica se há PDF dentro do iframe
                                     pdf_in_iframe = self.driver.find_elements(By.CSS_SELECTOR, "embed[type='application/pdf']")
@@ -1816,7 +1452,7 @@ class DJEScraper:
                             
                             # Tenta acessar esse frame
                             self.driver.switch_to.frame(frame)
-                            time.sleep(2)
+                            esperar_carregamento(self.driver, "carregamento do frame alternativo")
                             
                             # Procura por PDF no frame
                             pdf_embeds = self.driver.find_elements(By.CSS_SELECTOR, "embed[type='application/pdf']")
@@ -1863,9 +1499,9 @@ class DJEScraper:
                         
                         # Executar JavaScript para tentar obter o texto do PDF
                         script = """
-                        var pdfCallback = arguments[0];
+                        var pdfCallback = arguments[arguments.length - 1];
                         try {
-                            var pdfViewer = document.getElementById(arguments[1]) || document.getElementsByName(arguments[1])[0];
+                            var pdfViewer = document.getElementById(arguments[0]) || document.getElementsByName(arguments[0])[0];
                             if (pdfViewer && pdfViewer.contentWindow) {
                                 var pdfDocument = pdfViewer.contentWindow.PDFViewerApplication.pdfDocument;
                                 var numPages = pdfDocument.numPages;
@@ -1883,29 +1519,21 @@ class DJEScraper:
                                 
                                 Promise.all(textPromises).then(function(pageTexts) {
                                     pdfCallback(pageTexts.join(' '));
+                                }, function() {
+                                    pdfCallback(null);
                                 });
-                                return true;
+                            } else {
+                                pdfCallback(null);
                             }
-                            return false;
                         } catch (e) {
                             console.error("Erro ao extrair texto do PDF:", e);
-                            return false;
+                            pdfCallback(null);
                         }
                         """
                         
-                        # Tenta executar o script com timeout
-                        pdf_text = None
-                        
-                        def callback(text):
-                            nonlocal pdf_text
-                            pdf_text = text
-                        
-                        success = self.driver.execute_script(script, callback, pdf_id)
-                        
-                        # Espera um pouco para ver se o callback é chamado
-                        wait_time = 5
-                        logger.info(f"Aguardando {wait_time} segundos pelo retorno do texto...")
-                        time.sleep(wait_time)
+                        # Espera o texto do PDF chegar pelo callback (ou a resposta vazia, sem visualizador)
+                        logger.info("Aguardando o retorno do texto do PDF...")
+                        pdf_text = executar_script_assincrono(self.driver, script, "texto do PDF incorporado", pdf_id)
                         
                         if pdf_text and len(pdf_text) > 50:
                             logger.info(f"Texto extraído do PDF via JavaScript: {len(pdf_text)} caracteres")
@@ -1978,17 +1606,8 @@ class DJEScraper:
         if not texto:
             return False
             
-        # Encontra o último "Processo" no texto
-        ultima_ocorrencia = texto.rfind("Processo")
-        
-        if ultima_ocorrencia == -1:
-            return False
-            
-        # Pega o texto a partir do último "Processo"
-        ultimo_processo = texto[ultima_ocorrencia:]
-        
-        # Verifica se este último processo termina com o padrão esperado
-        return not re.search(r'ADV:.*?\(OAB.*?\)', ultimo_processo, re.DOTALL)
+        # O segmentador marca como aberto o processo que chega ao fim do texto sem fechar
+        return any(segmento.aberto for segmento in segmentar_processos(texto))
     
     def navegar_proxima_pagina(self):
         """Tenta navegar para a próxima página da publicação"""
@@ -2013,7 +1632,9 @@ class DJEScraper:
                         for elemento in elementos:
                             if elemento.is_displayed() and elemento.is_enabled():
                                 logger.info(f"Botão 'Próxima' encontrado com seletor: {seletor}")
+                                pagina_anterior = documento_atual(self.driver)
                                 elemento.click()
+                                esperar_troca_de_pagina(self.driver, pagina_anterior, "navegação para a próxima página", ESPERA_TIMEOUT_CURTO)
                                 return True
                 except Exception as e:
                     logger.debug(f"Erro ao tentar seletor {seletor}: {e}")
@@ -2061,9 +1682,11 @@ class DJEScraper:
                 return false;
                 """
                 
+                pagina_anterior = documento_atual(self.driver)
                 resultado = self.driver.execute_script(script)
                 if resultado:
                     logger.info("Botão 'Próxima' encontrado e clicado via JavaScript")
+                    esperar_troca_de_pagina(self.driver, pagina_anterior, "navegação para a próxima página", ESPERA_TIMEOUT_CURTO)
                     return True
             except Exception as e:
                 logger.warning(f"Erro ao tentar navegar via JavaScript: {e}")
@@ -2099,111 +1722,103 @@ class DJEScraper:
                 # Tenta navegar para a página anterior para buscar o início do processo
                 if self.navegar_pagina_anterior():
                     logger.info("Navegação para página anterior bem-sucedida")
-                    time.sleep(3)  # Aguarda carregamento
                     
                     # Obtém o texto da página anterior
                     texto_pagina_anterior = self.driver.page_source
                     soup_anterior = BeautifulSoup(texto_pagina_anterior, 'html.parser')
                     texto_anterior = soup_anterior.get_text()
                     
-                    # Procura por processos na página anterior
-                    ultima_ocorrencia = texto_anterior.rfind("Processo")
-                    if ultima_ocorrencia != -1:
-                        # Extrai o último processo (possivelmente incompleto) da página anterior
-                        processo_incompleto = texto_anterior[ultima_ocorrencia:]
+                    # Procura o processo que ficou aberto no fim da página anterior
+                    segmentos_anteriores = list(segmentar_processos(texto_anterior))
+                    if segmentos_anteriores and segmentos_anteriores[-1].aberto:
+                        processo_incompleto = segmentos_anteriores[-1].texto
                         logger.info(f"Processo incompleto extraído da página anterior: {processo_incompleto[:100]}...")
                         
                         # Extrai o início da página atual até o primeiro "Processo" (se houver)
-                        primeiro_processo_atual = texto_completo.find("Processo")
-                        if primeiro_processo_atual > 0:
-                            # Extrai a continuação
-                            continuacao = texto_completo[:primeiro_processo_atual].strip()
+                        continuacao, _ = separar_continuacao(texto_completo)
+                        if continuacao is not None:
                             logger.info(f"Continuação encontrada na página atual: {continuacao[:100]}...")
                             
                             # Concatena para formar o processo completo
                             processo_completo = processo_incompleto + " " + continuacao
                             
                             # Verifica se o processo completo termina com o padrão esperado
-                            if re.search(r'ADV:.*?\(OAB.*?\)', processo_completo, re.DOTALL):
+                            if fim_processo(processo_completo) != -1:
                                 logger.info("Processo completo após concatenação com página anterior")
                                 
                                 # Verifica se contém ambas as palavras-chave
-                                if "RPV" in processo_completo and "pagamento pelo INSS" in processo_completo:
+                                if contem_palavras_chave(processo_completo):
                                     processos_validos.append(processo_completo)
                                     logger.info("Processo concatenado válido (contém RPV e pagamento pelo INSS)")
                         
                         # Volta para a página original para continuar o processamento
                         self.driver.get(self.driver.current_url)
-                        time.sleep(2)
+                        esperar_carregamento(self.driver, "recarregamento da página da publicação")
                         
                         # Recarrega o texto da página atual
                         texto_pagina_atual = self.driver.page_source
                         soup = BeautifulSoup(texto_pagina_atual, 'html.parser')
                         texto_completo = soup.get_text()
             
-            # Procura por processos completos na página atual
-            processos_completos = re.findall(r'(Processo.*?ADV:.*?\(OAB.*?\))', texto_completo, re.DOTALL)
+            # Divide a página atual em processos; o último pode estar aberto (incompleto)
+            segmentos = list(segmentar_processos(texto_completo))
+            segmento_aberto = segmentos[-1] if segmentos and segmentos[-1].aberto else None
+            processos_completos = [segmento.texto for segmento in segmentos if not segmento.aberto]
             logger.info(f"Encontrados {len(processos_completos)} processos completos na página atual")
             
-            # Verifica se há processos incompletos
-            tem_processo_incompleto = self.verificar_processo_incompleto(texto_completo)
-            
             # Processa os processos completos encontrados
             for processo in processos_completos:
                 # Verifica se contém ambas as palavras-chave
-                if "RPV" in processo and "pagamento pelo INSS" in processo:
+                if contem_palavras_chave(processo):
                     processos_validos.append(processo)
                     logger.info("Processo válido encontrado (contém RPV e pagamento pelo INSS)")
             
             # Se o último processo estiver incompleto, navega para a próxima página
-            if tem_processo_incompleto:
+            if segmento_aberto:
                 logger.info("Detectado processo incompleto no final da página atual")
                 
                 # Extrai o processo incompleto da página atual
-                ultima_ocorrencia = texto_completo.rfind("Processo")
-                if ultima_ocorrencia != -1:
-                    processo_incompleto = texto_completo[ultima_ocorrencia:]
-                    logger.info(f"Processo incompleto extraído: {processo_incompleto[:100]}...")
+                processo_incompleto = segmento_aberto.texto
+                logger.info(f"Processo incompleto extraído: {processo_incompleto[:100]}...")
+                
+                # Tenta navegar para a próxima página
+                if self.navegar_proxima_pagina():
+                    logger.info("Navegação para próxima página bem-sucedida")
                     
-                    # Tenta navegar para a próxima página
-                    if self.navegar_proxima_pagina():
-                        logger.info("Navegação para próxima página bem-sucedida")
-                        time.sleep(3)  # Aguarda carregamento
-                        
-                        # Obtém o texto da próxima página
-                        texto_proxima_pagina = self.driver.page_source
-                        soup_proxima = BeautifulSoup(texto_proxima_pagina, 'html.parser')
-                        texto_proxima = soup_proxima.get_text()
-                        
-                        # Procura por processos completos na próxima página
-                        processos_proxima_pagina = re.findall(r'(Processo.*?ADV:.*?\(OAB.*?\))', texto_proxima, re.DOTALL)
+                    # Obtém o texto da próxima página
+                    texto_proxima_pagina = self.driver.page_source
+                    soup_proxima = BeautifulSoup(texto_proxima_pagina, 'html.parser')
+                    texto_proxima = soup_proxima.get_text()
+                    
+                    # Procura por processos completos na próxima página
+                    processos_proxima_pagina = [
+                        segmento.texto for segmento in segmentar_processos(texto_proxima) if not segmento.aberto
+                    ]
+                    
+                    # Tenta encontrar a continuação do processo incompleto
+                    # A continuação começa do início da página até o primeiro "Processo" encontrado
+                    continuacao, _ = separar_continuacao(texto_proxima)
+                    
+                    if continuacao is not None:
+                        logger.info(f"Continuação encontrada na próxima página: {continuacao[:100]}...")
                         
-                        # Tenta encontrar a continuação do processo incompleto
-                        # A continuação começa do início da página até o primeiro "Processo" encontrado
-                        primeiro_processo_proxima = texto_proxima.find("Processo")
+                        # Concatena o processo incompleto com sua continuação
+                        processo_completo = processo_incompleto + " " + continuacao
                         
-                        if primeiro_processo_proxima > 0:
-                            # Há conteúdo antes do primeiro "Processo" na próxima página
-                            continuacao = texto_proxima[:primeiro_processo_proxima].strip()
-                            logger.info(f"Continuação encontrada na próxima página: {continuacao[:100]}...")
-                            
-                            # Concatena o processo incompleto com sua continuação
-                            processo_completo = processo_incompleto + " " + continuacao
+                        # Verifica se agora temos um processo completo
+                        if fim_processo(processo_completo) != -1:
+                            logger.info("Processo agora está completo após concatenação")
                             
-                            # Verifica se agora temos um processo completo
-                            if re.search(r'ADV:.*?\(OAB.*?\)', processo_completo, re.DOTALL):
-                                logger.info("Processo agora está completo após concatenação")
-                                
-                                # Verifica se contém ambas as palavras-chave
-                                if "RPV" in processo_completo and "pagamento pelo INSS" in processo_completo:
-                                    processos_validos.append(processo_completo)
-                                    logger.info("Processo concatenado válido (contém RPV e pagamento pelo INSS)")
-                        
-                        # Processa os processos completos da próxima página
-                        for processo in processos_proxima_pagina:
-                            if "RPV" in processo and "pagamento pelo INSS" in processo:
-                                processos_validos.append(processo)
-                                logger.info("Processo válido encontrado na próxima página")
+                            # Verifica se contém ambas as palavras-chave
+                            if contem_palavras_chave(processo_completo):
+                                processos_validos.append(processo_completo)
+                                logger.info("Processo concatenado válido (contém RPV e pagamento pelo INSS)")
+                    
+                    # Processa os processos completos da próxima página
+                    for processo in processos_proxima_pagina:
+                        if contem_palavras_chave(processo):
+                            processos_validos.append(processo)
+                            logger.info("Processo válido encontrado na próxima página")
             
             return processos_validos
         
@@ -2219,8 +1834,9 @@ class DJEScraper:
                 botao_anterior = self.driver.find_element(By.ID, "botaoVoltarPagina")
                 if botao_anterior:
                     logger.info("Botão 'Voltar Página' encontrado pelo ID")
+                    pagina_anterior = documento_atual(self.driver)
                     botao_anterior.click()
-                    time.sleep(2)
+                    esperar_troca_de_pagina(self.driver, pagina_anterior, "navegação para a página anterior", ESPERA_TIMEOUT_CURTO)
                     return True
             except NoSuchElementException:
                 logger.info("Botão 'Voltar Página' não encontrado pelo ID, tentando outras abordagens")
@@ -2246,8 +1862,9 @@ class DJEScraper:
                         for elemento in elementos:
                             if elemento.is_displayed() and elemento.is_enabled():
                                 logger.info(f"Botão 'Anterior' encontrado com seletor: {seletor}")
+                                pagina_anterior = documento_atual(self.driver)
                                 elemento.click()
-                                time.sleep(2)
+                                esperar_troca_de_pagina(self.driver, pagina_anterior, "navegação para a página anterior", ESPERA_TIMEOUT_CURTO)
                                 return True
                 except Exception as e:
                     logger.debug(f"Erro ao tentar seletor {seletor}: {e}")
@@ -2310,10 +1927,11 @@ class DJEScraper:
                 return false;
                 """
                 
+                pagina_anterior = documento_atual(self.driver)
                 resultado = self.driver.execute_script(script)
                 if resultado:
                     logger.info("Botão 'Anterior' encontrado e clicado via JavaScript")
-                    time.sleep(2)
+                    esperar_troca_de_pagina(self.driver, pagina_anterior, "navegação para a página anterior", ESPERA_TIMEOUT_CURTO)
                     return True
             except Exception as e:
                 logger.warning(f"Erro ao tentar navegar via JavaScript: {e}")
@@ -0,0 +1,68 @@
+from collections import namedtuple
+
+# Marcadores que delimitam um processo no texto do diário:
+# começa em "Processo" e termina no ")" que fecha a primeira OAB depois de "ADV:"
+MARCADOR_PROCESSO = "Processo"
+MARCADOR_ADVOGADO = "ADV:"
+MARCADOR_OAB = "(OAB"
+
+# Trecho de um processo no texto: `aberto` indica que o texto acabou antes do fechamento
+# (processo que continua na próxima página); nesse caso `fim` é o tamanho do texto
+SegmentoProcesso = namedtuple('SegmentoProcesso', ['texto', 'inicio', 'fim', 'aberto'])
+
+def fim_processo(texto, inicio=0):
+    """
+    Retorna a posição logo após o ")" que fecha a OAB do processo iniciado em `inicio`
+    (primeiro "ADV:", depois o primeiro "(OAB" e o primeiro ")"), ou -1 se ele não fechar.
+    """
+    posicao_advogado = texto.find(MARCADOR_ADVOGADO, inicio)
+    if posicao_advogado == -1:
+        return -1
+
+    posicao_oab = texto.find(MARCADOR_OAB, posicao_advogado + len(MARCADOR_ADVOGADO))
+    if posicao_oab == -1:
+        return -1
+
+    posicao_parenteses = texto.find(")", posicao_oab + len(MARCADOR_OAB))
+    if posicao_parenteses == -1:
+        return -1
+
+    return posicao_parenteses + 1
+
+def segmentar_processos(texto, inicio=0):
+    """
+    Percorre o texto uma única vez (a partir de `inicio`) e gera os processos encontrados,
+    com os mesmos trechos de re.findall(r'(Processo.*?ADV:.*?\\(OAB.*?\\))', texto, re.DOTALL).
+    Se o texto terminar no meio de um processo, o último segmento gerado vem com `aberto=True`.
+    """
+    if not texto:
+        return
+
+    posicao = inicio
+    while True:
+        comeco = texto.find(MARCADOR_PROCESSO, posicao)
+        if comeco == -1:
+            return
+
+        fim = fim_processo(texto, comeco + len(MARCADOR_PROCESSO))
+        if fim == -1:
+            yield SegmentoProcesso(texto[comeco:], comeco, len(texto), True)
+            return
+
+        yield SegmentoProcesso(texto[comeco:fim], comeco, fim, False)
+        posicao = fim
+
+def separar_continuacao(texto):
+    """
+    Separa o início de uma página que ainda pertence ao processo da página anterior.
+    Retorna (continuacao, posicao_primeiro_processo); a continuação só existe quando há
+    texto antes do primeiro "Processo" (posição > 0).
+    """
+    primeiro_processo = texto.find(MARCADOR_PROCESSO)
+    if primeiro_processo <= 0:
+        return None, primeiro_processo
+    return texto[:primeiro_processo].strip(), primeiro_processo
+
+def contem_palavras_chave(texto_processo):
+    """Verifica se o processo menciona RPV e pagamento pelo INSS"""
+    return "RPV" in texto_processo and "pagamento pelo INSS" in texto_processo
@@ -0,0 +1,218 @@
+import json
+import logging
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib.parse import urljoin
+
+from config import DJE_URL, DJE_URL_BASE, DOWNLOAD_TIMEOUT, HTTP_POOL_CONEXOES, ARQUIVO_COOKIES_SESSAO, PDF_TAMANHO_MAXIMO_MB
+
+logger = logging.getLogger("DJE_Scraper")
+
+# Headers para simular um navegador real (importante para o DJE)
+HEADERS_PADRAO = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/90.0.4430.212 Safari/537.36',
+    'Accept': 'application/pdf,*/*',
+    'Accept-Language': 'pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7',
+    'Connection': 'keep-alive',
+    'Referer': urljoin(DJE_URL_BASE, '/')
+}
+
+# Motivos de falha de obter_pdf_com_motivo
+FALHA_AUSENTE = 'ausente'          # 404, ou HTML mesmo depois de renovar os cookies: o PDF não existe
+FALHA_TRANSITORIA = 'transitoria'  # erro de conexão, timeout ou status de erro do servidor
+FALHA_CONTEUDO = 'conteudo'        # acima do tamanho máximo, ou nem PDF nem HTML
+
+class SessaoDJE:
+    """
+    Cliente HTTP único e de longa duração para os downloads do DJE.
+    Mantém conexões keep-alive em um pool, recebe os cookies do navegador uma única vez
+    e só os renova quando o site devolve uma página HTML (login/erro) no lugar do PDF.
+    """
+
+    def __init__(self, obter_cookies_navegador=None, arquivo_cookies=ARQUIVO_COOKIES_SESSAO,
+                 tamanho_pool=HTTP_POOL_CONEXOES, timeout=DOWNLOAD_TIMEOUT,
+                 tamanho_maximo_mb=PDF_TAMANHO_MAXIMO_MB, url_inicial=DJE_URL):
+        """
+        obter_cookies_navegador: função opcional que recebe `renovar` (bool) e retorna
+        a lista de cookies do Selenium. Sem ela (ou quando ela retorna None, sem navegador aberto),
+        os cookies vêm de uma visita a `url_inicial`.
+        """
+        self.session = requests.Session()
+        self.session.headers.update(HEADERS_PADRAO)
+
+        # Pool de conexões com retry para falhas transitórias do servidor
+        adapter = HTTPAdapter(
+            pool_connections=tamanho_pool,
+            pool_maxsize=tamanho_pool,
+            max_retries=Retry(total=2, backoff_factor=0.5, status_forcelist=[502, 503, 504])
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self.timeout = timeout
+        self.url_inicial = url_inicial
+        self.tamanho_maximo = int(tamanho_maximo_mb) * 1024 * 1024
+        self.arquivo_cookies = arquivo_cookies
+        self._obter_cookies_navegador = obter_cookies_navegador
+        self._lock = threading.Lock()
+        self._geracao_cookies = 0
+        self._semeada = self._carregar_cookies()
+
+    def _carregar_cookies(self):
+        """Carrega os cookies persistidos em disco pela execução anterior"""
+        if not self.arquivo_cookies or not os.path.exists(self.arquivo_cookies):
+            return False
+
+        try:
+            with open(self.arquivo_cookies, 'r', encoding='utf-8') as arquivo:
+                cookies = json.load(arquivo)
+
+            for cookie in cookies:
+                self.session.cookies.set(
+                    cookie['name'], cookie['value'],
+                    domain=cookie.get('domain', ''), path=cookie.get('path', '/')
+                )
+
+            logger.info(f"Carregados {len(cookies)} cookies persistidos de {self.arquivo_cookies}")
+            return bool(cookies)
+        except Exception as e:
+            logger.warning(f"Erro ao carregar cookies persistidos: {e}")
+            return False
+
+    def _salvar_cookies(self):
+        """Persiste os cookies atuais em disco para a próxima execução"""
+        if not self.arquivo_cookies:
+            return
+
+        try:
+            diretorio = os.path.dirname(self.arquivo_cookies)
+            if diretorio:
+                os.makedirs(diretorio, exist_ok=True)
+
+            cookies = [
+                {'name': c.name, 'value': c.value, 'domain': c.domain, 'path': c.path}
+                for c in self.session.cookies
+            ]
+            with open(self.arquivo_cookies, 'w', encoding='utf-8') as arquivo:
+                json.dump(cookies, arquivo)
+
+            logger.info(f"Cookies da sessão persistidos em {self.arquivo_cookies}")
+        except Exception as e:
+            logger.warning(f"Erro ao persistir cookies da sessão: {e}")
+
+    def _aplicar_cookies(self, renovar=False):
+        """Copia os cookies do navegador (ou da página inicial) para a sessão"""
+        cookies = self._obter_cookies_navegador(renovar=renovar) if self._obter_cookies_navegador else None
+        if cookies is not None:
+            for cookie in cookies:
+                self.session.cookies.set(
+                    cookie['name'], cookie['value'],
+                    domain=cookie.get('domain', ''), path=cookie.get('path', '/')
+                )
+            logger.info(f"Adicionados {len(cookies)} cookies do Selenium à sessão")
+        else:
+            if renovar:
+                self.session.cookies.clear()
+            try:
+                self.session.get(self.url_inicial, timeout=self.timeout)
+                logger.info("Acessada página inicial para obter cookies de sessão")
+            except Exception as e:
+                logger.warning(f"Erro ao acessar página inicial: {e}")
+
+        self._geracao_cookies += 1
+        self._semeada = True
+        self._salvar_cookies()
+
+    def semear_cookies(self):
+        """Semeia os cookies da sessão uma única vez (sem efeito se já semeada)"""
+        with self._lock:
+            if not self._semeada:
+                self._aplicar_cookies()
+
+    def renovar_cookies(self, geracao_observada=None):
+        """
+        Renova os cookies da sessão. Se outra thread já renovou depois da geração
+        observada pelo chamador, não faz nada (evita renovações em cascata).
+        """
+        with self._lock:
+            if geracao_observada is not None and geracao_observada != self._geracao_cookies:
+                return
+            logger.info("Renovando cookies da sessão HTTP")
+            self._aplicar_cookies(renovar=True)
+
+    def get(self, url, **kwargs):
+        """Faz um GET pela sessão compartilhada"""
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.get(url, **kwargs)
+
+    def _ler_resposta_limitada(self, response, url_pdf):
+        """
+        Lê o corpo da resposta em blocos, interrompendo o download se passar do tamanho máximo.
+        Retorna (bytes, None) ou (None, motivo_da_falha).
+        """
+        tamanho_declarado = response.headers.get('Content-Length')
+        if tamanho_declarado and tamanho_declarado.isdigit() and int(tamanho_declarado) > self.tamanho_maximo:
+            logger.error(f"PDF {url_pdf} declara {tamanho_declarado} bytes, acima do limite de {self.tamanho_maximo}")
+            return None, 'tamanho'
+
+        buffer = bytearray()
+        for bloco in response.iter_content(chunk_size=64 * 1024):
+            buffer += bloco
+            if len(buffer) > self.tamanho_maximo:
+                logger.error(f"Download de {url_pdf} interrompido: passou do limite de {self.tamanho_maximo} bytes")
+                return None, 'tamanho'
+
+        return bytes(buffer), None
+
+    def obter_pdf(self, url_pdf):
+        """Baixa um PDF e retorna seus bytes (ou None em caso de falha, veja obter_pdf_com_motivo)"""
+        return self.obter_pdf_com_motivo(url_pdf)[0]
+
+    def obter_pdf_com_motivo(self, url_pdf):
+        """
+        Baixa um PDF lendo a resposta em blocos com limite de tamanho. Retorna (bytes, None) ou (None, motivo),
+        com o motivo entre os FALHA_*. Se o servidor devolver HTML no lugar do PDF, renova os cookies e tenta mais uma vez.
+        """
+        self.semear_cookies()
+
+        for tentativa in range(1, 3):
+            geracao = self._geracao_cookies
+
+            try:
+                with self.get(url_pdf, stream=True) as response:
+                    if response.status_code != 200:
+                        logger.error(f"Erro ao baixar PDF {url_pdf}: Status {response.status_code}")
+                        return None, FALHA_AUSENTE if response.status_code in (404, 410) else FALHA_TRANSITORIA
+
+                    conteudo, falha = self._ler_resposta_limitada(response, url_pdf)
+                    if falha:
+                        return None, FALHA_CONTEUDO
+            except requests.RequestException as e:
+                logger.error(f"Erro de conexão ao baixar PDF {url_pdf}: {e}")
+                return None, FALHA_TRANSITORIA
+
+            if conteudo.startswith(b'%PDF'):
+                return conteudo, None
+
+            if b'<html' in conteudo[:100].lower():
+                logger.warning(f"Recebido HTML ao invés de PDF em {url_pdf} (tentativa {tentativa}), possível erro de autenticação")
+                if tentativa == 1:
+                    self.renovar_cookies(geracao)
+                    continue
+                return None, FALHA_AUSENTE
+
+            logger.error(f"Conteúdo recebido de {url_pdf} não é PDF nem HTML")
+            return None, FALHA_CONTEUDO
+
+        return None, FALHA_AUSENTE
+
+    def fechar(self):
+        """Fecha as conexões do pool"""
+        try:
+            self.session.close()
+        except Exception as e:
+            logger.warning(f"Erro ao fechar sessão HTTP: {e}")
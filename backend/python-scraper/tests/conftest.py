@@ -0,0 +1,42 @@
+import os
+import sys
+
+import pytest
+
+# Os módulos do scraper ficam soltos na pasta do projeto e são importados pelo nome
+DIRETORIO_SCRAPER = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, DIRETORIO_SCRAPER)
+
+# Fixtures gravadas (páginas do DJE, textos de processos) usadas pelos testes
+DIRETORIO_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+@pytest.fixture
+def banco_postgres():
+    """
+    Conexão (autocommit) com um PostgreSQL de teste com o schema migrado e as tabelas vazias.
+    Usa as configurações do DB_CONFIG com o banco de TESTE_DB_NAME; sem essa variável, ou sem
+    servidor disponível, os testes que dependem do banco são pulados. O banco é esvaziado a cada teste.
+    """
+    nome_banco = os.getenv('TESTE_DB_NAME')
+    if not nome_banco:
+        pytest.skip("TESTE_DB_NAME não definido (banco PostgreSQL de teste)")
+
+    import psycopg2
+    import database
+    from config import DB_CONFIG
+    from migracoes import aplicar_migracoes
+
+    try:
+        conn = psycopg2.connect(**dict(DB_CONFIG, database=nome_banco))
+    except psycopg2.OperationalError as e:
+        pytest.skip(f"PostgreSQL de teste indisponível: {e}")
+
+    conn.autocommit = True
+    assert aplicar_migracoes(conn)
+    database._esquema_inicializado = True
+    with conn.cursor() as cursor:
+        cursor.execute("TRUNCATE publicacoes, paginas_texto RESTART IDENTITY CASCADE")
+    try:
+        yield conn
+    finally:
+        conn.close()
@@ -0,0 +1,286 @@
+"""
+Extração de campos original (DJEScraper._extrair_dados_processo e _limpar_valor_monetario antes do
+motor compilado de extracao_campos), copiada sem alterações para servir de referência nos testes
+de equivalência. Não é usada pelo scraper.
+"""
+import datetime
+import logging
+import re
+
+logger = logging.getLogger("DJE_Scraper")
+
+def extrair_dados_processo_original(processo_texto):
+    """Extrai todos os dados de um processo individual"""
+    try:
+        # Cria um dicionário para armazenar os dados extraídos
+        dados_processo = {
+            'conteudo_completo': processo_texto,
+            'data_disponibilizacao': datetime.date.today().strftime("%Y-%m-%d")
+        }
+
+        # Pré-processamento do texto para facilitar extração
+        texto_processado = processo_texto.replace('\n', ' ').replace('\r', ' ')
+        texto_processado = re.sub(r'\s+', ' ', texto_processado)
+
+        # EXTRAÇÃO DO NÚMERO DO PROCESSO
+        numero_processo = None
+
+        # Lista de padrões para encontrar o número do processo em diferentes formatos
+        padroes_processo = [
+            # Formato CNJ completo
+            r'\b(\d{7}-\d{2}\.\d{4}\.\d\.\d{2}\.\d{4})\b',
+            # Processo com formato específico
+            r'Processo\s+(\d+[-./]\d+[^-\s]*)',
+            # Outros formatos comuns
+            r'[Pp]rocesso\s+[Nn][º°]?\s*:\s*(\d{7}-\d{2}\.\d{4}\.\d\.\d{2}\.\d{4})',
+            r'[Pp]rocesso\s+[Nn][º°]?\s*[.:]\s*(\d{20})',
+            r'[Pp]rocesso\s+(\d{20})',
+            # Outros formatos comuns
+            r'[Pp]rocesso\s+[Nn][º°]?\s*[.:]\s*(\d+[-./]\d+[-./]\d+)',
+            r'[Pp]rocesso\s+[Nn][º°]?\s*[.:]\s*(\d+[-./]\d+)',
+            r'[Pp]rocesso\s+[Nn][º°]?\s*[.:]\s*(\d+)',
+            # Busca genérica
+            r'(?:Autos|Número|Numeração)[^:]*:\s*(\d+[-./]?\d*[-./]?\d*[-./]?\d*[-./]?\d*)',
+            # Busca por padrões em tabelas/formatação espaçada
+            r'Processo\s+[^\n]*?(\d{7}-\d{2}\.\d{4}\.\d\.\d{2}\.\d{4})',
+            r'\b(\d{7}-\d{2}\.\d{4}\.\d\.\d{2}\.\d{4})\b'
+        ]
+
+        for padrao in padroes_processo:
+            processo_match = re.search(padrao, texto_processado)
+            if processo_match:
+                numero_processo = processo_match.group(1).strip()
+                # Remove possíveis pontos e traços extras
+                numero_processo = re.sub(r'\s+', '', numero_processo)
+                logger.info(f"Número do processo extraído: {numero_processo}")
+                break
+
+        dados_processo['numero_processo'] = numero_processo
+
+        # EXTRAÇÃO DO AUTOR - REGRA: nome que antecede "- Vistos."
+        autor = None
+
+        # Padrão principal: o último nome antes de "- Vistos."
+        autor_match = re.search(r'(?:Permanent[e]|Espécie|Acidente|Fazenda Pública|Art\. 86|\))?\s*-\s*([^-]+?)\s+-\s+Vistos', texto_processado)
+        if autor_match:
+            autor = autor_match.group(1).strip()
+            logger.info(f"Autor extraído (antes de '- Vistos'): {autor}")
+        else:
+            # Tenta outro padrão comum em vários documentos - nome após o tipo do processo
+            padrao_tipo_processo = r'Processo\s+\d+[-./\d\s()]+(?: - [^-]+){1,3} - ([^-]+) -'
+            autor_match = re.search(padrao_tipo_processo, texto_processado)
+            if autor_match:
+                autor = autor_match.group(1).strip()
+                logger.info(f"Autor extraído (após tipo do processo): {autor}")
+            else:
+                # Busca por padrões comuns de Auxílio-Acidente ou Benefícios em Espécie
+                padroes_tipo_processo = [
+                    r'(?:Auxílio-Acidente|Benefícios em Espécie|Procedimento Comum)\s*\([^)]*\)\s*-\s*([^-]+?)\s*-\s*Vistos',
+                    r'(?:Auxílio-Acidente|Benefícios em Espécie|Incapacidade Laborativa)\s*(?:Permanent[e])?(?:\([^)]*\))?\s*-\s*([^-]+?)\s*-\s*Vistos',
+                    r'\([^)]*Art\.\s*86[^)]*\)\s*-\s*([^-]+?)\s*-\s*Vistos'
+                ]
+
+                for padrao in padroes_tipo_processo:
+                    autor_match = re.search(padrao, texto_processado, re.IGNORECASE)
+                    if autor_match:
+                        autor_extraido = autor_match.group(1).strip()
+                        if autor_extraido and len(autor_extraido) > 3 and not re.search(r'^(INSS|Instituto Nacional)', autor_extraido, re.IGNORECASE):
+                            autor = autor_extraido
+                            logger.info(f"Autor extraído (entre tipo e Vistos): {autor}")
+                            break
+
+        # Verificação final para garantir que não pegou texto errado
+        if autor and (len(autor) > 50 or len(autor) < 3 or 
+                     re.search(r'outorgando poderes|advogado|advocacia|requisição|crédito|despacho|decisão', autor, re.IGNORECASE)):
+            autor = None
+            logger.warning("Autor extraído parece inválido, ignorando")
+
+            # Tenta um último método mais simples
+            partes = texto_processado.split(' - ')
+            for i, parte in enumerate(partes):
+                if i > 0 and i < len(partes)-1 and 'Vistos' in partes[i+1]:
+                    autor_candidato = parte.strip()
+                    if len(autor_candidato) > 3 and len(autor_candidato) < 50:
+                        autor = autor_candidato
+                        logger.info(f"Autor extraído (método simples): {autor}")
+                        break
+
+        dados_processo['autor'] = autor
+
+        # EXTRAÇÃO DO ADVOGADO - ABORDAGEM MELHORADA PARA MÚLTIPLOS ADVOGADOS
+        advogados_encontrados = []
+
+        # Expressão regular para o formato "ADV: NOME (OAB NÚMERO/UF)" com captura da OAB
+        advogado_matches = re.finditer(r'ADV:\s+([^(]+)\s*(\(OAB [^)]+\))', texto_processado, re.IGNORECASE)
+        for match in advogado_matches:
+            nome_advogado = match.group(1).strip()
+            oab_texto = match.group(2).strip()
+            advogado_texto = f"{nome_advogado} {oab_texto}"
+
+            # Processa o texto para tratar casos de múltiplos advogados
+            # Verifica se há vírgulas ou " E " no texto, indicando múltiplos advogados
+            if ',' in advogado_texto or ' E ' in advogado_texto.upper():
+                # Divide por vírgula ou " E "
+                adv_parts = re.split(r',\s*|\s+[eE]\s+', advogado_texto)
+                for adv_part in adv_parts:
+                    adv_part = adv_part.strip()
+                    if adv_part and len(adv_part) > 3:
+                        # Limpa o texto
+                        adv_part = re.sub(r'\s+', ' ', adv_part).strip()
+                        # Evita duplicação
+                        if adv_part not in advogados_encontrados:
+                            advogados_encontrados.append(adv_part)
+                            logger.info(f"Advogado extraído (múltiplo): {adv_part}")
+            else:
+                # Advogado único
+                if advogado_texto and len(advogado_texto) > 3:
+                    # Limpa o texto extraído
+                    advogado_texto = re.sub(r'\s+', ' ', advogado_texto).strip()
+                    # Evita duplicação
+                    if advogado_texto not in advogados_encontrados:
+                        advogados_encontrados.append(advogado_texto)
+                        logger.info(f"Advogado extraído: {advogado_texto}")
+
+        # Tenta uma expressão alternativa se não encontrou advogados
+        if not advogados_encontrados:
+            padrao_alternativo = r'- ADV:\s+([^(]+)\s*(\(OAB [^)]+\))'
+            advogado_matches = re.finditer(padrao_alternativo, texto_processado, re.IGNORECASE)
+            for match in advogado_matches:
+                nome_advogado = match.group(1).strip()
+                oab_texto = match.group(2).strip()
+                advogado_texto = f"{nome_advogado} {oab_texto}"
+
+                # Processa para múltiplos advogados
+                if ',' in advogado_texto or ' E ' in advogado_texto.upper():
+                    adv_parts = re.split(r',\s*|\s+[eE]\s+', advogado_texto)
+                    for adv_part in adv_parts:
+                        adv_part = adv_part.strip()
+                        if adv_part and len(adv_part) > 3:
+                            adv_part = re.sub(r'\s+', ' ', adv_part).strip()
+                            if adv_part not in advogados_encontrados:
+                                advogados_encontrados.append(adv_part)
+                                logger.info(f"Advogado extraído (alt-múltiplo): {adv_part}")
+                else:
+                    if advogado_texto and len(advogado_texto) > 3:
+                        advogado_texto = re.sub(r'\s+', ' ', advogado_texto).strip()
+                        if advogado_texto not in advogados_encontrados:
+                            advogados_encontrados.append(advogado_texto)
+                            logger.info(f"Advogado extraído (alt): {advogado_texto}")
+
+        # Combina múltiplos advogados se encontrados
+        advogado = "; ".join(advogados_encontrados) if advogados_encontrados else None
+        dados_processo['advogado'] = advogado
+
+        # EXTRAÇÃO DE VALORES MONETÁRIOS COM NOVAS REGRAS
+
+        # Primeiro, procura por toda a seção de valores após "homologo os cálculos" até o final do parágrafo
+        secao_valores = None
+        valores_match = re.search(r'homologo os cálculos[^.]*correspondem ao[^R$]*(.+?)(?=\.\s*Os valores)', texto_processado, re.IGNORECASE | re.DOTALL)
+        if valores_match:
+            secao_valores = valores_match.group(1).strip()
+            logger.info(f"Seção de valores encontrada: {secao_valores}")
+
+        # Valor principal
+        valor_principal = None
+        if secao_valores:
+            # Procura por "R$ X - principal bruto/líquido" na seção de valores
+            valor_match = re.search(r'R\$\s*([0-9.,]+)[^;,]*(?:principal\s*bruto(?:/líquido)?|bruto/líquido)', secao_valores, re.IGNORECASE)
+            if valor_match:
+                valor_str = valor_match.group(1).strip()
+                valor_str = _limpar_valor_monetario(valor_str)
+                valor_principal = float(valor_str) if valor_str else None
+                logger.info(f"Valor principal bruto/líquido extraído: {valor_principal}")
+
+        # Se não encontrou na seção específica, tenta no texto completo
+        if not valor_principal:
+            valor_match = re.search(r'R\$\s*([0-9.,]+)[^;,]*(?:principal\s*bruto(?:/líquido)?|bruto/líquido)', texto_processado, re.IGNORECASE)
+            if valor_match:
+                valor_str = valor_match.group(1).strip()
+                valor_str = _limpar_valor_monetario(valor_str)
+                valor_principal = float(valor_str) if valor_str else None
+                logger.info(f"Valor principal bruto/líquido extraído (texto completo): {valor_principal}")
+
+        # Renomeado para valor_principal para compatibilidade com o novo modelo
+        dados_processo['valor_principal'] = valor_principal
+
+        # Valor dos juros moratórios
+        valor_juros_moratorios = None
+        if secao_valores:
+            # Primeiro verifica se contém "sem - juros moratórios"
+            if re.search(r'sem\s*-\s*juros\s*morat[óo]rios', secao_valores, re.IGNORECASE):
+                logger.info("Sem juros moratórios mencionado na seção de valores")
+            else:
+                # Procura por "R$ X - juros moratórios" na seção de valores
+                valor_match = re.search(r'R\$\s*([0-9.,]+)[^;,]*(?:juros\s*morat[óo]rios)', secao_valores, re.IGNORECASE)
+                if valor_match:
+                    valor_str = valor_match.group(1).strip()
+                    valor_str = _limpar_valor_monetario(valor_str)
+                    valor_juros_moratorios = float(valor_str) if valor_str else None
+                    logger.info(f"Valor dos juros moratórios extraído: {valor_juros_moratorios}")
+
+        # Se não encontrou na seção específica, tenta no texto completo
+        if valor_juros_moratorios is None:
+            if re.search(r'sem\s*-\s*juros\s*morat[óo]rios', texto_processado, re.IGNORECASE):
+                logger.info("Sem juros moratórios mencionado no texto")
+            else:
+                valor_match = re.search(r'R\$\s*([0-9.,]+)[^;,]*(?:juros\s*morat[óo]rios)', texto_processado, re.IGNORECASE)
+                if valor_match:
+                    valor_str = valor_match.group(1).strip()
+                    valor_str = _limpar_valor_monetario(valor_str)
+                    valor_juros_moratorios = float(valor_str) if valor_str else None
+                    logger.info(f"Valor dos juros moratórios extraído (texto completo): {valor_juros_moratorios}")
+
+        dados_processo['valor_juros_moratorios'] = valor_juros_moratorios
+
+        # Honorários advocatícios
+        honorarios_advocaticios = None
+        if secao_valores:
+            # Procura por "R$ X - honorários advocatícios" na seção de valores
+            valor_match = re.search(r'R\$\s*([0-9.,]+)[^;,]*(?:honor[áa]rios\s*advocat[íi]cios)', secao_valores, re.IGNORECASE)
+            if valor_match:
+                valor_str = valor_match.group(1).strip()
+                valor_str = _limpar_valor_monetario(valor_str)
+                honorarios_advocaticios = float(valor_str) if valor_str else None
+                logger.info(f"Valor dos honorários advocatícios extraído: {honorarios_advocaticios}")
+
+        # Se não encontrou na seção específica, tenta no texto completo
+        if not honorarios_advocaticios:
+            valor_match = re.search(r'R\$\s*([0-9.,]+)[^;,]*(?:honor[áa]rios\s*advocat[íi]cios)', texto_processado, re.IGNORECASE)
+            if valor_match:
+                valor_str = valor_match.group(1).strip()
+                valor_str = _limpar_valor_monetario(valor_str)
+                honorarios_advocaticios = float(valor_str) if valor_str else None
+                logger.info(f"Valor dos honorários advocatícios extraído (texto completo): {honorarios_advocaticios}")
+
+        dados_processo['honorarios_advocaticios'] = honorarios_advocaticios
+
+        return dados_processo
+
+    except Exception as e:
+        logger.error(f"Erro ao extrair dados do processo: {e}")
+        return None
+
+def _limpar_valor_monetario(valor_str):
+    """
+    Função auxiliar para limpar e formatar valores monetários.
+    Remove R$, espaços e formata corretamente para conversão para float.
+    """
+    if not valor_str:
+        return None
+
+    # Remove caracteres não numéricos, exceto pontos e vírgulas
+    valor_str = re.sub(r'[^\d,.]', '', valor_str)
+
+    # Tratamento para diferentes formatos de números (1.234,56 ou 1234,56 ou 1,234.56)
+    try:
+        # Formato brasileiro (1.234,56)
+        if ',' in valor_str and '.' in valor_str and valor_str.rindex('.') < valor_str.rindex(','):
+            valor_str = valor_str.replace('.', '').replace(',', '.')
+        # Formato com vírgula como decimal (1234,56)
+        elif ',' in valor_str and '.' not in valor_str:
+            valor_str = valor_str.replace(',', '.')
+
+        return valor_str
+    except Exception as e:
+        logger.warning(f"Erro ao limpar valor monetário '{valor_str}': {e}")
+        return None
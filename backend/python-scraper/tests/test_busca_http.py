@@ -0,0 +1,210 @@
+import datetime
+import os
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from busca_http import BuscaHTTP, PESQUISA_LIVRE
+from config import CODIGO_CADERNO
+from conftest import DIRETORIO_FIXTURES
+from sessao_http import SessaoDJE
+
+# Páginas gravadas do DJE (formulário, resultados paginados e pesquisa sem resultados)
+DIRETORIO_PAGINAS = os.path.join(DIRETORIO_FIXTURES, 'dje')
+
+# Períodos que o servidor local responde com cada página gravada
+PERIODO_COM_RESULTADOS = (datetime.date(2025, 3, 3), datetime.date(2025, 3, 5))
+PERIODO_SEM_RESULTADOS = (datetime.date(2025, 1, 1), datetime.date(2025, 1, 1))
+PERIODO_PAGINACAO_SCRIPT = (datetime.date(2025, 3, 6), datetime.date(2025, 3, 6))
+PERIODO_RESPOSTA_INVALIDA = (datetime.date(2025, 3, 7), datetime.date(2025, 3, 7))
+PERIODO_ERRO_SERVIDOR = (datetime.date(2025, 3, 8), datetime.date(2025, 3, 8))
+
+def pagina_gravada(nome):
+    with open(os.path.join(DIRETORIO_PAGINAS, nome), 'rb') as arquivo:
+        return arquivo.read()
+
+def url_publicacao(servidor, nu_diario, nu_seqpagina):
+    return (f"{servidor.url}/cdje/consultaSimples.do?cdVolume=19&nuDiario={nu_diario}"
+            f"&cdCaderno=12&nuSeqpagina={nu_seqpagina}")
+
+class ServidorDJE(ThreadingHTTPServer):
+    """Servidor local que responde a consulta avançada com as páginas gravadas do DJE"""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), ManipuladorDJE)
+        self.envios = []
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+class ManipuladorDJE(BaseHTTPRequestHandler):
+
+    def log_message(self, *args):
+        pass
+
+    def _responder(self, corpo, status=200):
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=UTF-8')
+        self.send_header('Content-Length', str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def do_GET(self):
+        url = urllib.parse.urlparse(self.path)
+        parametros = urllib.parse.parse_qs(url.query)
+
+        if url.path == '/cdje/consultaAvancada.do':
+            self._responder(pagina_gravada('consulta_avancada.html'))
+        elif url.path == '/cdje/trocaDePagina.do':
+            self._responder(pagina_gravada(f"resultados_pagina{parametros['pagina'][0]}.html"))
+        elif url.path == '/cdje/index.do':
+            self._responder(b'<html><body>DJE</body></html>')
+        else:
+            self._responder(b'<html><body>404</body></html>', 404)
+
+    def do_POST(self):
+        tamanho = int(self.headers.get('Content-Length', 0))
+        dados = {nome: valores[0] for nome, valores in urllib.parse.parse_qs(
+            self.rfile.read(tamanho).decode('utf-8'), keep_blank_values=True
+        ).items()}
+        self.server.envios.append((self.path, dados))
+
+        if self.path != '/cdje/consultaAvancada.do':
+            self._responder(b'<html><body>404</body></html>', 404)
+            return
+
+        inicio = dados.get('dadosConsulta.dtInicio')
+        if inicio == PERIODO_SEM_RESULTADOS[0].strftime("%d/%m/%Y"):
+            self._responder(pagina_gravada('sem_resultados.html'))
+        elif inicio == PERIODO_PAGINACAO_SCRIPT[0].strftime("%d/%m/%Y"):
+            self._responder(pagina_gravada('resultados_paginacao_script.html'))
+        elif inicio == PERIODO_RESPOSTA_INVALIDA[0].strftime("%d/%m/%Y"):
+            # Sessão expirada: o DJE devolve o formulário em vez dos resultados
+            self._responder(pagina_gravada('consulta_avancada.html'))
+        elif inicio == PERIODO_ERRO_SERVIDOR[0].strftime("%d/%m/%Y"):
+            self._responder(b'<html><body>Erro interno</body></html>', 500)
+        elif dados.get('pagina') == '2':
+            self._responder(pagina_gravada('resultados_pagina2.html'))
+        else:
+            self._responder(pagina_gravada('resultados_pagina1.html'))
+
+@pytest.fixture
+def servidor():
+    servidor = ServidorDJE()
+    thread = threading.Thread(target=servidor.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield servidor
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
+
+@pytest.fixture
+def sessao(servidor):
+    sessao = SessaoDJE(arquivo_cookies='', url_inicial=servidor.url + '/cdje/index.do', timeout=10)
+    try:
+        yield sessao
+    finally:
+        sessao.fechar()
+
+@pytest.fixture
+def busca(servidor, sessao):
+    return BuscaHTTP(sessao, url_base=servidor.url + '/cdje/')
+
+def test_pesquisar_envia_o_formulario_da_consulta(servidor, busca):
+    assert busca.pesquisar(*PERIODO_COM_RESULTADOS)
+
+    caminho, dados = servidor.envios[0]
+    assert caminho == '/cdje/consultaAvancada.do'
+    assert dados == {
+        # Campos ocultos do formulário gravado
+        'dadosConsulta.tipoPesquisa': '2',
+        'dadosConsulta.nuDiario': '',
+        'dadosConsulta.dtInicio': '03/03/2025',
+        'dadosConsulta.dtFim': '05/03/2025',
+        'dadosConsulta.cdCaderno': CODIGO_CADERNO,
+        'dadosConsulta.pesquisaLivre': PESQUISA_LIVRE,
+    }
+    assert busca.contar_resultados() == 8
+
+def test_iterar_links_segue_a_paginacao_sem_repetir_urls(servidor, busca):
+    assert busca.pesquisar(*PERIODO_COM_RESULTADOS)
+
+    resultados = list(busca.iterar_links_publicacoes())
+
+    assert [resultado['url'] for resultado in resultados] == [
+        url_publicacao(servidor, 4092, 3012),
+        url_publicacao(servidor, 4092, 3015),
+        url_publicacao(servidor, 4092, 3021),
+        url_publicacao(servidor, 4093, 102),
+        url_publicacao(servidor, 4093, 118),
+        url_publicacao(servidor, 4094, 7),
+        url_publicacao(servidor, 4094, 9),
+    ]
+    assert [(resultado['contem_rpv'], resultado['contem_pagamento_inss']) for resultado in resultados] == [
+        (True, True), (True, True), (False, False), (True, True), (True, False), (True, True), (False, False),
+    ]
+    # Cada resultado traz a data do diário do seu cabeçalho, mesmo numa pesquisa de vários dias
+    assert [resultado['data_disponibilizacao'] for resultado in resultados] == (
+        ['2025-03-03'] * 3 + ['2025-03-04'] * 2 + ['2025-03-05'] * 2
+    )
+    assert resultados[1]['snippet'].endswith("Intime-se o INSS para efetuar o pagamento no prazo legal.")
+    assert not busca.paginacao_incompleta
+
+    # A página 2 vem do link em JavaScript: a pesquisa é reenviada com o campo de página
+    caminho, dados = servidor.envios[1]
+    assert caminho == '/cdje/consultaAvancada.do'
+    assert dados['pagina'] == '2'
+    assert dados['dadosConsulta.dtInicio'] == '03/03/2025'
+    assert dados['dadosConsulta.pesquisaLivre'] == PESQUISA_LIVRE
+
+def test_pesquisa_sem_resultados(busca):
+    assert busca.pesquisar(*PERIODO_SEM_RESULTADOS)
+
+    assert busca.contar_resultados() == 0
+    assert list(busca.iterar_links_publicacoes()) == []
+    assert not busca.paginacao_incompleta
+
+@pytest.mark.parametrize('periodo', [PERIODO_RESPOSTA_INVALIDA, PERIODO_ERRO_SERVIDOR])
+def test_pesquisa_sem_pagina_de_resultados_falha(busca, periodo):
+    assert not busca.pesquisar(*periodo)
+    assert busca.contar_resultados() is None
+
+def test_paginacao_que_nao_pode_ser_seguida_fica_marcada(servidor, busca):
+    assert busca.pesquisar(*PERIODO_PAGINACAO_SCRIPT)
+
+    urls = [resultado['url'] for resultado in busca.iterar_links_publicacoes()]
+
+    assert urls == [url_publicacao(servidor, 4095, 201), url_publicacao(servidor, 4095, 205)]
+    assert busca.contar_resultados() == 4
+    assert busca.paginacao_incompleta
+
+def test_scraper_completa_a_paginacao_incompleta_pelo_navegador(servidor, busca, monkeypatch):
+    from scraper import DJEScraper
+
+    scraper = DJEScraper.__new__(DJEScraper)
+    scraper.busca_http = busca
+    pesquisas_navegador = []
+
+    def pesquisar_periodo_navegador(data_inicial, data_final):
+        pesquisas_navegador.append((data_inicial, data_final))
+        return True
+
+    def iterar_links_navegador():
+        for nu_seqpagina in (201, 205, 230, 231):
+            yield {'url': url_publicacao(servidor, 4095, nu_seqpagina), 'snippet': '',
+                   'contem_rpv': True, 'contem_pagamento_inss': True}
+
+    monkeypatch.setattr(scraper, '_pesquisar_periodo_navegador', pesquisar_periodo_navegador)
+    monkeypatch.setattr(scraper, '_iterar_links_navegador', iterar_links_navegador)
+
+    assert scraper.pesquisar_periodo(*PERIODO_PAGINACAO_SCRIPT)
+    urls = [resultado['url'] for resultado in scraper.iterar_links_publicacoes()]
+
+    assert urls == [url_publicacao(servidor, 4095, nu_seqpagina) for nu_seqpagina in (201, 205, 230, 231)]
+    assert pesquisas_navegador == [PERIODO_PAGINACAO_SCRIPT]
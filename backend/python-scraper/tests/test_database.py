@@ -0,0 +1,241 @@
+import datetime
+
+import psycopg2
+import pytest
+
+import database
+from database import Database, CONFLITO_CHAVE, CONFLITO_SEM_PROCESSO
+
+# Publicação sem número de processo: só o hash do conteúdo a identifica
+PUBLICACAO_SEM_PROCESSO = {
+    'numero_processo': None,
+    'data_disponibilizacao': '2025-03-03',
+    'autor': 'Fulano de Tal',
+    'conteudo_completo': 'Requisição de Pequeno Valor - RPV. Aguarde-se o pagamento pelo INSS.',
+}
+
+# Publicação cujo conteúdo é trecho do texto da página: a página vai para paginas_texto antes dela
+TEXTO_PAGINA = 'Cabeçalho do caderno. Processo 0012345-67.2024.8.26.0053 - Expeça-se RPV. Aguarde-se o pagamento pelo INSS. Rodapé.'
+PUBLICACAO_COM_PAGINA = {
+    'numero_processo': '0012345-67.2024.8.26.0053',
+    'data_disponibilizacao': '2025-03-03',
+    'conteudo_completo': 'Processo 0012345-67.2024.8.26.0053 - Expeça-se RPV. Aguarde-se o pagamento pelo INSS.',
+    'chave_pagina': (19, 4092, 12, 3012),
+    'texto_pagina': TEXTO_PAGINA,
+}
+
+class CursorFalso:
+    """Cursor sem banco: as inserções são simuladas por BancoFalso.execute_values"""
+
+    def __init__(self):
+        self.rowcount = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def execute(self, query, params=None):
+        pass
+
+    def fetchall(self):
+        return []
+
+    def fetchone(self):
+        return None
+
+class ConexaoFalsa:
+    closed = False
+
+    def __init__(self):
+        self.autocommit = True
+        self.commits = 0
+        self.rollbacks = 0
+
+    def cursor(self, **kwargs):
+        return CursorFalso()
+
+    def commit(self):
+        assert not self.autocommit
+        self.commits += 1
+
+    def rollback(self):
+        assert not self.autocommit
+        self.rollbacks += 1
+
+class BancoFalso:
+    """
+    Tabela de publicações em memória com os índices únicos do schema: a chave (processo, data), em que
+    NULL nunca conflita, e o hash do conteúdo das publicações sem processo (índice parcial)
+    """
+
+    def __init__(self):
+        self.linhas = []
+        self.chaves = set()
+        self.hashes_sem_processo = set()
+        self.paginas = []
+        self.falhar_publicacoes = False
+
+    def execute(self, query, params=None):
+        # INSERT de uma publicação por vez (inserir_publicacao)
+        if self.falhar_publicacoes and 'INSERT INTO publicacoes' in query:
+            raise psycopg2.DataError("numeric field overflow")
+
+    def execute_values(self, cursor, query, valores, template=None, page_size=None, fetch=False):
+        if 'INSERT INTO paginas_texto' in query:
+            for v in valores:
+                self.paginas.append(v)
+            return [(len(self.paginas) - len(valores) + n + 1,) + tuple(v[:5]) for n, v in enumerate(valores)]
+        if self.falhar_publicacoes:
+            raise psycopg2.DataError("numeric field overflow")
+
+        retornadas = []
+        for v in valores:
+            if CONFLITO_SEM_PROCESSO in query:
+                assert v[0] is None
+                if v[9] in self.hashes_sem_processo:
+                    continue
+                self.hashes_sem_processo.add(v[9])
+            else:
+                assert CONFLITO_CHAVE in query
+                if v[0] is not None and v[1] is not None:
+                    if (v[0], v[1]) in self.chaves:
+                        continue
+                    self.chaves.add((v[0], v[1]))
+            self.linhas.append(v)
+            retornadas.append((len(self.linhas), True))
+        return retornadas
+
+@pytest.fixture
+def banco_falso(monkeypatch):
+    banco = BancoFalso()
+    monkeypatch.setattr(database, '_esquema_inicializado', True)
+    monkeypatch.setattr(database.extras, 'execute_values', banco.execute_values)
+    monkeypatch.setattr(CursorFalso, 'execute', lambda cursor, query, params=None: banco.execute(query, params))
+    return banco
+
+def test_publicacao_sem_processo_inserida_uma_vez(banco_falso):
+    primeira = Database(ConexaoFalsa()).inserir_publicacoes([dict(PUBLICACAO_SEM_PROCESSO)])
+    # Outra execução agendada, sem as chaves pré-carregadas: o conflito tem de vir do banco
+    segunda = Database(ConexaoFalsa()).inserir_publicacoes([dict(PUBLICACAO_SEM_PROCESSO)])
+
+    assert primeira['inseridas'] == 1
+    assert segunda['inseridas'] == 0 and segunda['ignoradas'] == 1
+    assert len(banco_falso.linhas) == 1
+
+def test_publicacao_sem_processo_ignorada_pelas_chaves_carregadas(banco_falso):
+    db = Database(ConexaoFalsa())
+    db.chaves_existentes = database.ChavesExistentes(datetime.date(2025, 3, 3), datetime.date(2025, 3, 3))
+
+    assert db.inserir_publicacoes([dict(PUBLICACAO_SEM_PROCESSO)])['inseridas'] == 1
+    assert db.inserir_publicacao(dict(PUBLICACAO_SEM_PROCESSO)) is None
+    assert db.inserir_publicacoes([dict(PUBLICACAO_SEM_PROCESSO)])['ignoradas'] == 1
+    assert len(banco_falso.linhas) == 1
+
+def test_publicacao_sem_processo_inserida_uma_vez_no_postgres(banco_postgres):
+    for _ in range(2):
+        db = Database(banco_postgres)
+        db.inserir_publicacoes([dict(PUBLICACAO_SEM_PROCESSO)])
+        db.inserir_publicacao(dict(PUBLICACAO_SEM_PROCESSO))
+
+    with banco_postgres.cursor() as cursor:
+        cursor.execute("SELECT COUNT(*) FROM publicacoes WHERE numero_processo IS NULL")
+        assert cursor.fetchone()[0] == 1
+
+def test_conteudos_diferentes_sem_processo_sao_publicacoes_distintas(banco_falso):
+    outra = dict(PUBLICACAO_SEM_PROCESSO, conteudo_completo='Outro texto com RPV e pagamento pelo INSS.')
+    resultado = Database(ConexaoFalsa()).inserir_publicacoes([dict(PUBLICACAO_SEM_PROCESSO), outra])
+
+    assert resultado['inseridas'] == 2
+
+def test_conteudo_truncado_ignorado_pelas_chaves_carregadas(banco_falso):
+    # Acima de 1 MB o conteúdo é truncado na gravação, mas o hash continua sendo o do texto inteiro
+    grande = dict(PUBLICACAO_SEM_PROCESSO, conteudo_completo='RPV pagamento pelo INSS ' * 50000)
+    db = Database(ConexaoFalsa())
+    db.chaves_existentes = database.ChavesExistentes(datetime.date(2025, 3, 3), datetime.date(2025, 3, 3))
+
+    assert db.inserir_publicacoes([dict(grande)])['inseridas'] == 1
+    # A repetida é descartada pelas chaves em memória, sem chegar ao banco
+    banco_falso.falhar_publicacoes = True
+    assert db.inserir_publicacoes([dict(grande)])['ignoradas'] == 1
+    assert len(banco_falso.linhas) == 1
+
+def test_pagina_e_publicacao_gravadas_na_mesma_transacao(banco_falso):
+    conn = ConexaoFalsa()
+    db = Database(conn)
+
+    publicacoes = [dict(PUBLICACAO_COM_PAGINA), dict(PUBLICACAO_COM_PAGINA, data_disponibilizacao='2025-03-04')]
+    assert db.inserir_publicacoes(publicacoes, tamanho_lote=1)['inseridas'] == 2
+
+    # Uma transação por lote, com a página e a publicação que aponta para ela
+    assert len(banco_falso.paginas) == 2
+    assert [v[10] for v in banco_falso.linhas] == [1, 2]
+    assert (conn.commits, conn.rollbacks) == (2, 0)
+    assert conn.autocommit
+
+@pytest.mark.parametrize('em_lote', [True, False])
+def test_falha_na_publicacao_desfaz_a_pagina(banco_falso, em_lote):
+    banco_falso.falhar_publicacoes = True
+    conn = ConexaoFalsa()
+    db = Database(conn)
+    db.chaves_existentes = database.ChavesExistentes(datetime.date(2025, 3, 3), datetime.date(2025, 3, 3))
+
+    if em_lote:
+        assert db.inserir_publicacoes([dict(PUBLICACAO_COM_PAGINA)]) is None
+    else:
+        assert db.inserir_publicacao(dict(PUBLICACAO_COM_PAGINA)) is None
+
+    assert (conn.commits, conn.rollbacks) == (0, 1)
+    assert conn.autocommit
+    # A publicação não foi gravada, então não pode entrar nas chaves conhecidas
+    assert not db.chaves_existentes.contem_publicacao(PUBLICACAO_COM_PAGINA)
+
+def test_falha_na_publicacao_desfaz_a_pagina_no_postgres(banco_postgres):
+    # Valor fora da precisão de DECIMAL(10, 2): o INSERT da publicação falha depois do da página
+    publicacao = dict(PUBLICACAO_COM_PAGINA, valor_principal=10 ** 9)
+
+    assert Database(banco_postgres).inserir_publicacoes([publicacao]) is None
+    assert Database(banco_postgres).inserir_publicacao(publicacao) is None
+
+    with banco_postgres.cursor() as cursor:
+        cursor.execute("SELECT (SELECT COUNT(*) FROM paginas_texto), (SELECT COUNT(*) FROM publicacoes)")
+        assert cursor.fetchone() == (0, 0)
+    assert banco_postgres.autocommit
+
+class CursorPreenchimento(CursorFalso):
+    """Cursor que registra as queries e responde ao EXISTS do preenchimento em lotes"""
+
+    def __init__(self, conexao):
+        super().__init__()
+        self.conexao = conexao
+
+    def execute(self, query, params=None):
+        self.conexao.queries.append(" ".join(query.split()))
+        self.rowcount = 0
+
+    def fetchone(self):
+        return (self.conexao.existem_pendentes,)
+
+class ConexaoPreenchimento(ConexaoFalsa):
+
+    def __init__(self, existem_pendentes):
+        super().__init__()
+        self.existem_pendentes = existem_pendentes
+        self.queries = []
+
+    def cursor(self, **kwargs):
+        return CursorPreenchimento(self)
+
+@pytest.mark.parametrize('existem_pendentes', [False, True])
+def test_preenchimento_em_lotes_so_roda_com_linhas_pendentes(monkeypatch, existem_pendentes):
+    monkeypatch.setattr(database, '_esquema_inicializado', True)
+    conexao = ConexaoPreenchimento(existem_pendentes)
+    db = Database(conexao)
+
+    assert db.preencher_hash_conteudo() == 0
+    assert db.preencher_busca_texto() == 0
+
+    assert [query.split()[0] for query in conexao.queries] == (
+        ['SELECT', 'UPDATE', 'SELECT', 'UPDATE'] if existem_pendentes else ['SELECT', 'SELECT']
+    )
@@ -0,0 +1,57 @@
+import datetime
+import sqlite3
+
+from diario_execucao import DiarioExecucao
+
+PERIODO = (datetime.date(2025, 3, 3), datetime.date(2025, 3, 5))
+
+def test_data_do_resultado_volta_com_as_pendentes(tmp_path):
+    diario = DiarioExecucao(caminho=str(tmp_path / 'diario.db'))
+    try:
+        execucao_id = diario.iniciar_execucao(*PERIODO)
+        diario.registrar_descoberta(execucao_id, [
+            {'url': 'https://dje/1', 'snippet': 'RPV', 'data_disponibilizacao': '2025-03-04'},
+            {'url': 'https://dje/2', 'snippet': 'RPV'},
+        ])
+
+        assert [(item['url'], item['data_disponibilizacao']) for item in diario.pendentes(execucao_id)] == [
+            ('https://dje/1', '2025-03-04'), ('https://dje/2', None),
+        ]
+    finally:
+        diario.fechar()
+
+def test_diario_antigo_ganha_a_coluna_da_data(tmp_path):
+    caminho = str(tmp_path / 'diario.db')
+    conn = sqlite3.connect(caminho)
+    conn.executescript("""
+    CREATE TABLE publicacoes (
+        execucao_id INTEGER NOT NULL, url TEXT NOT NULL, ordem INTEGER NOT NULL, snippet TEXT,
+        etapa TEXT NOT NULL, texto BLOB, dados TEXT, atualizada_em REAL NOT NULL,
+        PRIMARY KEY (execucao_id, url)
+    ) WITHOUT ROWID;
+    INSERT INTO publicacoes VALUES (1, 'https://dje/antiga', 0, '', 'descoberta', NULL, NULL, 0);
+    """)
+    conn.close()
+
+    diario = DiarioExecucao(caminho=caminho)
+    try:
+        assert [item['data_disponibilizacao'] for item in diario.pendentes(1)] == [None]
+    finally:
+        diario.fechar()
+
+def test_texto_da_pagina_fica_ate_a_gravacao(tmp_path):
+    diario = DiarioExecucao(caminho=str(tmp_path / 'diario.db'))
+    try:
+        execucao_id = diario.iniciar_execucao(*PERIODO)
+        diario.registrar_descoberta(execucao_id, [{'url': 'https://dje/1', 'snippet': 'RPV'}])
+        diario.marcar_baixadas(execucao_id, {'https://dje/1': 'texto da pagina'})
+        diario.marcar_extraida(execucao_id, 'https://dje/1', [{'numero_processo': '0001'}])
+
+        # Retomada depois da extração: os processos e o texto da página voltam juntos
+        [item] = diario.pendentes(execucao_id)
+        assert (item['etapa'], item['texto_pdf'], item['processos']) == ('extraida', 'texto da pagina', [{'numero_processo': '0001'}])
+
+        diario.marcar_persistida(execucao_id, 'https://dje/1')
+        assert diario.pendentes(execucao_id) == []
+    finally:
+        diario.fechar()
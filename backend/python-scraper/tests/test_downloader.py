@@ -0,0 +1,204 @@
+import collections
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from downloader import BaixadorPDF, FALHA_PROCESSAMENTO
+from sessao_http import SessaoDJE, FALHA_AUSENTE, FALHA_TRANSITORIA, FALHA_CONTEUDO
+
+# Atraso de cada PDF "normal" do servidor, para que os downloads se sobreponham
+ATRASO_PDF = 0.2
+ATRASO_LENTO = 1.5
+
+def conteudo_pdf(caminho):
+    """Bytes de PDF servidos para um caminho (distintos por caminho, para conferir o payload)"""
+    return b'%PDF-1.4\n' + caminho.encode() + b'\n' + bytes(range(256)) * 8 + b'\n%%EOF'
+
+PAGINA_ERRO = b'<html><body>Sessao expirada, faca login novamente</body></html>'
+
+class ServidorDJE(ThreadingHTTPServer):
+    """Servidor local que imita o DJE: PDFs, páginas HTML de erro, respostas lentas e falhas transitórias"""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), ManipuladorDJE)
+        self.lock = threading.Lock()
+        self.acessos = collections.Counter()
+        self.simultaneos = 0
+        self.maximo_simultaneos = 0
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+class ManipuladorDJE(BaseHTTPRequestHandler):
+
+    def log_message(self, *args):
+        pass
+
+    def _responder(self, status, corpo, tipo):
+        self.send_response(status)
+        self.send_header('Content-Type', tipo)
+        self.send_header('Content-Length', str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def do_GET(self):
+        servidor = self.server
+        with servidor.lock:
+            servidor.acessos[self.path] += 1
+            acessos = servidor.acessos[self.path]
+            servidor.simultaneos += 1
+            servidor.maximo_simultaneos = max(servidor.maximo_simultaneos, servidor.simultaneos)
+
+        try:
+            if self.path == '/':
+                self.send_response(200)
+                self.send_header('Set-Cookie', f"JSESSIONID={servidor.acessos['/']}; Path=/")
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+            elif self.path.startswith('/pdf/'):
+                time.sleep(ATRASO_PDF)
+                self._responder(200, conteudo_pdf(self.path), 'application/pdf')
+            elif self.path == '/lento':
+                time.sleep(ATRASO_LENTO)
+                self._responder(200, conteudo_pdf(self.path), 'application/pdf')
+            elif self.path == '/erro':
+                self._responder(500, b'<html>Erro interno</html>', 'text/html')
+            elif self.path == '/texto':
+                self._responder(200, b'nem PDF nem HTML', 'text/plain')
+            elif self.path == '/html':
+                self._responder(200, PAGINA_ERRO, 'text/html')
+            elif self.path == '/html-uma-vez':
+                # Primeira resposta é a página de login; depois da renovação dos cookies vem o PDF
+                if acessos == 1:
+                    self._responder(200, PAGINA_ERRO, 'text/html')
+                else:
+                    self._responder(200, conteudo_pdf(self.path), 'application/pdf')
+            elif self.path == '/instavel':
+                if acessos == 1:
+                    self._responder(503, b'indisponivel', 'text/plain')
+                else:
+                    self._responder(200, conteudo_pdf(self.path), 'application/pdf')
+            else:
+                self._responder(404, b'<html>404</html>', 'text/html')
+        finally:
+            with servidor.lock:
+                servidor.simultaneos -= 1
+
+@pytest.fixture
+def servidor():
+    servidor = ServidorDJE()
+    thread = threading.Thread(target=servidor.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield servidor
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
+
+@pytest.fixture
+def baixador(servidor):
+    sessao = SessaoDJE(arquivo_cookies='', url_inicial=servidor.url + '/', timeout=10)
+    baixador = BaixadorPDF(sessao=sessao, concorrencia=3)
+    try:
+        yield baixador
+    finally:
+        sessao.fechar()
+
+def test_baixa_os_bytes_de_cada_pdf_respeitando_a_concorrencia(servidor, baixador):
+    urls = [f"{servidor.url}/pdf/{n}" for n in range(10)]
+
+    resultados = baixador.baixar_todos(urls + urls[:2])
+
+    assert resultados == {url: conteudo_pdf(url[len(servidor.url):]) for url in urls}
+    # URLs repetidas são baixadas uma vez só
+    assert all(servidor.acessos[f"/pdf/{n}"] == 1 for n in range(10))
+    assert servidor.maximo_simultaneos == baixador.concorrencia
+
+def test_html_renova_os_cookies_e_tenta_de_novo(servidor, baixador):
+    url = servidor.url + '/html-uma-vez'
+
+    assert baixador.baixar_todos([url]) == {url: conteudo_pdf('/html-uma-vez')}
+    assert servidor.acessos['/html-uma-vez'] == 2
+    # Uma visita para semear os cookies e outra para renová-los
+    assert servidor.acessos['/'] == 2
+
+def test_falhas_resultam_em_none(servidor, baixador):
+    urls = [servidor.url + '/html', servidor.url + '/nao-existe', servidor.url + '/pdf/1']
+
+    resultados = baixador.baixar_todos(urls)
+
+    assert resultados[servidor.url + '/html'] is None
+    assert resultados[servidor.url + '/nao-existe'] is None
+    assert resultados[servidor.url + '/pdf/1'] == conteudo_pdf('/pdf/1')
+    # HTML persistente: só uma nova tentativa depois da renovação
+    assert servidor.acessos['/html'] == 2
+
+def test_erro_transitorio_do_servidor_e_repetido(servidor, baixador):
+    url = servidor.url + '/instavel'
+
+    assert baixador.baixar_todos([url]) == {url: conteudo_pdf('/instavel')}
+    assert servidor.acessos['/instavel'] == 2
+
+def test_iterar_entrega_os_resultados_a_medida_que_ficam_prontos(servidor, baixador):
+    urls = [servidor.url + '/lento'] + [f"{servidor.url}/pdf/{n}" for n in range(4)]
+    inicio = time.monotonic()
+    chegadas = []
+
+    for url, resultado, falha in baixador.iterar(urls, processar=len):
+        chegadas.append((url, resultado, time.monotonic() - inicio))
+
+    assert [url for url, _, _ in chegadas][-1] == servidor.url + '/lento'
+    assert {url: resultado for url, resultado, _ in chegadas} == {
+        url: len(conteudo_pdf(url[len(servidor.url):])) for url in urls
+    }
+    # O primeiro PDF rápido chega bem antes de o lento terminar
+    assert chegadas[0][2] < ATRASO_LENTO
+
+def test_iterar_interrompido_cancela_os_downloads_restantes(servidor, baixador):
+    baixador.concorrencia = 1
+    urls = [f"{servidor.url}/pdf/{n}" for n in range(6)]
+
+    for url, resultado, falha in baixador.iterar(urls):
+        assert resultado == conteudo_pdf(url[len(servidor.url):]) and falha is None
+        break
+
+    assert sum(servidor.acessos[f"/pdf/{n}"] for n in range(6)) < len(urls)
+
+def test_motivo_de_cada_falha(servidor, baixador):
+    caminhos = ['/html', '/nao-existe', '/erro', '/texto', '/pdf/1']
+
+    falhas = {
+        url[len(servidor.url):]: (resultado is not None, falha)
+        for url, resultado, falha in baixador.iterar([servidor.url + caminho for caminho in caminhos])
+    }
+
+    assert falhas == {
+        # Página que não existe: 404, ou HTML mesmo depois de renovar os cookies
+        '/html': (False, FALHA_AUSENTE),
+        '/nao-existe': (False, FALHA_AUSENTE),
+        '/erro': (False, FALHA_TRANSITORIA),
+        '/texto': (False, FALHA_CONTEUDO),
+        '/pdf/1': (True, None),
+    }
+
+def test_erro_de_conexao_e_transitorio(servidor, baixador):
+    url = servidor.url + '/pdf/1'
+    servidor.shutdown()
+    servidor.server_close()
+
+    assert list(baixador.iterar([url])) == [(url, None, FALHA_TRANSITORIA)]
+
+def test_falha_no_processamento(servidor, baixador):
+    def processar(conteudo):
+        raise ValueError("PDF corrompido")
+
+    urls = [servidor.url + '/pdf/1', servidor.url + '/pdf/2']
+    resultados = {url: (resultado, falha) for url, resultado, falha in baixador.iterar(urls[:1], processar=processar)}
+    resultados.update({url: (resultado, falha) for url, resultado, falha in baixador.iterar(urls[1:], processar=lambda conteudo: None)})
+
+    assert resultados == {urls[0]: (None, FALHA_PROCESSAMENTO), urls[1]: (None, FALHA_PROCESSAMENTO)}
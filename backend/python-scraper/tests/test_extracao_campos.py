@@ -0,0 +1,54 @@
+import os
+
+import pytest
+
+from conftest import DIRETORIO_FIXTURES
+from extracao_original import extrair_dados_processo_original
+from scraper import DJEScraper
+
+DIRETORIO_PROCESSOS = os.path.join(DIRETORIO_FIXTURES, 'processos')
+ARQUIVOS_PROCESSOS = sorted(nome for nome in os.listdir(DIRETORIO_PROCESSOS) if nome.endswith('.txt'))
+
+CAMPOS = [
+    'conteudo_completo', 'data_disponibilizacao', 'numero_processo', 'autor', 'advogado',
+    'valor_principal', 'valor_juros_moratorios', 'honorarios_advocaticios'
+]
+
+def extrair_dados_processo(texto):
+    """DJEScraper._extrair_dados_processo (motor de extracao_campos), sem iniciar o scraper"""
+    return DJEScraper._extrair_dados_processo(DJEScraper.__new__(DJEScraper), texto)
+
+def ler_processo(nome):
+    with open(os.path.join(DIRETORIO_PROCESSOS, nome), encoding='utf-8') as arquivo:
+        return arquivo.read()
+
+# O mesmo processo como sai das diferentes extrações de texto: quebras de linha do PDF, CRLF ou já em uma linha
+VARIACOES = {
+    'original': lambda texto: texto,
+    'crlf': lambda texto: texto.replace('\n', '\r\n'),
+    'uma_linha': lambda texto: ' '.join(texto.split()),
+}
+
+@pytest.mark.parametrize('variacao', sorted(VARIACOES))
+@pytest.mark.parametrize('nome', ARQUIVOS_PROCESSOS)
+def test_motor_compilado_igual_a_extracao_original(nome, variacao):
+    texto = VARIACOES[variacao](ler_processo(nome))
+
+    esperado = extrair_dados_processo_original(texto)
+    obtido = extrair_dados_processo(texto)
+
+    # Valor que não converte (ex.: formato 1,234.56) descarta o processo nas duas versões
+    if esperado is None:
+        assert obtido is None
+        return
+
+    assert set(obtido) == set(esperado) == set(CAMPOS)
+    for campo in CAMPOS:
+        assert obtido[campo] == esperado[campo], campo
+
+def test_corpus_cobre_todos_os_campos():
+    """Garante que o corpus exercita cada campo (e não só compara Nones)"""
+    extraidos = [extrair_dados_processo(ler_processo(nome)) for nome in ARQUIVOS_PROCESSOS]
+    extraidos = [dados for dados in extraidos if dados]
+    for campo in CAMPOS:
+        assert any(dados[campo] is not None for dados in extraidos), campo
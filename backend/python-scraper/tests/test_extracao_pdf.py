@@ -0,0 +1,21 @@
+import logging
+
+from extracao_pdf import criar_pool_extracao, extrair_com_medicoes
+
+def test_logs_dos_processos_de_extracao_chegam_ao_processo_principal(caplog):
+    caplog.set_level(logging.INFO, logger="DJE_Scraper")
+
+    pool = criar_pool_extracao(processos=1)
+    try:
+        resultado = pool.submit(extrair_com_medicoes, b'%PDF-1.4 corrompido', ordem=['pypdf2'], usar_cache=False).result()
+    finally:
+        pool.shutdown(wait=True)
+
+    assert resultado.texto is None
+    assert [medicao.extrator for medicao in resultado.medicoes] == ['pypdf2']
+
+    mensagens = [(registro.levelno, registro.getMessage()) for registro in caplog.records if registro.name == "DJE_Scraper"]
+    assert any(nivel == logging.WARNING and "Erro ao extrair texto com 'pypdf2'" in mensagem for nivel, mensagem in mensagens)
+    assert (logging.ERROR, "Não foi possível extrair texto do PDF") in mensagens
+    # Os registros vêm do processo de extração, não do processo dos testes
+    assert all(registro.processName != 'MainProcess' for registro in caplog.records if registro.levelno >= logging.WARNING)
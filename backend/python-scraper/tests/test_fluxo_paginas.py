@@ -0,0 +1,30 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from fluxo_paginas import FluxoPaginas
+from pagina_dje import ChavePagina
+
+def test_pedidos_simultaneos_da_mesma_pagina_obtem_uma_vez_so():
+    liberar = threading.Event()
+    chamadas = []
+
+    def obter_texto(chave):
+        chamadas.append(chave)
+        liberar.wait(5)
+        return f"pagina {chave.nu_seqpagina}"
+
+    fluxo = FluxoPaginas(obter_texto)
+    chave = ChavePagina(19, 4092, 12, 7)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futuros = [executor.submit(fluxo.texto, chave) for _ in range(4)]
+        # Todas as threads chegam antes da primeira obtenção terminar
+        while fluxo.obtidas + fluxo.reaproveitadas < 4:
+            threading.Event().wait(0.01)
+        liberar.set()
+        textos = [futuro.result() for futuro in futuros]
+
+    assert textos == ["pagina 7"] * 4
+    assert chamadas == [chave]
+    assert (fluxo.obtidas, fluxo.reaproveitadas) == (1, 3)
+    assert fluxo.texto(chave) == "pagina 7" and chamadas == [chave]
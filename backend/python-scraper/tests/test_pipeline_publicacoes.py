@@ -0,0 +1,39 @@
+from diario_execucao import ETAPA_BAIXADA
+from fluxo_paginas import FluxoPaginas
+from pagina_dje import ChavePagina
+from pipeline_publicacoes import PipelinePublicacoes
+
+URL_PAGINA = "https://dje.tjsp.jus.br/cdje/consultaSimples.do?cdVolume=19&nuDiario=4092&cdCaderno=12&nuSeqpagina=7"
+
+class ScraperFalso:
+    """Fornece ao pipeline só o fluxo de páginas, registrando as páginas obtidas"""
+
+    diario_execucao = None
+
+    def __init__(self):
+        self.obtidas = []
+        self.fluxo_paginas = FluxoPaginas(self._obter_texto_pagina)
+
+    def _obter_texto_pagina(self, chave):
+        self.obtidas.append(chave.nu_seqpagina)
+        return "continuação. ADV: FULANO (OAB 1/SP) Processo 0002 - RPV"
+
+    def _obter_pool_extracao(self):
+        return None
+
+def test_pagina_seguinte_e_obtida_antes_do_processamento_so_com_processo_aberto():
+    scraper = ScraperFalso()
+    pipeline = PipelinePublicacoes(scraper)
+
+    fechada = {'url': URL_PAGINA, 'etapa': ETAPA_BAIXADA, 'texto_pdf': "Processo 0001 - RPV. ADV: FULANO (OAB 1/SP)"}
+    assert pipeline.obter_pagina_seguinte(fechada) is fechada
+    assert scraper.obtidas == []
+
+    aberta = {'url': URL_PAGINA, 'etapa': ETAPA_BAIXADA, 'texto_pdf': "Processo 0001 - RPV. Processo 0002 - pagamento pelo INSS"}
+    pipeline.obter_pagina_seguinte(aberta)
+    assert scraper.obtidas == [8]
+
+    # O processamento encontra a página seguinte na memória do fluxo
+    chave, texto = scraper.fluxo_paginas.proxima(ChavePagina.de_url(URL_PAGINA))
+    assert chave.nu_seqpagina == 8 and texto.startswith("continuação")
+    assert scraper.obtidas == [8]
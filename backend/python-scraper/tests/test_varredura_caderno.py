@@ -0,0 +1,127 @@
+import random
+
+import pytest
+
+from downloader import ResultadoDownload, FALHA_PROCESSAMENTO
+from extracao_pdf import ResultadoExtracao
+from pagina_dje import ChavePagina
+from sessao_http import FALHA_AUSENTE, FALHA_TRANSITORIA
+from varredura_caderno import VarreduraCaderno
+
+class BaixadorRoteirizado:
+    """
+    Baixador falso: cada página segue um roteiro de resultados por tentativa (texto ou motivo de falha;
+    a última entrada vale para as tentativas seguintes). As páginas sem roteiro não existem.
+    Os resultados de cada chamada saem embaralhados, como os downloads paralelos.
+    """
+
+    def __init__(self, roteiros):
+        self.roteiros = roteiros
+        self.chamadas = []
+        self.tentativas = {}
+        self.aleatorio = random.Random(12)
+
+    def iterar(self, urls, processar=None, executor_processamento=None):
+        urls = list(urls)
+        self.chamadas.append(sorted(ChavePagina.de_url(url).nu_seqpagina for url in urls))
+        self.aleatorio.shuffle(urls)
+
+        for url in urls:
+            nu_seqpagina = ChavePagina.de_url(url).nu_seqpagina
+            tentativa = self.tentativas.get(nu_seqpagina, 0)
+            self.tentativas[nu_seqpagina] = tentativa + 1
+
+            roteiro = self.roteiros.get(nu_seqpagina, [FALHA_AUSENTE])
+            passo = roteiro[min(tentativa, len(roteiro) - 1)]
+            if passo == FALHA_PROCESSAMENTO:
+                # PDF baixado, mas nenhum motor extraiu texto
+                yield ResultadoDownload(url, ResultadoExtracao(None, None, []), None)
+            elif passo in (FALHA_AUSENTE, FALHA_TRANSITORIA):
+                yield ResultadoDownload(url, None, passo)
+            else:
+                yield ResultadoDownload(url, ResultadoExtracao(passo, 'falso', []), None)
+
+def criar_varredura(roteiros, **opcoes):
+    baixador = BaixadorRoteirizado(roteiros)
+    opcoes = dict({'lote_paginas': 4, 'paginas_vazias_fim': 2, 'tentativas': 3}, **opcoes)
+    return VarreduraCaderno(baixador=baixador, pool_extracao=object(), **opcoes), baixador
+
+def paginas(varredura, ultima_pagina=None):
+    return [(chave.nu_seqpagina, texto) for chave, texto in varredura.paginas(19, 4092, 12, ultima_pagina=ultima_pagina)]
+
+def test_paginas_saem_em_ordem_ate_o_fim_do_caderno():
+    varredura, _ = criar_varredura({n: [f"pagina {n}"] for n in range(1, 7)})
+
+    assert paginas(varredura) == [(n, f"pagina {n}") for n in range(1, 7)] + [(7, None)]
+
+def test_falhas_transitorias_sao_repetidas_e_nao_encerram_o_caderno():
+    roteiros = {n: [f"pagina {n}"] for n in range(1, 9)}
+    roteiros[3] = [FALHA_TRANSITORIA, "pagina 3"]
+    roteiros[4] = [FALHA_TRANSITORIA, FALHA_TRANSITORIA, "pagina 4"]
+    roteiros[5] = [FALHA_PROCESSAMENTO, "pagina 5"]
+    varredura, baixador = criar_varredura(roteiros)
+
+    assert paginas(varredura) == [(n, f"pagina {n}") for n in range(1, 9)] + [(9, None)]
+    assert baixador.chamadas[:3] == [[1, 2, 3, 4], [3, 4], [4]]
+
+def test_pagina_perdida_depois_das_tentativas_nao_conta_como_fim():
+    roteiros = {n: [f"pagina {n}"] for n in range(1, 7)}
+    roteiros[2] = roteiros[3] = [FALHA_TRANSITORIA]
+    varredura, baixador = criar_varredura(roteiros)
+
+    resultado = paginas(varredura)
+
+    assert resultado[:6] == [(1, "pagina 1"), (2, None), (3, None), (4, "pagina 4"), (5, "pagina 5"), (6, "pagina 6")]
+    assert baixador.tentativas[2] == baixador.tentativas[3] == 3
+
+def test_janela_inteira_perdida_interrompe_a_varredura():
+    varredura, baixador = criar_varredura({n: [FALHA_TRANSITORIA] for n in range(1, 100)}, tentativas=2)
+
+    assert paginas(varredura) == [(n, None) for n in range(1, 4)]
+    assert len(baixador.chamadas) == 2
+
+def test_ultima_pagina_limita_a_varredura():
+    varredura, _ = criar_varredura({n: [f"pagina {n}"] for n in range(1, 20)})
+
+    assert paginas(varredura, ultima_pagina=5) == [(n, f"pagina {n}") for n in range(1, 6)]
+
+def test_processo_aberto_na_ultima_pagina_e_emitido():
+    varredura, _ = criar_varredura({})
+    chave = ChavePagina(19, 4092, 12, 1)
+    paginas_lidas = [
+        (chave, "Processo 0001 - RPV. ADV: FULANO (OAB 1/SP) Processo 0002 - pagamento pelo INSS"),
+        (ChavePagina(19, 4092, 12, 2), "continua sem fechar"),
+    ]
+
+    assert list(varredura.processos(paginas_lidas)) == [
+        "Processo 0001 - RPV. ADV: FULANO (OAB 1/SP)",
+        "Processo 0002 - pagamento pelo INSS continua sem fechar",
+    ]
+
+def test_processo_sem_fechamento_e_emitido_com_aviso(caplog):
+    varredura, _ = criar_varredura({})
+    paginas_lidas = [
+        (ChavePagina(19, 4092, 12, 1), "Processo 0001 - RPV sem fechar"),
+        (ChavePagina(19, 4092, 12, 2), "continua ainda sem a OAB Processo 0002 - RPV. ADV: BELTRANO (OAB 2/SP)"),
+        (ChavePagina(19, 4092, 12, 3), "Processo 0003 - pagamento pelo INSS aberto"),
+        (ChavePagina(19, 4092, 12, 4), None),
+        (ChavePagina(19, 4092, 12, 5), "Processo 0004 - RPV aberto"),
+        (ChavePagina(19, 4092, 12, 6), "Processo 0005 - RPV. ADV: CICLANO (OAB 3/SP)"),
+    ]
+
+    assert list(varredura.processos(paginas_lidas)) == [
+        "Processo 0001 - RPV sem fechar continua ainda sem a OAB",
+        "Processo 0002 - RPV. ADV: BELTRANO (OAB 2/SP)",
+        "Processo 0003 - pagamento pelo INSS aberto",
+        "Processo 0004 - RPV aberto",
+        "Processo 0005 - RPV. ADV: CICLANO (OAB 3/SP)",
+    ]
+    avisos = [registro.getMessage() for registro in caplog.records if "sem o fim reconhecido" in registro.getMessage()]
+    assert len(avisos) == 3
+
+def test_varredura_exige_a_data_de_disponibilizacao():
+    varredura, baixador = criar_varredura({1: ["pagina 1"]})
+
+    with pytest.raises(ValueError):
+        varredura.varrer(19, 4092, 12, None)
+    assert baixador.chamadas == []
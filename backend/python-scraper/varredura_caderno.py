@@ -0,0 +1,209 @@
+import logging
+
+from config import VARREDURA_LOTE_PAGINAS, VARREDURA_PAGINAS_VAZIAS_FIM, VARREDURA_TENTATIVAS
+from downloader import BaixadorPDF, FALHA_PROCESSAMENTO
+from extracao_campos import extrair_campos_processo
+from extracao_pdf import extrair_texto_pagina, criar_pool_extracao, estatisticas_extratores
+from pagina_dje import ChavePagina
+from segmentacao import segmentar_processos, separar_continuacao, fim_processo, contem_palavras_chave
+from sessao_http import FALHA_AUSENTE, FALHA_TRANSITORIA
+
+# Falhas que justificam baixar e extrair a página de novo
+FALHAS_REPETIVEIS = (FALHA_TRANSITORIA, FALHA_PROCESSAMENTO)
+
+logger = logging.getLogger("DJE_Scraper")
+
+def _avisar_processo_aberto(texto_processo, motivo):
+    """Registra no log um processo emitido sem o fim reconhecido, com o início do seu texto"""
+    logger.warning(f"Processo emitido sem o fim reconhecido ({motivo}): {texto_processo[:120]!r}")
+
+class VarreduraCaderno:
+    """
+    Varredura completa de um caderno do diário, sem o formulário de pesquisa do DJE.
+    Percorre todos os nuSeqpagina por getPaginaDoDiario.do, baixando e extraindo as páginas
+    em paralelo (em janelas de VARREDURA_LOTE_PAGINAS), e aplica localmente os filtros
+    de "RPV" e "pagamento pelo INSS". Processos divididos entre páginas são juntados na ordem.
+    """
+
+    def __init__(self, baixador=None, pool_extracao=None, lote_paginas=VARREDURA_LOTE_PAGINAS,
+                 paginas_vazias_fim=VARREDURA_PAGINAS_VAZIAS_FIM, tentativas=VARREDURA_TENTATIVAS):
+        """
+        baixador: BaixadorPDF a ser usado (padrão: um novo, com sessão HTTP própria).
+        pool_extracao: executor da extração de texto (padrão: um pool de processos próprio).
+        paginas_vazias_fim: páginas seguidas inexistentes (404 ou HTML do getPaginaDoDiario.do) que indicam o fim do caderno.
+        tentativas: vezes que uma página com falha transitória de download ou de extração é baixada e extraída.
+        """
+        self.baixador = baixador or BaixadorPDF()
+        self._pool_proprio = pool_extracao is None
+        self.pool_extracao = pool_extracao or criar_pool_extracao()
+        self.lote_paginas = max(1, int(lote_paginas))
+        self.paginas_vazias_fim = max(1, int(paginas_vazias_fim))
+        self.tentativas = max(1, int(tentativas))
+
+    def _baixar_janela(self, chaves):
+        """
+        Baixa e extrai as páginas da janela e gera (chave, texto, falha) em ordem, cada página assim que ela
+        e as anteriores ficam prontas. Falhas transitórias de download e falhas de extração são tentadas de novo.
+        """
+        prontas = {}
+        proxima = 0
+        urls = [chave.url_pdf() for chave in chaves]
+
+        for tentativa in range(1, self.tentativas + 1):
+            repetir = []
+            for resultado in self.baixador.iterar(urls, processar=extrair_texto_pagina,
+                                                  executor_processamento=self.pool_extracao):
+                if resultado.resultado:
+                    estatisticas_extratores.registrar(resultado.resultado.medicoes)
+
+                texto = resultado.resultado.texto if resultado.resultado else None
+                falha = None if texto else (resultado.falha or FALHA_PROCESSAMENTO)
+
+                if falha in FALHAS_REPETIVEIS and tentativa < self.tentativas:
+                    logger.warning(f"Falha ({falha}) na página {resultado.url} na tentativa {tentativa}, "
+                                   f"será tentada de novo")
+                    repetir.append(resultado.url)
+                    continue
+
+                prontas[resultado.url] = (texto, falha)
+                while proxima < len(chaves) and chaves[proxima].url_pdf() in prontas:
+                    chave = chaves[proxima]
+                    proxima += 1
+                    yield (chave,) + prontas.pop(chave.url_pdf())
+
+            if not repetir:
+                break
+            urls = repetir
+
+    def paginas(self, cd_volume, nu_diario, cd_caderno, primeira_pagina=1, ultima_pagina=None):
+        """
+        Gera (chave, texto) de cada página do caderno, em ordem, até o fim do caderno
+        (ou até `ultima_pagina`). O texto é None para páginas que não puderam ser obtidas.
+        Só as páginas confirmadamente inexistentes contam para o fim do caderno; sem `ultima_pagina`,
+        uma janela inteira de páginas seguidas perdidas (falhas mesmo depois das novas tentativas) interrompe a varredura.
+        """
+        inicio = primeira_pagina
+        vazias_seguidas = 0
+        perdidas_seguidas = 0
+
+        while ultima_pagina is None or inicio <= ultima_pagina:
+            fim = inicio + self.lote_paginas - 1
+            if ultima_pagina is not None:
+                fim = min(fim, ultima_pagina)
+
+            chaves = [ChavePagina(cd_volume, nu_diario, cd_caderno, nu_seqpagina) for nu_seqpagina in range(inicio, fim + 1)]
+            logger.info(f"Varredura do caderno {cd_caderno} do diário {nu_diario}: páginas {inicio} a {fim}")
+
+            for chave, texto, falha in self._baixar_janela(chaves):
+                if falha == FALHA_AUSENTE:
+                    vazias_seguidas += 1
+
+                    # Páginas seguidas inexistentes: o caderno acabou
+                    if ultima_pagina is None and vazias_seguidas >= self.paginas_vazias_fim:
+                        logger.info(f"Fim do caderno {cd_caderno} do diário {nu_diario} na página {chave.nu_seqpagina - vazias_seguidas}")
+                        return
+                elif falha:
+                    perdidas_seguidas += 1
+                    logger.error(f"Página {tuple(chave)} perdida depois de {self.tentativas} tentativas ({falha})")
+
+                    if ultima_pagina is None and perdidas_seguidas >= self.lote_paginas:
+                        logger.error(f"Varredura do caderno {cd_caderno} do diário {nu_diario} interrompida: "
+                                     f"{perdidas_seguidas} páginas seguidas perdidas até a página {chave.nu_seqpagina}")
+                        return
+                else:
+                    vazias_seguidas = 0
+                    perdidas_seguidas = 0
+
+                yield chave, texto
+
+            inicio = fim + 1
+
+    def processos(self, paginas):
+        """
+        Recebe (chave, texto) das páginas em ordem e gera o texto de cada processo completo,
+        juntando o processo aberto no fim de uma página com a continuação nas seguintes.
+        Um processo cujo fim não é reconhecido (página seguinte indisponível, continuação sem o fechamento
+        da OAB, fim das páginas) é emitido como está, com um aviso no log, para não sumir da varredura.
+        """
+        pendente = None
+
+        for chave, texto in paginas:
+            if not texto:
+                if pendente:
+                    _avisar_processo_aberto(pendente, f"página seguinte {tuple(chave)} indisponível")
+                    yield pendente
+                pendente = None
+                continue
+
+            inicio = 0
+            if pendente:
+                continuacao, primeiro_processo = separar_continuacao(texto)
+                if primeiro_processo == -1:
+                    # A página inteira é continuação do processo pendente
+                    pendente += " " + texto.strip()
+                    fim = fim_processo(pendente)
+                    if fim != -1:
+                        yield pendente
+                        pendente = None
+                    continue
+
+                if continuacao is not None:
+                    processo_completo = pendente + " " + continuacao
+                    if fim_processo(processo_completo) == -1:
+                        _avisar_processo_aberto(processo_completo, f"continuação na página {tuple(chave)} sem o fechamento")
+                    yield processo_completo
+                else:
+                    # A página começa direto num novo processo: o pendente termina sem o fim reconhecido
+                    _avisar_processo_aberto(pendente, f"página {tuple(chave)} começa em outro processo")
+                    yield pendente
+                inicio = max(primeiro_processo, 0)
+                pendente = None
+
+            for segmento in segmentar_processos(texto, inicio):
+                if segmento.aberto:
+                    pendente = segmento.texto
+                else:
+                    yield segmento.texto
+
+        if pendente:
+            _avisar_processo_aberto(pendente, f"última página lida {tuple(chave)}")
+            yield pendente
+
+    def varrer(self, cd_volume, nu_diario, cd_caderno, data_disponibilizacao,
+               primeira_pagina=1, ultima_pagina=None):
+        """
+        Varre o caderno inteiro e retorna os dados dos processos com "RPV" e "pagamento pelo INSS".
+        `data_disponibilizacao` (AAAA-MM-DD) é a data do diário varrido, gravada em todos os processos:
+        a data padrão da extração (hoje) não vale para um backfill.
+        """
+        if not data_disponibilizacao:
+            raise ValueError("A varredura de um caderno exige a data de disponibilização do diário")
+
+        publicacoes = []
+        total_processos = 0
+
+        paginas = self.paginas(cd_volume, nu_diario, cd_caderno, primeira_pagina, ultima_pagina)
+        for processo_texto in self.processos(paginas):
+            total_processos += 1
+            if not contem_palavras_chave(processo_texto):
+                continue
+
+            try:
+                dados_processo = extrair_campos_processo(processo_texto)
+            except Exception as e:
+                logger.error(f"Erro ao extrair dados do processo: {e}")
+                continue
+
+            dados_processo['data_disponibilizacao'] = data_disponibilizacao
+            publicacoes.append(dados_processo)
+
+        logger.info(f"Varredura do caderno {cd_caderno} do diário {nu_diario} concluída: "
+                    f"{total_processos} processos lidos, {len(publicacoes)} com as palavras-chave")
+        return publicacoes
+
+    def fechar(self):
+        """Encerra o pool de extração (se foi criado pela varredura) e a sessão HTTP"""
+        estatisticas_extratores.registrar_log()
+        if self._pool_proprio:
+            self.pool_extracao.shutdown(wait=True, cancel_futures=True)
+        self.baixador.sessao.fechar()